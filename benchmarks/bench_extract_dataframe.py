@@ -0,0 +1,83 @@
+"""
+Single-pass TweetDfExtractor against pd.read_json followed by one .apply per column.
+
+Usage (from the project root, after pip install -e .):
+    python benchmarks/bench_extract_dataframe.py ./data/global_twitter_data.json
+"""
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+from twitter_data_analysis.extract_dataframe import TweetDfExtractor
+
+
+def read_json_apply(json_file):
+    """
+    The pandas route: decode the file into a dataframe of nested objects, then dig every column out
+    of the nested dictionaries with a separate .apply pass.
+
+    :return: dataframe with the flat columns
+    """
+    raw = pd.read_json(json_file, lines=True, dtype=False, convert_dates=False)
+
+    def status_text(row):
+        status = row["retweeted_status"] if isinstance(row.get("retweeted_status"), dict) else row
+        return status["full_text"]
+
+    df = pd.DataFrame()
+    df["created_at"] = pd.to_datetime(raw["created_at"], format="%a %b %d %H:%M:%S %z %Y")
+    df["source"] = raw["source"]
+    df["original_text"] = raw.apply(status_text, axis=1)
+    df["lang"] = raw["lang"]
+    df["favorite_count"] = raw["favorite_count"]
+    df["retweet_count"] = raw["retweet_count"]
+    df["original_author"] = raw["user"].apply(lambda user: user["screen_name"])
+    df["screen_count"] = raw["user"].apply(lambda user: user["statuses_count"])
+    df["followers_count"] = raw["user"].apply(lambda user: user["followers_count"])
+    df["friends_count"] = raw["user"].apply(lambda user: user["friends_count"])
+    df["possibly_sensitive"] = raw["possibly_sensitive"] if "possibly_sensitive" in raw else None
+    df["hashtags"] = raw["entities"].apply(lambda entities: [hashtag["text"] for hashtag in entities["hashtags"]])
+    df["user_mentions"] = raw["entities"].apply(
+        lambda entities: [mention["screen_name"] for mention in entities["user_mentions"]])
+    df["place"] = raw["place"].apply(lambda place: place["full_name"] if isinstance(place, dict) else None)
+    return df
+
+
+def measure(function, *args):
+    """
+    :return: the result, seconds taken and peak traced memory in MB of a second, traced run
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    function(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak / 2 ** 20
+
+
+def compare_extraction(json_file):
+    """
+    Extract the same file both ways
+
+    :return: dictionary of tweets/sec, peak memory and whether the texts and counts match
+    """
+    pandas_df, pandas_seconds, pandas_mb = measure(read_json_apply, json_file)
+    extractor_df, extractor_seconds, extractor_mb = measure(
+        lambda path: TweetDfExtractor.from_json_file(path).get_tweet_df(), json_file)
+    tweets = len(extractor_df)
+    return {"tweets": tweets,
+            "read_json_apply_tweets_per_sec": tweets / pandas_seconds,
+            "extractor_tweets_per_sec": tweets / extractor_seconds,
+            "speedup": pandas_seconds / extractor_seconds,
+            "read_json_apply_peak_mb": pandas_mb,
+            "extractor_peak_mb": extractor_mb,
+            "identical_text": pandas_df["original_text"].tolist() == extractor_df["original_text"].tolist(),
+            "identical_counts": pandas_df["followers_count"].tolist() == extractor_df["followers_count"].tolist()}
+
+
+if __name__ == "__main__":
+    for name, value in compare_extraction(sys.argv[1]).items():
+        print(f"{name}: {value}")
@@ -0,0 +1,52 @@
+"""
+Vectorized mask transformation against the original per-pixel implementation on the bundled mask.
+
+Usage (from the project root, after pip install -e .):
+    python benchmarks/bench_mask.py
+"""
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+from twitter_data_analysis.transform_mask import MaskTransformation
+
+
+def compare_mask_transformation(image_path="res/twitter.png", repeats=5):
+    """
+    Time transform_mask_per_pixel, transform_mask and a cached load_mask on the same image
+
+    :return: dictionary of milliseconds per call, output sizes in bytes and whether the outputs match
+    """
+    mask_transformation = MaskTransformation()
+    with Image.open(image_path) as image:
+        mask = np.array(image)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        per_pixel = mask_transformation.transform_mask_per_pixel(mask.copy())
+    per_pixel_ms = (time.perf_counter() - start) / repeats * 1000
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        vectorized = mask_transformation.transform_mask(mask)
+    vectorized_ms = (time.perf_counter() - start) / repeats * 1000
+
+    mask_transformation.load_mask(image_path)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        mask_transformation.load_mask(image_path)
+    cached_ms = (time.perf_counter() - start) / repeats * 1000
+
+    per_pixel_values = np.array(per_pixel.tolist(), dtype=np.uint8)
+    return {"shape": mask.shape, "per_pixel_ms": per_pixel_ms, "vectorized_ms": vectorized_ms,
+            "cached_load_ms": cached_ms, "speedup": per_pixel_ms / vectorized_ms,
+            # the object array only holds references, the per-pixel lists behind them are counted separately
+            "per_pixel_bytes": per_pixel.nbytes + sum(sys.getsizeof(row) for row in per_pixel.flat),
+            "vectorized_bytes": vectorized.nbytes,
+            "identical_output": bool(np.array_equal(per_pixel_values, vectorized))}
+
+
+if __name__ == "__main__":
+    for name, value in compare_mask_transformation().items():
+        print(f"{name}: {value}")
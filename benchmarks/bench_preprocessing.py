@@ -0,0 +1,113 @@
+"""
+Throughput comparison of the per-word, batched and multi-process tweet preprocessing paths,
+and a per-tweet cost comparison of the legacy cleaning stages against the fused normalizer.
+
+Usage (from the project root, after pip install -e .):
+    python benchmarks/bench_preprocessing.py ./data/global_twitter_data.json 2000
+"""
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+from twitter_data_analysis.preprocessing import TweetsPreprocessing
+
+
+def compare_preprocessing_throughput(tweets_df, tweets_col="full_text"):
+    """
+    Run preprocess_tweets_df with and without batching on the same tweets.
+
+    :param tweets_df: dataframe containing tweets
+    :param tweets_col: column containing the tweets text
+
+    :return: dictionary of tweets/sec for each path and whether the outputs match
+    """
+    preprocessing = TweetsPreprocessing()
+    results = {"tweets": len(tweets_df)}
+
+    start = time.perf_counter()
+    per_word = preprocessing.preprocess_tweets_df(tweets_df, tweets_col, batched=False)
+    results["per_word_tweets_per_sec"] = len(tweets_df) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    batched = preprocessing.preprocess_tweets_df(tweets_df, tweets_col, batched=True)
+    results["batched_tweets_per_sec"] = len(tweets_df) / (time.perf_counter() - start)
+
+    results["speedup"] = results["batched_tweets_per_sec"] / results["per_word_tweets_per_sec"]
+    results["identical_output"] = per_word == batched
+    return results
+
+
+def measure_parallel_scaling(tweets, worker_counts=(1, 2, 4, 8, 16), chunk_size=2000):
+    """
+    Measure preprocess_tweets_parallel throughput for several worker counts.
+
+    :param tweets: list of tweet texts
+    :param worker_counts: numbers of worker processes to try
+    :param chunk_size: number of tweets per worker task
+
+    :return: dictionary of worker count to tweets/sec
+    """
+    preprocessing = TweetsPreprocessing()
+    results = {}
+    for n_workers in worker_counts:
+        start = time.perf_counter()
+        preprocessing.preprocess_tweets_parallel(tweets, chunk_size=chunk_size, n_workers=n_workers)
+        results[n_workers] = len(tweets) / (time.perf_counter() - start)
+    return results
+
+
+def legacy_cleaning(preprocessing, text):
+    """
+    The string stages of preprocessing_pipeline without tagging and lemmatizing:
+    three cleaning passes, tokenize, join, tokenize again for the stopword stage.
+    """
+    cleaned = preprocessing.remove_non_ascii(
+        preprocessing.remove_punctuation(preprocessing.remove_link_mentions(text.lower())))
+    joined = ' '.join(preprocessing.tokenizer.tokenize(cleaned))
+    return preprocessing.tokenizer.tokenize(joined)
+
+
+def compare_normalizer_cost(tweets):
+    """
+    Micro-benchmark of the legacy cleaning stages against normalize_tweet.
+
+    Latency is the mean time per tweet. Allocation is the mean tracemalloc peak measured around each
+    tweet, i.e. the transient memory held by the intermediate strings and token lists.
+
+    :param tweets: list of tweet texts
+
+    :return: dictionary of microseconds and peak bytes per tweet for both paths
+    """
+    preprocessing = TweetsPreprocessing()
+    paths = {"legacy": lambda text: legacy_cleaning(preprocessing, text),
+             "fused": preprocessing.normalize_tweet}
+    results = {}
+    for name, clean in paths.items():
+        start = time.perf_counter()
+        for tweet in tweets:
+            clean(tweet)
+        results[f"{name}_us_per_tweet"] = (time.perf_counter() - start) / len(tweets) * 1e6
+
+        peak_bytes = 0
+        tracemalloc.start()
+        for tweet in tweets:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            clean(tweet)
+            peak_bytes += tracemalloc.get_traced_memory()[1] - baseline
+        tracemalloc.stop()
+        results[f"{name}_peak_bytes_per_tweet"] = peak_bytes / len(tweets)
+    return results
+
+
+if __name__ == "__main__":
+    file_path = sys.argv[1]
+    no_of_tweets = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    df = pd.read_json(file_path, lines=True, nrows=no_of_tweets)
+    for name, value in compare_preprocessing_throughput(df).items():
+        print(f"{name}: {value}")
+    for name, value in compare_normalizer_cost(df["full_text"].tolist()).items():
+        print(f"{name}: {value}")
+    for n_workers, tweets_per_sec in measure_parallel_scaling(df["full_text"].tolist()).items():
+        print(f"parallel_{n_workers}_workers_tweets_per_sec: {tweets_per_sec}")
@@ -0,0 +1,53 @@
+"""
+Query latency of the sharded tweet similarity index against index size.
+
+Usage (from the project root, after pip install -e .):
+    python benchmarks/bench_similarity.py
+"""
+import tempfile
+import time
+
+import numpy as np
+from gensim import corpora
+from twitter_data_analysis.similarity_index import TweetSimilarityIndex
+
+
+def random_bow(no_of_tweets, vocabulary_size, words_per_tweet, rng):
+    """
+    Synthetic bag-of-words vectors with a Zipf-like word distribution
+    """
+    word_ids = np.minimum(rng.zipf(1.3, size=(no_of_tweets, words_per_tweet)), vocabulary_size) - 1
+    return [sorted((int(word_id), 1) for word_id in set(tweet)) for tweet in word_ids]
+
+
+def measure_query_latency(index_sizes=(10000, 50000, 100000, 200000), vocabulary_size=20000, query_batch=64,
+                          k=10, shard_size=32768, repeats=5, seed=0):
+    """
+    Grow a TF-IDF index step by step and time batched top-k queries at each size
+
+    :return: list of dictionaries with the index size, shards and milliseconds per query batch and per tweet
+    """
+    rng = np.random.default_rng(seed)
+    mapping_dict = corpora.Dictionary([[str(word_id) for word_id in range(vocabulary_size)]])
+    queries = random_bow(query_batch, vocabulary_size, 12, rng)
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        similarity_index = TweetSimilarityIndex(temp_dir + "/bench.index", mapping_dict, shard_size=shard_size)
+        for index_size in index_sizes:
+            similarity_index.add_documents(random_bow(index_size - len(similarity_index.tweet_ids),
+                                                      vocabulary_size, 12, rng))
+            similarity_index.query(queries[:1], k)  # flush the open shard to disk
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                similarity_index.query(queries, k)
+                timings.append(time.perf_counter() - start)
+            batch_ms = float(np.median(timings)) * 1000
+            results.append({"index_size": index_size, "shards": len(similarity_index.index.shards),
+                            "batch_ms": batch_ms, "ms_per_tweet": batch_ms / query_batch})
+    return results
+
+
+if __name__ == "__main__":
+    for result in measure_query_latency():
+        print(result)
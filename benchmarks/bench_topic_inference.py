@@ -0,0 +1,39 @@
+"""
+Latency of batched topic inference for several batch sizes.
+
+Usage (from the project root after pip install -e ., with a saved model and dictionary):
+    python benchmarks/bench_topic_inference.py ./data/global_twitter_data.json lda_tweets tweets_mapping
+"""
+import sys
+
+import pandas as pd
+from twitter_data_analysis.topic_modelling import TopicModelling
+
+
+def measure_inference_latency(tweets, lda_name, mapping_name, batch_sizes=(1, 8, 64, 512), repeats=50):
+    """
+    Call TopicModelling.infer_topics repeatedly for each batch size
+
+    :param tweets: list of tweet texts, at least max(batch_sizes) long
+    :param lda_name: the file name of the saved LDA model
+    :param mapping_name: the file name of the saved dictionary
+    :param batch_sizes: numbers of tweets per call
+    :param repeats: calls per batch size
+
+    :return: dataframe of p50/p99 latency per batch size
+    """
+    topic_modelling = TopicModelling()
+    # first call loads the model, keep it out of the measurements
+    topic_modelling.infer_topics(tweets[:1], lda_name, mapping_name)
+    topic_modelling.inference_latencies.clear()
+    for batch_size in batch_sizes:
+        for repeat in range(repeats):
+            offset = (repeat * batch_size) % max(len(tweets) - batch_size, 1)
+            topic_modelling.infer_topics(tweets[offset:offset + batch_size], lda_name, mapping_name)
+    return topic_modelling.inference_latency_report()
+
+
+if __name__ == "__main__":
+    file_path, lda_name, mapping_name = sys.argv[1:4]
+    df = pd.read_json(file_path, lines=True, nrows=5000)
+    print(measure_inference_latency(df["full_text"].tolist(), lda_name, mapping_name).to_string(index=False))
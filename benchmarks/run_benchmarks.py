@@ -0,0 +1,295 @@
+"""
+Reproducible benchmark suite over deterministic synthetic tweets, see synthetic_tweets.py.
+
+Every benchmark is timed repeats times on the same generated data. The results are written as JSON,
+named by time and commit, and compared with the previous results file so that regressions between
+commits are visible. A benchmark that cannot run (e.g. NLTK data is missing) is recorded with its error.
+
+Usage (from the project root, after pip install -e .):
+    python benchmarks/run_benchmarks.py --tweets 5000 --repeats 3
+    python benchmarks/run_benchmarks.py --only create_bow transform_mask --compare benchmarks/results/old.json
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from unittest import mock
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+# benchmark name -> setup function, registered with @benchmark
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """
+    Register a benchmark. The decorated function receives the BenchmarkContext, does its setup and
+    returns the function to time together with the number of items it processes.
+    """
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+class BenchmarkContext:
+    """
+    Synthetic data shared by the benchmarks of a run, generated once and on first use
+    """
+
+    def __init__(self, n_tweets, seed, work_dir):
+        self.n_tweets = n_tweets
+        self.seed = seed
+        self.work_dir = work_dir
+        self._tweets_file = None
+        self._tweets_df = None
+        self._tokens = None
+
+    @property
+    def tweets_file(self):
+        if self._tweets_file is None:
+            from synthetic_tweets import write_tweets
+            self._tweets_file = os.path.join(self.work_dir, f"tweets_{self.n_tweets}_{self.seed}.json")
+            write_tweets(self._tweets_file, self.n_tweets, self.seed)
+        return self._tweets_file
+
+    @property
+    def tweets_df(self):
+        if self._tweets_df is None:
+            from twitter_data_analysis.tweet_loader import read_tweets
+            self._tweets_df = read_tweets(self.tweets_file, ["id", "full_text"])
+        return self._tweets_df
+
+    @property
+    def tokens(self):
+        """
+        Tweets normalized with the fused normalizer, which needs no NLTK data
+        """
+        if self._tokens is None:
+            from twitter_data_analysis.preprocessing import NORMALIZE_PATTERN
+            self._tokens = [NORMALIZE_PATTERN.sub("", text.lower()).split() for text in self.tweets_df["full_text"]]
+        return self._tokens
+
+
+@benchmark("preprocessing_pipeline")
+def bench_preprocessing_pipeline(context):
+    from twitter_data_analysis.preprocessing import TweetsPreprocessing
+    preprocessing = TweetsPreprocessing()
+    # the per-word pipeline is slow, a slice of the tweets is enough
+    words = [word for text in context.tweets_df["full_text"][:500] for word in text.split()]
+    preprocessing.preprocessing_pipeline(words[0])
+    return (lambda: [preprocessing.preprocessing_pipeline(word) for word in words]), len(words)
+
+
+@benchmark("preprocess_tweets_df")
+def bench_preprocess_tweets_df(context):
+    from twitter_data_analysis.preprocessing import TweetsPreprocessing
+    preprocessing = TweetsPreprocessing()
+    df = context.tweets_df
+    preprocessing.preprocess_tweets_batch(df["full_text"][:10], True)
+    return (lambda: preprocessing.preprocess_tweets_df(df, "full_text", batched=True, fused=True)), len(df)
+
+
+@benchmark("create_bow")
+def bench_create_bow(context):
+    from twitter_data_analysis.topic_modelling import TopicModelling
+    from gensim import corpora
+    topic_modelling = TopicModelling()
+    mapping_dict = corpora.Dictionary(context.tokens)
+    return (lambda: topic_modelling.create_bow(context.tokens, mapping_dict)), len(context.tokens)
+
+
+@benchmark("create_lda_model")
+def bench_create_lda_model(context):
+    from twitter_data_analysis.topic_modelling import TopicModelling
+    from gensim import corpora
+    topic_modelling = TopicModelling()
+    mapping_dict = corpora.Dictionary(context.tokens)
+    bow = topic_modelling.create_bow(context.tokens, mapping_dict)
+    return (lambda: topic_modelling.create_lda_model(bow, mapping_dict, no_of_topics=10, no_of_passes=1)), len(bow)
+
+
+@benchmark("transform_mask")
+def bench_transform_mask(context):
+    import numpy as np
+    from PIL import Image
+    from twitter_data_analysis.transform_mask import MaskTransformation
+    with Image.open("res/twitter.png") as image:
+        mask = np.array(image)
+    mask_transformation = MaskTransformation()
+    return (lambda: mask_transformation.transform_mask(mask)), mask.size
+
+
+@benchmark("extract_dataframe")
+def bench_extract_dataframe(context):
+    from twitter_data_analysis.extract_dataframe import TweetDfExtractor
+    tweets_file = context.tweets_file
+    return (lambda: TweetDfExtractor.from_json_file(tweets_file).get_tweet_df()), context.n_tweets
+
+
+@benchmark("score_tokens")
+def bench_score_tokens(context):
+    from twitter_data_analysis.sentiment import LexiconSentiment
+    sentiment = LexiconSentiment()
+    return (lambda: sentiment.score_tokens(context.tokens)), len(context.tokens)
+
+
+@benchmark("upload_tweets")
+def bench_upload_tweets(context):
+    from twitter_data_analysis.upload_docs import UploadDocs
+    upload = UploadDocs("mongodb://localhost")
+    runs = iter(range(1000))
+    # a new collection per repeat, so every repeat inserts instead of hitting duplicates
+    return (lambda: upload.upload_tweets(context.tweets_file, "benchmark", f"upload_{next(runs)}")), context.n_tweets
+
+
+@benchmark("read_tweets_in_collection")
+def bench_read_tweets_in_collection(context):
+    from twitter_data_analysis.read_docs import ReadDocs
+    from twitter_data_analysis.upload_docs import UploadDocs
+    UploadDocs("mongodb://localhost").upload_tweets(context.tweets_file, "benchmark", "read")
+    reader = ReadDocs("mongodb://localhost")
+    fields = ["created_at", "full_text", "lang", "user.screen_name"]
+    return (lambda: reader.read_tweets_in_collection("benchmark", "read", fields=fields)), context.n_tweets
+
+
+def time_benchmark(setup, context, repeats):
+    """
+    Set up one benchmark and time it
+
+    :return: dictionary of timings in seconds and throughput, or of the error that stopped it
+    """
+    try:
+        function, items = setup(context)
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+    except Exception as exception:
+        return {"error": f"{type(exception).__name__}: {exception}"}
+    median = statistics.median(timings)
+    return {"items": items, "repeats": repeats, "min": min(timings), "median": median,
+            "mean": statistics.fmean(timings), "items_per_sec": items / median if median > 0 else None}
+
+
+def git_commit():
+    """
+    :return: short hash of the checked out commit, None outside a git repository
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(names=None, n_tweets=5000, seed=0, repeats=3):
+    """
+    Run the registered benchmarks against mongomock on one synthetic data set
+
+    :param names: benchmarks to run, None runs all of them
+    :param n_tweets: number of synthetic tweets
+    :param seed: seed of the synthetic tweets
+    :param repeats: number of timed runs per benchmark
+
+    :return: results dictionary, see write_results
+    """
+    import mongomock
+    from twitter_data_analysis import connect_to_mongo
+    results = {"commit": git_commit(), "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+               "python": platform.python_version(), "platform": platform.platform(),
+               "tweets": n_tweets, "seed": seed, "benchmarks": {}}
+    with tempfile.TemporaryDirectory() as work_dir, \
+            mock.patch.object(connect_to_mongo, "MongoClient", mongomock.MongoClient):
+        context = BenchmarkContext(n_tweets, seed, work_dir)
+        for name in names or BENCHMARKS:
+            results["benchmarks"][name] = time_benchmark(BENCHMARKS[name], context, repeats)
+        connect_to_mongo.close_all_clients()
+    return results
+
+
+def write_results(results, results_dir=RESULTS_DIR):
+    """
+    Save results as <results_dir>/<timestamp>_<commit>.json
+
+    :return: path of the file
+    """
+    os.makedirs(results_dir, exist_ok=True)
+    stamp = results["timestamp"].replace(":", "").replace("-", "").split("+")[0]
+    file_path = os.path.join(results_dir, f"{stamp}_{results['commit'] or 'nogit'}.json")
+    with open(file_path, "w", encoding="utf-8") as results_file:
+        json.dump(results, results_file, indent=2)
+    return file_path
+
+
+def latest_results(results_dir=RESULTS_DIR, exclude=None):
+    """
+    :return: path of the newest results file other than exclude, None if there is none
+    """
+    paths = sorted(path for path in glob.glob(os.path.join(results_dir, "*.json")) if path != exclude)
+    return paths[-1] if paths else None
+
+
+def compare_results(current, previous, threshold=0.1):
+    """
+    Compare the median timings of two runs
+
+    :param current: results of this run
+    :param previous: results of an earlier run
+    :param threshold: relative slowdown reported as a regression, 0.1 is 10% slower
+
+    :return: list of (benchmark, previous median, current median, ratio, regressed)
+    """
+    rows = []
+    for name, timing in current["benchmarks"].items():
+        before = previous["benchmarks"].get(name, {})
+        if "median" not in timing or "median" not in before:
+            continue
+        ratio = timing["median"] / before["median"]
+        rows.append((name, before["median"], timing["median"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tweets", type=int, default=5000, help="number of synthetic tweets")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic tweets")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per benchmark")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--results-dir", default=RESULTS_DIR, help="folder of the JSON results")
+    parser.add_argument("--compare", help="results file to compare with, defaults to the latest one")
+    parser.add_argument("--threshold", type=float, default=0.1, help="slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.only, args.tweets, args.seed, args.repeats)
+    file_path = write_results(results, args.results_dir)
+    for name, timing in results["benchmarks"].items():
+        if "error" in timing:
+            # NLTK lookup errors span a whole banner, the file keeps it all
+            print(f"{name:28} error: {' '.join(timing['error'].split())[:100]}")
+        else:
+            print(f"{name:28} {timing['median'] * 1000:10.1f} ms  {timing['items_per_sec']:12.0f} items/sec")
+    print(f"results written to {file_path}")
+
+    previous_path = args.compare or latest_results(args.results_dir, exclude=file_path)
+    regressed = False
+    if previous_path:
+        with open(previous_path, encoding="utf-8") as previous_file:
+            previous = json.load(previous_file)
+        print(f"compared with {previous_path} (commit {previous.get('commit')})")
+        for name, before, after, ratio, slower in compare_results(results, previous, args.threshold):
+            print(f"{name:28} {before * 1000:10.1f} ms -> {after * 1000:10.1f} ms  x{ratio:.2f}"
+                  + ("  REGRESSION" if slower else ""))
+            regressed = regressed or slower
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Deterministic generator of synthetic Twitter API v1.1 tweets for benchmarks.
+
+The same seed always produces the same tweets. Tweets carry nested user, entities and place objects,
+hashtags, mentions, links, emoji and a configurable share of retweets with a retweeted_status,
+so they exercise the same code paths as the real dumps.
+
+Usage (from the project root, after pip install -e .):
+    python benchmarks/synthetic_tweets.py ./data/synthetic_tweets.json 100000
+"""
+import json
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+# created_at of the first tweet, later tweets are up to a few seconds apart
+START_TIME = datetime(2022, 8, 8, 7, 0, 0, tzinfo=timezone.utc)
+WORDS = ("the a to of and in is for on that with this it be at are you was from have not but we they our more "
+         "news market price climate energy vote election team match game win loss season player coach fans "
+         "government policy health vaccine school students city water food crisis war peace talks summit "
+         "economy inflation rate bank growth jobs workers strike protest police court law report data study "
+         "great good bad terrible happy sad love hate best worst amazing awful hope fear safe danger today "
+         "tonight tomorrow week year morning night people world country africa europe asia kenya nigeria").split()
+HASHTAGS = ("Kenya Nairobi Election2022 Climate COP27 WorldCup Football Economy Inflation Breaking News Health "
+            "Covid19 Vaccine Tech AI Crypto Bitcoin Africa Europe Asia Music Movies Sports Politics").split()
+EMOJI = ["\U0001F600", "\U0001F602", "\U0001F60D", "\U0001F44D", "\U0001F525", "\U0001F64F", "❤️",
+         "\U0001F622", "\U0001F621", "⚽", "\U0001F30D", "\U0001F4B0"]
+LANGUAGES = ["en"] * 8 + ["fr", "sw", "es", "und"]
+SOURCES = ['<a href="http://twitter.com/download/android" rel="nofollow">Twitter for Android</a>',
+           '<a href="http://twitter.com/download/iphone" rel="nofollow">Twitter for iPhone</a>',
+           '<a href="https://mobile.twitter.com" rel="nofollow">Twitter Web App</a>']
+PLACES = [("Nairobi, Kenya", "KE", [36.66, -1.44, 37.1, -1.16]), ("Lagos, Nigeria", "NG", [3.1, 6.39, 3.7, 6.7]),
+          ("Paris, France", "FR", [2.22, 48.81, 2.47, 48.9]), ("London, England", "GB", [-0.51, 51.28, 0.33, 51.69])]
+TWITTER_DATE_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+
+
+def make_user(rng, user_id):
+    """
+    :return: user object of a synthetic account, the same for the same user_id
+    """
+    user_rng = random.Random(user_id)
+    return {"id": user_id, "id_str": str(user_id), "screen_name": f"user_{user_id}",
+            "name": f"User {user_id}", "location": user_rng.choice(["Nairobi", "Lagos", "Paris", "", "Earth"]),
+            "followers_count": int(user_rng.paretovariate(1.2) * 50), "friends_count": user_rng.randint(0, 2000),
+            "statuses_count": user_rng.randint(1, 50000), "verified": user_rng.random() < 0.02,
+            "created_at": "Wed Jan 01 00:00:00 +0000 2020"}
+
+
+def make_status(rng, tweet_id, created_at, n_users):
+    """
+    Build the text and entities of one tweet, recording entity indices as the API does
+
+    :return: status dictionary without retweet fields
+    """
+    parts, hashtags, mentions, urls = [], [], [], []
+    position = 0
+
+    def add(text):
+        nonlocal position
+        if parts:
+            position += 1
+        start = position
+        parts.append(text)
+        position += len(text)
+        return [start, position]
+
+    for _ in range(rng.choice([0, 0, 1, 2])):
+        screen_name = f"user_{rng.randrange(n_users)}"
+        mentions.append({"screen_name": screen_name, "name": screen_name, "id": int(screen_name[5:]),
+                         "indices": add("@" + screen_name)})
+    for _ in range(rng.randint(5, 25)):
+        roll = rng.random()
+        if roll < 0.06:
+            tag = rng.choice(HASHTAGS)
+            hashtags.append({"text": tag, "indices": add("#" + tag)})
+        elif roll < 0.1:
+            add(rng.choice(EMOJI))
+        elif roll < 0.12:
+            url = f"https://t.co/{rng.getrandbits(40):010x}"
+            urls.append({"url": url, "expanded_url": f"https://example.com/{rng.getrandbits(24)}",
+                         "indices": add(url)})
+        else:
+            word = rng.choice(WORDS)
+            add(word.capitalize() if rng.random() < 0.1 else word)
+    text = " ".join(parts)
+    place = None
+    if rng.random() < 0.05:
+        full_name, country_code, (west, south, east, north) = rng.choice(PLACES)
+        place = {"full_name": full_name, "place_type": "city", "country_code": country_code,
+                 "bounding_box": {"type": "Polygon",
+                                  "coordinates": [[[west, south], [east, south], [east, north], [west, north]]]}}
+    return {"created_at": created_at.strftime(TWITTER_DATE_FORMAT), "id": tweet_id, "id_str": str(tweet_id),
+            "full_text": text, "truncated": False, "display_text_range": [0, len(text)],
+            "entities": {"hashtags": hashtags, "symbols": [], "user_mentions": mentions, "urls": urls},
+            "source": rng.choice(SOURCES), "lang": rng.choice(LANGUAGES),
+            "retweet_count": int(rng.paretovariate(1.5)) - 1, "favorite_count": int(rng.paretovariate(1.3)) - 1,
+            "favorited": False, "retweeted": False, "place": place}
+
+
+def generate_tweets(n_tweets, seed=0, retweet_ratio=0.3, n_users=5000, sensitive_ratio=0.1):
+    """
+    Generate synthetic tweets
+
+    :param n_tweets: number of tweets
+    :param seed: random seed, the same seed gives the same tweets
+    :param retweet_ratio: share of tweets which are retweets
+    :param n_users: number of distinct accounts
+    :param sensitive_ratio: share of tweets with possibly_sensitive set
+
+    :return: generator of tweet dictionaries
+    """
+    rng = random.Random(seed)
+    created_at = START_TIME
+    for index in range(n_tweets):
+        created_at += timedelta(seconds=rng.randint(0, 4))
+        tweet_id = 1556500000000000000 + index * 1000
+        tweet = make_status(rng, tweet_id, created_at, n_users)
+        tweet["user"] = make_user(rng, rng.randrange(n_users))
+        if rng.random() < sensitive_ratio:
+            tweet["possibly_sensitive"] = rng.random() < 0.2
+        if rng.random() < retweet_ratio:
+            original = make_status(rng, tweet_id - 1, created_at - timedelta(minutes=rng.randint(1, 600)), n_users)
+            original["user"] = make_user(rng, rng.randrange(n_users))
+            author = original["user"]["screen_name"]
+            prefix = f"RT @{author}: "
+            # retweets carry a truncated copy of the original text
+            tweet["full_text"] = (prefix + original["full_text"])[:140]
+            tweet["display_text_range"] = [0, len(tweet["full_text"])]
+            tweet["entities"]["user_mentions"] = [{"screen_name": author, "name": author, "id": original["user"]["id"],
+                                                   "indices": [3, 4 + len(author)]}]
+            # entities of the original which are still inside the truncated text, shifted by the prefix
+            tweet["entities"]["hashtags"] = [
+                {"text": hashtag["text"], "indices": [index + len(prefix) for index in hashtag["indices"]]}
+                for hashtag in original["entities"]["hashtags"] if hashtag["indices"][1] + len(prefix) <= 140]
+            tweet["retweet_count"] = original["retweet_count"]
+            tweet["retweeted_status"] = original
+        yield tweet
+
+
+def write_tweets(file_path, n_tweets, seed=0, **options):
+    """
+    Write synthetic tweets to a JSON lines file, see generate_tweets
+
+    :return: number of tweets written
+    """
+    with open(file_path, "w", encoding="utf-8") as tweets_file:
+        for tweet in generate_tweets(n_tweets, seed, **options):
+            tweets_file.write(json.dumps(tweet) + "\n")
+    return n_tweets
+
+
+if __name__ == "__main__":
+    print(write_tweets(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]) if len(sys.argv) > 3 else 0))
@@ -0,0 +1,79 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import mongomock
+
+from twitter_data_analysis import cli, connect_to_mongo, logger_setup
+
+token_lists = [["drill", "taiwan", "#taiwan"], ["election", "kenya", "vote"], ["drill", "navy", "taiwan"],
+               ["vote", "count", "kenya", "#election2022"]] * 5
+
+
+class TestCli(unittest.TestCase):
+    """
+    Unit tests for the twitter-analysis subcommands
+    """
+
+    def setUp(self):
+        work_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(work_dir.cleanup)
+        self.work_dir = work_dir.name
+        self.tokens_path = os.path.join(self.work_dir, "tokens.jsonl")
+        with open(self.tokens_path, "w", encoding="utf-8") as tokens_file:
+            tokens_file.writelines(json.dumps(tokens) + "\n" for tokens in token_lists)
+
+    def test_train_and_word_cloud(self):
+        model = os.path.join(self.work_dir, "lda")
+        mapping = os.path.join(self.work_dir, "mapping")
+        metrics_path = os.path.join(self.work_dir, "metrics.jsonl")
+        self.assertEqual(cli.main(["--metrics", metrics_path, "train", self.tokens_path, "--model", model,
+                                   "--dictionary", mapping, "--topics", "2", "--passes", "1"]), 0)
+        self.assertTrue(os.path.exists(model))
+        self.assertTrue(os.path.exists(mapping + ".dict"))
+        with open(metrics_path) as metrics_file:
+            self.assertIn("topic_modelling.train_lda", json.loads(metrics_file.readline())["metrics"])
+
+        image_path = os.path.join(self.work_dir, "cloud.png")
+        self.assertEqual(cli.main(["wordcloud", self.tokens_path, image_path, "--max-words", "10"]), 0)
+        self.assertGreater(os.path.getsize(image_path), 0)
+
+    def test_infer_normalizer_matches_preprocess(self):
+        from twitter_data_analysis.topic_modelling import TopicModelling
+        for extra, fused in [([], False), (["--fused"], True)]:
+            with mock.patch.object(TopicModelling, "infer_topics", return_value=[]) as infer_topics:
+                self.assertEqual(cli.main(["infer", "a tweet", "--model", "lda", "--dictionary", "mapping", *extra]), 0)
+            self.assertEqual(infer_topics.call_args.kwargs["fused"], fused)
+
+    def test_ingest(self):
+        patcher = mock.patch.object(connect_to_mongo, "MongoClient", mongomock.MongoClient)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(connect_to_mongo.close_all_clients)
+        # the console log handler is created inside redirect_stdout, start a new one afterwards
+        self.addCleanup(logger_setup.stop_listeners)
+        tweets_path = os.path.join(self.work_dir, "tweets.json")
+        with open(tweets_path, "w", encoding="utf-8") as tweets_file:
+            for tweet_id in range(3):
+                tweets_file.write(json.dumps({"id": tweet_id, "created_at": "Mon Aug 08 07:40:53 +0000 2022",
+                                              "full_text": f"tweet {tweet_id}"}) + "\n")
+        output = io.StringIO()
+        with redirect_stdout(output):
+            status = cli.main(["ingest", tweets_path, "--uri", "mongodb://localhost", "--database", "tweets",
+                               "--collection", "global", "--writers", "1"])
+        self.assertEqual(status, 0)
+        summary = [line for line in output.getvalue().splitlines() if line.startswith("{")]
+        self.assertEqual(json.loads(summary[0])["inserted"], 3)
+
+    def test_dashboard_needs_a_source(self):
+        with mock.patch.dict(os.environ, {"MONGODB_URI": ""}), redirect_stdout(io.StringIO()), \
+                mock.patch("sys.stderr", io.StringIO()), self.assertRaises(SystemExit):
+            cli.main(["dashboard", "--uri", ""])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import os
+import unittest
+
+try:
+    from streamlit.testing.v1 import AppTest
+except ImportError:
+    # the dashboard extra is not installed
+    AppTest = None
+
+SAMPLE_TWEETS = os.path.join(os.path.dirname(__file__), "sample_tweets.json")
+
+
+def run_dashboard(data_file_path):
+    # AppTest runs the source of this function as a script, so it imports what it uses
+    from twitter_data_analysis.dashboard import DashboardSetup
+    dashboard = DashboardSetup(data_file_path)
+    dashboard.selectHashTag()
+    dashboard.selectLocAndAuth()
+
+
+@unittest.skipIf(AppTest is None, "streamlit is not installed")
+class TestDashboard(unittest.TestCase):
+    """
+    Smoke test of the Streamlit dashboard on the sample tweet file
+    """
+
+    def test_file_dashboard_renders(self):
+        app = AppTest.from_function(run_dashboard, args=(SAMPLE_TWEETS,), default_timeout=60)
+        app.run()
+        self.assertFalse(app.exception, [exception.value for exception in app.exception])
+        self.assertEqual(app.title[0].value, "Twitter Data Visualizations")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,17 +1,14 @@
 import unittest
 import pandas as pd
-import sys, os
+import os
 
-sys.path.append(os.path.abspath(os.path.join("../..")))
+from twitter_data_analysis.extract_dataframe import read_json
+from twitter_data_analysis.extract_dataframe import TweetDfExtractor
 
-from extract_dataframe import read_json
-from extract_dataframe import TweetDfExtractor
-
-# For unit testing the data reading and processing codes, 
-# we will need about 5 tweet samples. 
-# Create a sample not more than 10 tweets and place it in a json file.
-# Provide the path to the samples tweets file you created below
-sampletweetsjsonfile = ""   #put here the path to where you placed the file e.g. ./sampletweets.json. 
+# For unit testing the data reading and processing codes,
+# we will need about 5 tweet samples.
+# Sample of 6 tweets, including a retweet, places and a tweet without possibly_sensitive
+sampletweetsjsonfile = os.path.join(os.path.dirname(__file__), "sample_tweets.json")
 _, tweet_list = read_json(sampletweetsjsonfile)
 
 columns = [
@@ -39,8 +36,7 @@ columns = [
 
 class TestTweetDfExtractor(unittest.TestCase):
     """
-    TODO:
-		A class for unit-testing function in the fix_clean_tweets_dataframe.py file
+		A class for unit-testing function in the extract_dataframe.py file
 
 		Args:
         -----
@@ -54,12 +50,16 @@ class TestTweetDfExtractor(unittest.TestCase):
 
     def test_find_statuses_count(self):
         self.assertEqual(
-            self.df.find_statuses_count()
-                # <provide a list of the first five status counts>
+            self.df.find_statuses_count(), [1500, 20311, 45, 780, 3020]
         )
 
     def test_find_full_text(self):
-        # text = <provide a list of the first five full texts>
+        text = ["Climate talks resume in #Nairobi today https://t.co/abc",
+                "Markets rally as inflation eases across #Europe and #Asia, analysts say the trend could continue "
+                "into the autumn.",
+                "@amina_k @trader_joe Agreed, see you both at the summit",
+                "La réunion commence à 10h #Paris",
+                "Great match tonight!! #football #Football"]
 
         self.assertEqual(self.df.find_full_text(), text)
 
@@ -67,36 +67,58 @@ class TestTweetDfExtractor(unittest.TestCase):
         self.assertEqual(
             self.df.find_sentiments(self.df.find_full_text()),
             (
-                # <provide a list of the first five sentiment values>,
-                # <provide a list of the first five polarity values>,
+                # float32 VADER valences / 4: 0.325, 0.275 and 0.775, subjectivity is their strength
+                [0.0, 0.32499998807907104, 0.2750000059604645, 0.0, 0.7749999761581421],
+                [0.0, 0.32499998807907104, 0.2750000059604645, 0.0, 0.7749999761581421],
             ),
         )
 
 
     def test_find_screen_name(self):
-        # name = <provide a list of the first five screen names>
+        name = ["amina_k", "trader_joe", "kofi_m", "claire_d", "sam_o"]
         self.assertEqual(self.df.find_screen_name(), name)
 
     def test_find_followers_count(self):
-        # f_count = <provide a list of the first five follower counts>
+        f_count = [320, 1045, 12, 230, 95]
         self.assertEqual(self.df.find_followers_count(), f_count)
 
     def test_find_friends_count(self):
-        # friends_count = <provide a list of the first five friend's counts>
+        friends_count = [180, 998, 60, 310, 88]
         self.assertEqual(self.df.find_friends_count(), friends_count)
 
     def test_find_is_sensitive(self):
-        self.assertEqual(self.df.is_sensitive())
-        # <provide a list of the first five is_sensitive values>)
+        self.assertEqual(self.df.is_sensitive(), [False, None, True, None, False])
 
     def test_find_hashtags(self):
-        self.assertEqual(self.df.find_hashtags(), )
+        self.assertEqual(self.df.find_hashtags(), [["Nairobi"], ["Europe", "Asia"], [], ["Paris"],
+                                                   ["football", "Football"]])
 
     def test_find_mentions(self):
-        self.assertEqual(self.df.find_mentions(), )
+        self.assertEqual(self.df.find_mentions(), [[], ["GlobalNews"], ["amina_k", "trader_joe"], [], []])
+
+    def test_long_tables(self):
+        hashtags = self.df.get_hashtags_df()
+        self.assertEqual(hashtags["tweet"].tolist(), [0, 1, 1, 3, 4, 4])
+        self.assertEqual(self.df.get_mentions_df()["screen_name"].tolist(), ["GlobalNews", "amina_k", "trader_joe"])
+
+    def test_get_tweet_df(self):
+        tweet_df = self.df.get_tweet_df()
+        self.assertEqual(list(tweet_df.columns), columns)
+        self.assertEqual(len(tweet_df), 5)
+        self.assertEqual(tweet_df["clean_text"][0], "climate talks resume in #nairobi today")
+        self.assertEqual(tweet_df["place"].fillna("").tolist(), ["Nairobi, Kenya", "", "", "Paris, France", ""])
+        self.assertEqual(str(tweet_df["created_at"][0]), "2022-08-08 07:40:53+00:00")
+        self.assertEqual(tweet_df["possibly_sensitive"].isna().sum(), 2)
+        self.assertEqual(tweet_df["polarity"].dtype, "float32")
+        self.assertEqual(tweet_df["sentiment"].tolist(), ["neutral", "positive", "positive", "neutral", "positive"])
+
+    def test_file_matches_list(self):
+        from_file = TweetDfExtractor.from_json_file(sampletweetsjsonfile).get_tweet_df()
+        from_list = TweetDfExtractor(tweet_list).get_tweet_df()
+        self.assertEqual(len(from_file), 6)
+        pd.testing.assert_frame_equal(from_file, from_list)
 
 
 
 if __name__ == "__main__":
     unittest.main()
-
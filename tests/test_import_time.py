@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+import unittest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+# modules which take seconds to import and must only be imported by the code paths using them
+HEAVY_MODULES = {"gensim", "nltk", "pyLDAvis", "matplotlib", "sklearn", "wordcloud", "PIL", "streamlit"}
+# cumulative import time budgets in seconds, generous so that slow CI machines do not fail
+CLI_BUDGET = 0.5
+MODULE_BUDGET = 3.0
+
+
+def import_times(module):
+    """
+    Import a module in a fresh interpreter with python -X importtime
+
+    :return: dictionary of imported module -> cumulative import time in seconds
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if line.startswith("import time:") and not line.endswith("imported package"):
+            _, cumulative, name = line.split("|")
+            times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+    """
+    Import time budget of the command line entry point and the library modules
+    """
+
+    def assert_light(self, module, budget):
+        times = import_times(module)
+        heavy = {name for name in times if name.split(".")[0] in HEAVY_MODULES}
+        self.assertEqual(heavy, set(), f"{module} imports {sorted(heavy)}")
+        self.assertLess(times[module], budget)
+
+    def test_cli_starts_fast(self):
+        self.assert_light("twitter_data_analysis.cli", CLI_BUDGET)
+
+    def test_library_modules_import_lazily(self):
+        for module in ("twitter_data_analysis.topic_modelling", "twitter_data_analysis.extract_dataframe",
+                       "twitter_data_analysis.read_docs", "twitter_data_analysis.upload_docs"):
+            with self.subTest(module=module):
+                self.assert_light(module, MODULE_BUDGET)
+
+
+if __name__ == "__main__":
+    unittest.main()
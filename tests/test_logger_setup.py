@@ -0,0 +1,89 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+from twitter_data_analysis import logger_setup
+
+
+class TestLoggerSetup(unittest.TestCase):
+    """
+    Unit tests for the logger setup and the timers
+    """
+
+    def setUp(self):
+        self.registry = logger_setup.Metrics()
+        self.addCleanup(logger_setup.stop_listeners)
+
+    def test_setup_is_idempotent(self):
+        first = logger_setup.logger_console_config("test_logger_setup.console")
+        second = logger_setup.logger_console_config("test_logger_setup.console")
+        self.assertIs(first, second)
+        self.assertEqual(len(first.handlers), 1)
+        self.assertIsInstance(first.handlers[0], logging.handlers.QueueHandler)
+
+    def test_file_logger_writes_through_queue(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            logger = logger_setup.logger_file_config(log_dir, "test_logger_setup.file", "run.log")
+            logger_setup.logger_file_config(log_dir, "test_logger_setup.file", "run.log")
+            logger.setLevel(logging.DEBUG)
+            logger.info("queued message")
+            logger_setup.stop_listeners()
+            self.assertEqual(logger.handlers, [])
+            with open(os.path.join(log_dir, "run.log")) as log_file:
+                lines = log_file.read().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].endswith(": INFO: queued message"))
+
+    def test_timers_and_counters(self):
+        @logger_setup.timed("square", self.registry)
+        def square(value):
+            return value * value
+
+        self.assertEqual([square(value) for value in range(3)], [0, 1, 4])
+        with logger_setup.timed("block", self.registry) as timer:
+            pass
+        logger_setup.count("tweets", 5, self.registry)
+        logger_setup.count("tweets", 2, self.registry)
+        summary = self.registry.summary()
+        self.assertEqual(summary["square"]["count"], 3)
+        self.assertLessEqual(summary["square"]["p50"], summary["square"]["p95"])
+        self.assertEqual(summary["block"]["total"], timer.elapsed)
+        self.assertEqual(summary["tweets"], {"count": 7})
+
+    def test_drained_worker_metrics_are_merged(self):
+        worker = logger_setup.Metrics()
+        logger_setup.count("tweets", 2, worker)
+        with logger_setup.timed("chunk", worker):
+            pass
+        logger_setup.count("tweets", 1, self.registry)
+        self.registry.merge(worker.drain())
+        self.assertEqual(worker.summary(), {})
+        summary = self.registry.summary()
+        self.assertEqual(summary["tweets"], {"count": 3})
+        self.assertEqual(summary["chunk"]["count"], 1)
+
+    def test_reporter_sets_logger_level_once(self):
+        logger = logging.getLogger("test_logger_setup.reporter")
+        logger.setLevel(logging.WARNING)
+        self.addCleanup(logger.setLevel, logging.NOTSET)
+        reporter = logger_setup.start_summaries(3600, logger=logger, registry=self.registry)
+        self.assertEqual(logger.level, logging.INFO)
+        logger.setLevel(logging.ERROR)
+        reporter.stop()
+        self.assertEqual(logger.level, logging.ERROR)
+
+    def test_reporter_writes_final_summary(self):
+        logger_setup.count("tweets", 3, self.registry)
+        with tempfile.TemporaryDirectory() as metrics_dir:
+            json_path = os.path.join(metrics_dir, "metrics.jsonl")
+            logger_setup.start_summaries(3600, json_path=json_path, registry=self.registry).stop()
+            with open(json_path) as metrics_file:
+                lines = [json.loads(line) for line in metrics_file]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["metrics"], {"tweets": {"count": 3}})
+
+
+if __name__ == "__main__":
+    unittest.main()
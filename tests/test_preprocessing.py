@@ -0,0 +1,156 @@
+import unittest
+from unittest import mock
+import pandas as pd
+import os
+import tempfile
+
+from twitter_data_analysis import logger_setup, preprocessing, process_pool
+from twitter_data_analysis.preprocessing import TweetsPreprocessing
+
+# Deterministic stand-ins for the NLTK tagger, lemmatizer and stopword corpus,
+# so the tests do not depend on downloaded NLTK data.
+STOPWORDS = ["the", "on", "in", "its", "for", "by", "to"]
+
+
+def fake_tag(tokens):
+    return [(token, "VERB" if token.endswith("ed") else "NOUN" if token.endswith("s") else "X")
+            for token in tokens]
+
+
+def fake_pos_tag(tokens, tagset=None, lang="eng"):
+    return fake_tag(tokens)
+
+
+def fake_pos_tag_sents(sentences, tagset=None, lang="eng"):
+    return [fake_tag(tokens) for tokens in sentences]
+
+
+class FakeLemmatizer:
+    def lemmatize(self, word, pos="n"):
+        return word[:-1] if pos == "n" and word.endswith("s") else word
+
+
+tweets = [
+    "RT @CGMeifangZhang: #Latest When the PLA conducted massive drills around #Taiwan on…",
+    "I guess #WWIII on its way for #Taiwan https://t.co/oomVltBmKF",
+    "Drills, drills and more drills!!! 2022 (again)",
+    "",
+]
+
+
+class TestTweetsPreprocessing(unittest.TestCase):
+    """
+    Unit tests for the TweetsPreprocessing batch paths
+    """
+
+    def setUp(self):
+        patchers = [
+            mock.patch.object(preprocessing, "pos_tag", fake_pos_tag),
+            mock.patch.object(preprocessing, "pos_tag_sents", fake_pos_tag_sents),
+            mock.patch.object(preprocessing, "english_stopwords", lambda: STOPWORDS),
+            # process pool workers build their own lemmatizer
+            mock.patch("nltk.stem.WordNetLemmatizer", FakeLemmatizer),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.preprocessing = TweetsPreprocessing()
+        self.preprocessing.wnl = FakeLemmatizer()
+        self.df = pd.DataFrame({"full_text": tweets})
+
+    def test_batch_matches_per_word_pipeline(self):
+        self.assertEqual(
+            self.preprocessing.preprocess_tweets_df(self.df, "full_text", batched=True),
+            self.preprocessing.preprocess_tweets_df(self.df, "full_text", batched=False),
+        )
+
+    def test_preprocess_vocabulary_matches_pipeline(self):
+        words = "the Drills drills conducted #Taiwan @user".split()
+        processed = self.preprocessing.preprocess_vocabulary(words)
+        self.assertEqual(
+            processed, {word: self.preprocessing.preprocessing_pipeline(word) for word in words})
+
+    def test_batch_handles_missing_tweets(self):
+        self.assertEqual(self.preprocessing.preprocess_tweets_batch([None, "drills"]), [[], ["drill"]])
+
+    def test_remove_punctuation_matches_hyphen_literally(self):
+        self.assertEqual(self.preprocessing.remove_punctuation("well-known (it's) 2022!"), "wellknown it's ")
+
+    def test_normalize_tweet(self):
+        self.assertEqual(
+            self.preprocessing.normalize_tweet(
+                "RT @CGMeifangZhang: #Latest When the PLA's 'massive' drills, in 2022… https://t.co/oomVltBmKF"),
+            ["rt", "#latest", "when", "the", "pla's", "massive", "drills", "in"])
+
+    def test_fused_batch_matches_process_tokens(self):
+        expected = [self.preprocessing.process_tokens(self.preprocessing.normalize_tweet(tweet)) for tweet in tweets]
+        self.assertEqual(self.preprocessing.preprocess_tweets_df(self.df, "full_text", fused=True), expected)
+        self.assertEqual(expected[2], ["drill", "drill", "and", "more", "drill", "again"])
+
+    def test_parallel_keeps_input_order_and_bounds_chunks_in_flight(self):
+        numbered = [f"{tweet} tweet{chr(ord('a') + number)}" for number in range(5) for tweet in tweets]
+        expected = self.preprocessing.preprocess_tweets_batch(numbered)
+        counts = {"submitted": 0, "collected": 0, "max_in_flight": 0}
+
+        class CountingExecutor(process_pool.ProcessPoolExecutor):
+            def submit(self, *args, **kwargs):
+                future = super().submit(*args, **kwargs)
+                counts["submitted"] += 1
+                counts["max_in_flight"] = max(counts["max_in_flight"], counts["submitted"] - counts["collected"])
+                result = future.result
+
+                def collect(timeout=None):
+                    counts["collected"] += 1
+                    return result(timeout)
+                future.result = collect
+                return future
+
+        with mock.patch.object(process_pool, "ProcessPoolExecutor", CountingExecutor):
+            processed = self.preprocessing.preprocess_tweets_parallel((tweet for tweet in numbered), chunk_size=3,
+                                                                     n_workers=2)
+        self.assertEqual(processed, expected)
+        # 20 tweets in chunks of 3
+        self.assertEqual(counts["submitted"], 7)
+        self.assertEqual(counts["max_in_flight"], 4)
+
+    def test_parallel_merges_worker_timers(self):
+        logger_setup.metrics.reset()
+        self.addCleanup(logger_setup.metrics.reset)
+        self.preprocessing.preprocess_tweets_parallel(tweets * 2, chunk_size=3, n_workers=2)
+        summary = logger_setup.metrics.summary()
+        self.assertEqual(summary["preprocessing.tweets"], {"count": 8})
+        self.assertEqual(summary["preprocessing.batch.pos_tag"]["count"], 3)
+
+    def test_parallel_lemmas_are_saved_by_the_parent(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_path = os.path.join(temp_dir, "lemmas.pkl")
+            parent = TweetsPreprocessing(cache_path=cache_path)
+            parent.preprocess_tweets_parallel(tweets, chunk_size=2, n_workers=2)
+            self.assertTrue(parent.save_cache())
+            restarted = TweetsPreprocessing(cache_path=cache_path)
+            self.assertEqual(restarted.cache.lemmas[("drills", "n")], "drill")
+            self.assertEqual(restarted.cache.lemmas[("conducted", "v")], "conducted")
+
+    def test_lemma_cache_counts_hits_and_misses(self):
+        self.preprocessing.preprocess_tweets_batch(["drills", "Drills drills!!!", "leaves drills"])
+        stats = self.preprocessing.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (2, 2, 2))
+
+    def test_lemma_cache_is_bounded_and_persisted(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_path = os.path.join(temp_dir, "lemmas.pkl")
+            warm = TweetsPreprocessing(cache_path=cache_path, max_cached_lemmas=2)
+            warm.wnl = FakeLemmatizer()
+            warm.lemmatize_tags([("drills", "NOUN"), ("leaves", "NOUN"), ("tweets", "NOUN")])
+            self.assertEqual(list(warm.cache.lemmas), [("leaves", "n"), ("tweets", "n")])
+            self.assertTrue(warm.save_cache())
+
+            restarted = TweetsPreprocessing(cache_path=cache_path)
+            # every lookup must be served from the cache
+            restarted.wnl = mock.Mock(lemmatize=mock.Mock(side_effect=AssertionError))
+            self.assertEqual(restarted.lemmatize_tags([("tweets", "NOUN")]), ["tweet"])
+            self.assertEqual(restarted.cache.stats()["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
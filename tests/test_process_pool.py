@@ -0,0 +1,35 @@
+import unittest
+
+from twitter_data_analysis.process_pool import iter_chunks, ordered_map
+
+
+class TestProcessPool(unittest.TestCase):
+    """
+    Unit tests for the ordered, bounded process pool map
+    """
+
+    def test_iter_chunks(self):
+        self.assertEqual(list(iter_chunks(range(7), 3)), [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertEqual(list(iter_chunks([], 3)), [])
+
+    def test_results_keep_input_order(self):
+        chunks = iter_chunks((number for number in range(50)), 4)
+        self.assertEqual(list(ordered_map(sum, chunks, n_workers=2)),
+                         [sum(chunk) for chunk in iter_chunks(range(50), 4)])
+
+    def test_closing_early_stops_reading_items(self):
+        read = []
+
+        def items():
+            for number in range(100):
+                read.append(number)
+                yield [number]
+
+        results = ordered_map(sum, items(), n_workers=2, max_in_flight=3)
+        self.assertEqual(next(results), 0)
+        results.close()
+        self.assertEqual(read, [0, 1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
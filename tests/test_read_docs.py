@@ -0,0 +1,110 @@
+import unittest
+from unittest import mock
+from datetime import datetime
+import mongomock
+import tempfile
+
+from twitter_data_analysis import connect_to_mongo
+from twitter_data_analysis.read_docs import ReadDocs
+from twitter_data_analysis.tweets_cache import TweetsCache
+
+sample_docs = [{"_id": i, "lang": "en" if i % 2 else "fr", "created_at": datetime(2022, 8, i + 1),
+                "full_text": f"tweet {i}", "user": {"screen_name": f"user_{i}", "followers_count": i}}
+               for i in range(9)]
+
+
+class TestReadDocs(unittest.TestCase):
+    """
+    Unit tests for reading tweets from MongoDB, against mongomock
+    """
+
+    def setUp(self):
+        patcher = mock.patch.object(connect_to_mongo, "MongoClient", mongomock.MongoClient)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # drop the shared mongomock client so every test starts with an empty server
+        self.addCleanup(connect_to_mongo.close_all_clients)
+        self.read = ReadDocs("mongodb://localhost")
+        self.read.client["tweets"]["global"].insert_many(sample_docs)
+
+    def test_filter_projection_and_limit(self):
+        query = self.read.build_tweets_query(start=datetime(2022, 8, 3), end=datetime(2022, 8, 9), lang=["en"])
+        df = self.read.read_tweets_in_collection("tweets", "global", query, ["user.screen_name"], limit=2)
+        self.assertEqual(list(df.columns), ["_id", "user.screen_name"])
+        self.assertEqual(df["user.screen_name"].tolist(), ["user_3", "user_5"])
+
+    def test_iterate_in_chunks(self):
+        chunks = list(self.read.iter_tweets_in_collection("tweets", "global", fields=["lang"], chunk_size=4))
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 4, 1])
+
+    def test_readers_share_client_and_cache_pings(self):
+        other = ReadDocs("mongodb://localhost")
+        self.assertIs(other.client, self.read.client)
+        with mock.patch.object(self.read.client.admin, "command", wraps=self.read.client.admin.command) as ping:
+            self.read.list_collections("tweets")
+            other.list_collections("tweets")
+            self.assertEqual(ping.call_count, 1)
+        self.assertEqual(other.list_collections("tweets"), ["global"])
+
+    def test_failed_ping_is_not_cached(self):
+        self.read.connection.logger = mock.Mock()
+        with mock.patch.object(self.read.client.admin, "command", side_effect=[Exception("down"), {"ok": 1}]):
+            self.assertFalse(self.read.connection.test_connection())
+            self.assertTrue(ReadDocs("mongodb://localhost").connection.test_connection())
+
+
+class TestTweetsCache(unittest.TestCase):
+    """
+    Unit tests for the incremental Parquet cache of a collection
+    """
+
+    def setUp(self):
+        patcher = mock.patch.object(connect_to_mongo, "MongoClient", mongomock.MongoClient)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(connect_to_mongo.close_all_clients)
+        self.read = ReadDocs("mongodb://localhost")
+        self.collection = self.read.client["tweets"]["global"]
+        self.collection.insert_many(sample_docs[:5])
+
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache = TweetsCache(self.read, temp_dir.name, fields=["created_at", "lang", "user.screen_name"])
+
+    def test_incremental_sync(self):
+        self.assertEqual(self.cache.sync("tweets", "global", chunk_size=2), 5)
+        self.collection.insert_many(sample_docs[5:])
+        with mock.patch.object(self.read, "find_tweets", wraps=self.read.find_tweets) as find_tweets:
+            self.assertEqual(self.cache.sync("tweets", "global"), 4)
+        self.assertEqual(find_tweets.call_args.args[2], {"_id": {"$gt": 4}})
+        self.assertEqual(self.cache.sync("tweets", "global"), 0)
+
+        df = self.cache.read("tweets", "global")
+        self.assertEqual(sorted(df["_id"]), list(range(9)))
+        self.assertEqual(len(self.cache.list_partitions("tweets", "global")), 9)
+
+    def test_interrupted_sync_does_not_duplicate_rows(self):
+        with mock.patch.object(self.cache, "save_state", side_effect=KeyboardInterrupt), \
+                self.assertRaises(KeyboardInterrupt):
+            self.cache.sync("tweets", "global", chunk_size=10)
+        # documents added before the next sync make the rewritten chunk longer
+        self.collection.insert_many(sample_docs[5:])
+        self.assertEqual(self.cache.sync("tweets", "global", chunk_size=10), 9)
+        self.assertEqual(sorted(self.cache.read("tweets", "global")["_id"]), list(range(9)))
+
+    def test_read_date_range_and_columns(self):
+        self.cache.sync("tweets", "global")
+        df = self.cache.read("tweets", "global", start="2022-08-02", end="2022-08-03", columns=["user.screen_name"])
+        self.assertEqual(df["user.screen_name"].tolist(), ["user_1", "user_2"])
+
+    def test_read_promotes_int_and_float_chunks(self):
+        cache = TweetsCache(self.read, self.cache.cache_dir, fields=["created_at", "user.followers_count"])
+        cache.sync("tweets", "global")
+        self.collection.insert_one({**sample_docs[5], "user": {"screen_name": "user_5", "followers_count": 2.5}})
+        cache.sync("tweets", "global")
+        df = cache.read("tweets", "global")
+        self.assertEqual(sorted(df["user.followers_count"]), [0, 1, 2, 2.5, 3, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
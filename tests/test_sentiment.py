@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+
+from gensim import corpora
+from twitter_data_analysis.sentiment import LexiconSentiment
+
+token_lists = [["great", "match", "great"], ["terrible", "traffic", "good", "awful"], ["match", "report"], []]
+
+
+class TestLexiconSentiment(unittest.TestCase):
+    """
+    Unit tests for the batched lexicon sentiment scores
+    """
+
+    def setUp(self):
+        self.sentiment = LexiconSentiment()
+
+    def test_scores_are_lexicon_averages(self):
+        polarity, subjectivity = self.sentiment.score_tokens(token_lists)
+        self.assertEqual(polarity.dtype, np.float32)
+        lexicon = self.sentiment.lexicon
+        expected = [np.mean([lexicon[token][0] for token in tokens if token in lexicon] or [0.0])
+                    for tokens in token_lists]
+        np.testing.assert_allclose(polarity, expected, rtol=1e-6)
+        self.assertAlmostEqual(float(subjectivity[0]), lexicon["great"][1], places=6)
+        self.assertEqual(self.sentiment.label(polarity).tolist(), ["positive", "negative", "neutral", "neutral"])
+
+    def test_vader_lexicon(self):
+        # valences from -4 to 4 are scaled to polarities from -1 to 1
+        self.assertGreater(len(self.sentiment.lexicon), 7000)
+        self.assertEqual(self.sentiment.lexicon["great"], (3.1 / 4, 3.1 / 4))
+        self.assertEqual(self.sentiment.lexicon["terrible"], (-2.1 / 4, 2.1 / 4))
+
+    def test_bow_scores_match_token_scores(self):
+        mapping_dict = corpora.Dictionary(token_lists)
+        bow = [mapping_dict.doc2bow(tokens) for tokens in token_lists]
+        from_bow = self.sentiment.score_bow(bow, mapping_dict)
+        from_tokens = self.sentiment.score_tokens(token_lists)
+        for bow_scores, token_scores in zip(from_bow, from_tokens):
+            np.testing.assert_allclose(bow_scores, token_scores, rtol=1e-6)
+
+    def test_parallel_columns_match_serial(self):
+        df = self.sentiment.add_sentiment_columns(pd.DataFrame(index=range(4)), token_lists)
+        polarity, subjectivity = self.sentiment.score_tokens_parallel(token_lists, chunk_size=3, n_workers=2)
+        np.testing.assert_array_equal(df["polarity"].to_numpy(), polarity)
+        np.testing.assert_array_equal(df["subjectivity"].to_numpy(), subjectivity)
+        self.assertEqual(df["subjectivity"].dtype, np.float32)
+        self.assertEqual(str(df["sentiment"].dtype), "category")
+
+
+if __name__ == "__main__":
+    unittest.main()
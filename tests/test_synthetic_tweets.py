@@ -0,0 +1,49 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks")))
+
+from twitter_data_analysis.extract_dataframe import TweetDfExtractor
+from run_benchmarks import compare_results
+from synthetic_tweets import generate_tweets, write_tweets
+
+
+class TestSyntheticTweets(unittest.TestCase):
+    """
+    Unit tests for the synthetic tweets of the benchmark suite
+    """
+
+    def test_same_seed_same_tweets(self):
+        first = list(generate_tweets(200, seed=3))
+        self.assertEqual(first, list(generate_tweets(200, seed=3)))
+        self.assertNotEqual(first, list(generate_tweets(200, seed=4)))
+        retweets = [tweet for tweet in first if "retweeted_status" in tweet]
+        self.assertTrue(retweets)
+        for tweet in first:
+            for hashtag in tweet["entities"]["hashtags"]:
+                start, end = hashtag["indices"]
+                self.assertEqual(tweet["full_text"][start:end], "#" + hashtag["text"])
+
+    def test_extractor_reads_written_tweets(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            file_path = os.path.join(work_dir, "tweets.json")
+            write_tweets(file_path, 100, seed=1)
+            df = TweetDfExtractor.from_json_file(file_path).get_tweet_df()
+            with open(file_path, encoding="utf-8") as tweets_file:
+                tweets = [json.loads(line) for line in tweets_file]
+        self.assertEqual(len(df), 100)
+        self.assertEqual(df["original_author"].tolist(), [tweet["user"]["screen_name"] for tweet in tweets])
+        self.assertFalse(df["created_at"].isna().any())
+
+    def test_compare_flags_slower_benchmarks(self):
+        previous = {"benchmarks": {"a": {"median": 1.0}, "b": {"median": 1.0}, "c": {"error": "LookupError"}}}
+        current = {"benchmarks": {"a": {"median": 1.5}, "b": {"median": 1.05}, "c": {"median": 1.0}}}
+        rows = compare_results(current, previous, threshold=0.1)
+        self.assertEqual([(name, regressed) for name, _, _, _, regressed in rows], [("a", True), ("b", False)])
+
+
+if __name__ == "__main__":
+    unittest.main()
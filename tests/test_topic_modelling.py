@@ -0,0 +1,194 @@
+import unittest
+import random
+import json
+import numpy as np
+from PIL import Image
+import tempfile
+import os
+from unittest import mock
+
+from twitter_data_analysis import process_pool
+from twitter_data_analysis.topic_modelling import TopicModelling
+from twitter_data_analysis.tweet_corpus import TweetCorpus
+
+random.seed(7)
+vocabulary = [f"word{i}" for i in range(60)]
+# the first 40 words are known to the trained model, new tweets also use the last 20
+old_tweets = [[random.choice(vocabulary[:40]) for _ in range(8)] for _ in range(120)]
+new_tweets = [[random.choice(vocabulary) for _ in range(8)] for _ in range(50)]
+
+
+class TestTopicModelling(unittest.TestCase):
+    """
+    Unit tests for TopicModelling on a small synthetic corpus
+    """
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.model_path = os.path.join(temp_dir.name, "lda_tweets")
+        self.mapping_path = os.path.join(temp_dir.name, "tweets_mapping")
+
+        self.topic_modelling = TopicModelling()
+        self.mapping_dict = self.topic_modelling.make_dictionary(old_tweets)
+        self.topic_modelling.save_dictionary(self.mapping_dict, self.mapping_path)
+        bow = self.topic_modelling.create_bow(old_tweets, self.mapping_dict)
+        lda_model = self.topic_modelling.create_lda_model(bow, self.mapping_dict, no_of_topics=4, no_of_passes=2)
+        self.topic_modelling.save_lda_model(lda_model, self.model_path)
+
+    def test_update_grows_vocabulary_and_checkpoints(self):
+        lda_model, records = self.topic_modelling.update_lda_model(
+            self.model_path, self.mapping_path, new_tweets, chunk_size=20)
+        self.assertEqual([record["documents"] for record in records], [20, 20, 10])
+        self.assertEqual(sum(record["new_words"] for record in records), 20)
+        self.assertEqual(lda_model.get_topics().shape, (4, 60))
+
+        saved = self.topic_modelling.load_lda_model(self.model_path)
+        self.assertEqual(saved.num_terms, len(self.topic_modelling.load_dictionary(self.mapping_path)))
+        with open(self.model_path + ".updates.jsonl") as updates_file:
+            self.assertEqual(len(updates_file.readlines()), 3)
+
+    def test_sweep_ranks_candidates_and_stops_early(self):
+        bow = self.topic_modelling.create_bow(old_tweets, self.mapping_dict)
+        submitted = []
+
+        class CountingExecutor(process_pool.ProcessPoolExecutor):
+            def submit(self, function, candidate):
+                submitted.append(candidate[0])
+                return super().submit(function, candidate)
+
+        with mock.patch.object(process_pool, "ProcessPoolExecutor", CountingExecutor):
+            results = self.topic_modelling.sweep_lda_models(
+                bow, old_tweets, self.mapping_dict, topic_counts=(2, 3, 4, 5), alpha_levels=(0.01, 'symmetric'),
+                pass_counts=(1,), no_of_iterations=10, n_workers=2, patience=1, min_improvement=1.0)
+        # nothing can improve c_v by 1.0, so only the first two topic counts are kept
+        self.assertEqual(sorted(results["num_topics"].unique()), [2, 3])
+        # at most n_workers candidates are in flight, the last topic count is never submitted
+        self.assertEqual(submitted, [2, 2, 3, 3, 4])
+        self.assertEqual(len(results), 4)
+        self.assertTrue(results["c_v"].is_monotonic_decreasing)
+        self.assertTrue({"perplexity", "u_mass", "seconds"} <= set(results.columns))
+
+    def test_sweep_rejects_an_empty_grid(self):
+        bow = self.topic_modelling.create_bow(old_tweets, self.mapping_dict)
+        with self.assertRaises(ValueError):
+            self.topic_modelling.sweep_lda_models(bow, old_tweets, self.mapping_dict, topic_counts=())
+        with self.assertRaises(ValueError):
+            self.topic_modelling.sweep_lda_models(bow, old_tweets, self.mapping_dict, alpha_levels=())
+
+    def test_model_analysis(self):
+        bow = self.topic_modelling.create_bow(old_tweets, self.mapping_dict)
+        lda_model = self.topic_modelling.load_lda_model(self.model_path)
+        scores = self.topic_modelling.model_analysis(lda_model, bow, old_tweets, self.mapping_dict)
+        self.assertEqual(set(scores), {"log_perplexity", "c_v"})
+
+    def test_batched_inference_matches_per_document_topics(self):
+        self.topic_modelling.preprocessing = SplitPreprocessing()
+        tweets = [" ".join(tweet) for tweet in new_tweets[:6]] + [""]
+        lda_model, mapping_dict = self.topic_modelling.get_inference_model(self.model_path, self.mapping_path)
+        # inference starts from random values, use the same ones for both calls
+        lda_model.random_state = np.random.RandomState(0)
+        doc_topics = self.topic_modelling.infer_topics(tweets, self.model_path, self.mapping_path)
+        self.assertEqual(doc_topics.shape, (7, 4))
+
+        lda_model.random_state = np.random.RandomState(0)
+        bow = mapping_dict.doc2bow(new_tweets[0])
+        expected = dict(lda_model.get_document_topics(bow, minimum_probability=0.0))
+        for topic, probability in expected.items():
+            self.assertAlmostEqual(doc_topics[0, topic], probability, places=5)
+
+        report = self.topic_modelling.inference_latency_report()
+        self.assertEqual(report["batch_size"].tolist(), [7])
+
+    def test_inference_model_reloads_when_file_changes(self):
+        first, _ = self.topic_modelling.get_inference_model(self.model_path, self.mapping_path)
+        self.assertIs(self.topic_modelling.get_inference_model(self.model_path, self.mapping_path)[0], first)
+        self.topic_modelling.save_lda_model(first, self.model_path)
+        mtime = os.path.getmtime(self.model_path) + 10
+        os.utime(self.model_path, (mtime, mtime))
+        self.assertIsNot(self.topic_modelling.get_inference_model(self.model_path, self.mapping_path)[0], first)
+
+    def test_similarity_index_is_sharded_and_persisted(self):
+        bow = self.topic_modelling.create_bow(old_tweets, self.mapping_dict)
+        tweet_ids = [1000 + position for position in range(len(bow))]
+        similarity_index = self.topic_modelling.create_similarity_index(bow, tweet_ids, self.mapping_path,
+                                                                        shard_size=50)
+        self.assertEqual(len(similarity_index.index.shards), 3)
+
+        loaded = self.topic_modelling.load_similarity_index(self.mapping_path)
+        matches = loaded.query(bow[:2] + [self.mapping_dict.doc2bow(old_tweets[70])], k=3)
+        self.assertEqual([tweet_matches[0][0] for tweet_matches in matches], [1000, 1001, 1070])
+        self.assertEqual(len(matches[0]), 3)
+
+        loaded.add_documents(bow[:1], [5000])
+        self.assertEqual({tweet_id for tweet_id, _ in loaded.query(bow[:1], k=2)[0]}, {1000, 5000})
+
+    def test_word_frequencies_sources_agree_and_merge(self):
+        bow = self.topic_modelling.create_bow(old_tweets, self.mapping_dict)
+        from_tweets = self.topic_modelling.word_frequencies(tweet_list=old_tweets)
+        self.assertEqual(self.topic_modelling.word_frequencies(bow=bow, mapping_dict=self.mapping_dict), from_tweets)
+        self.assertEqual(self.topic_modelling.word_frequencies(mapping_dict=self.mapping_dict), from_tweets)
+
+        merged = from_tweets + self.topic_modelling.word_frequencies(tweet_list=new_tweets)
+        self.assertEqual(sum(merged.values()), 8 * (len(old_tweets) + len(new_tweets)))
+        self.topic_modelling.save_word_frequencies(merged, self.model_path + "_frequencies")
+        self.assertEqual(self.topic_modelling.load_word_frequencies(self.model_path + "_frequencies"), merged)
+
+    def test_render_word_cloud_to_file(self):
+        frequencies = self.topic_modelling.word_frequencies(tweet_list=old_tweets)
+        output_path = self.model_path + "_cloud.png"
+        self.topic_modelling.render_word_cloud(frequencies, output_path, width=200, height=100, scale=2)
+        with Image.open(output_path) as image:
+            self.assertEqual(image.size, (400, 200))
+
+
+class SplitPreprocessing:
+    """
+    Stand-in for TweetsPreprocessing which splits on whitespace and counts its calls
+    """
+    def __init__(self):
+        self.batches = []
+
+    def preprocess_tweets_batch(self, tweets, fused=False):
+        self.batches.append(len(tweets))
+        return [tweet.split() for tweet in tweets]
+
+
+class TestTweetCorpus(unittest.TestCase):
+    """
+    Unit tests for the streamed bag-of-words corpus
+    """
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.dir_path = temp_dir.name
+        self.file_path = os.path.join(self.dir_path, "tweets.json")
+        with open(self.file_path, "w", encoding="utf-8") as json_file:
+            for tweet in old_tweets:
+                json_file.write(json.dumps({"full_text": " ".join(tweet)}) + "\n")
+
+    def test_matches_in_memory_bow(self):
+        preprocessing = SplitPreprocessing()
+        corpus = TweetCorpus(self.file_path, preprocessing=preprocessing, chunk_size=25)
+        mapping_dict = corpus.build_dictionary()
+        topic_modelling = TopicModelling()
+        self.assertEqual(list(corpus), topic_modelling.create_bow(old_tweets, mapping_dict))
+        self.assertEqual(max(preprocessing.batches), 25)
+
+        bow_name = os.path.join(self.dir_path, "tweets_bow")
+        self.assertTrue(corpus.serialize(bow_name))
+        self.assertEqual(len(topic_modelling.load_bow(bow_name)), len(old_tweets))
+
+    def test_spilled_tokens_are_preprocessed_once(self):
+        preprocessing = SplitPreprocessing()
+        corpus = TweetCorpus(lambda: ({"full_text": " ".join(tweet)} for tweet in old_tweets),
+                             preprocessing=preprocessing, chunk_size=50,
+                             tokens_path=os.path.join(self.dir_path, "tokens.jsonl"))
+        corpus.build_dictionary()
+        corpus.serialize(os.path.join(self.dir_path, "tweets_bow"))
+        self.assertEqual(sum(preprocessing.batches), len(old_tweets))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import tempfile
+import numpy as np
+from PIL import Image
+import os
+
+from twitter_data_analysis.transform_mask import MaskTransformation
+
+
+class TestMaskTransformation(unittest.TestCase):
+    """
+    Unit tests for the vectorized mask transformation
+    """
+
+    def setUp(self):
+        self.mask_transformation = MaskTransformation()
+
+    def test_matches_per_pixel_transformation(self):
+        # the per-pixel version expects colour channels, like the RGBA res/twitter.png
+        mask = np.array([[[0, 3, 255, 255], [0, 0, 0, 128]], [[7, 0, 1, 0], [255, 255, 255, 0]]], dtype=np.uint8)
+        expected = np.array(self.mask_transformation.transform_mask_per_pixel(mask.copy()).tolist())
+        transformed = self.mask_transformation.transform_mask(mask)
+        self.assertEqual(transformed.dtype, np.uint8)
+        np.testing.assert_array_equal(transformed, expected)
+
+    def test_threshold(self):
+        np.testing.assert_array_equal(self.mask_transformation.transform_mask(np.array([[0, 1, 2, 3]]), threshold=2),
+                                      [[255, 255, 255, 3]])
+
+    def test_load_mask_is_cached_until_modified(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            image_path = os.path.join(temp_dir, "mask.png")
+            Image.fromarray(np.zeros((4, 6), dtype=np.uint8)).save(image_path)
+            first = self.mask_transformation.load_mask(image_path)
+            self.assertIs(self.mask_transformation.load_mask(image_path), first)
+            self.assertTrue((first == 255).all())
+
+            Image.fromarray(np.full((4, 6), 9, dtype=np.uint8)).save(image_path)
+            mtime = os.path.getmtime(image_path) + 10
+            os.utime(image_path, (mtime, mtime))
+            self.assertTrue((self.mask_transformation.load_mask(image_path) == 9).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
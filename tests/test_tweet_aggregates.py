@@ -0,0 +1,64 @@
+import unittest
+from unittest import mock
+import json
+import tempfile
+import mongomock
+import os
+
+from twitter_data_analysis import connect_to_mongo
+from twitter_data_analysis.read_docs import ReadDocs
+from twitter_data_analysis.tweet_aggregates import TweetAggregates
+from twitter_data_analysis.upload_docs import UploadDocs
+
+sample_tweets = [
+    {"created_at": "Mon Aug 08 07:40:53 +0000 2022", "id": 1,
+     "entities": {"hashtags": [{"text": "Kenya"}, {"text": "news"}], "user_mentions": [{"screen_name": "ann"}]}},
+    {"created_at": "Mon Aug 08 07:40:10 +0000 2022", "id": 2,
+     "entities": {"hashtags": [{"text": "kenya"}], "user_mentions": []}},
+    {"created_at": "Mon Aug 08 09:05:00 +0000 2022", "id": 3,
+     "entities": {"hashtags": [], "user_mentions": [{"screen_name": "ann"}, {"screen_name": "bob"}]}},
+    {"created_at": "Tue Aug 09 12:00:00 +0000 2022", "id": 4, "entities": {}},
+]
+
+
+class TestTweetAggregates(unittest.TestCase):
+    """
+    Unit tests for the dashboard pre-aggregates, from a file and from mongomock
+    """
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.file_path = os.path.join(temp_dir.name, "tweets.json")
+        with open(self.file_path, "w", encoding="utf-8") as json_file:
+            json_file.write("\n".join(json.dumps(tweet) for tweet in sample_tweets) + "\n")
+
+    def test_file_counts(self):
+        aggregates = TweetAggregates.from_file(self.file_path, chunk_size=3)
+        self.assertEqual(aggregates.timeline("minute")["tweet_count"].sum(), 4)
+        hourly = aggregates.timeline("hour")
+        self.assertEqual(hourly["tweet_count"].tolist()[:3], [2, 0, 1])
+        self.assertEqual(str(hourly["created_at"].iloc[0]), "2022-08-08 07:00:00+00:00")
+        self.assertEqual(aggregates.timeline("day")["tweet_count"].tolist(), [3, 1])
+        self.assertEqual(aggregates.top_hashtags(1).values.tolist(), [["kenya", 2]])
+        self.assertEqual(aggregates.top_mentions().values.tolist(), [["ann", 2], ["bob", 1]])
+        with self.assertRaises(ValueError):
+            aggregates.timeline("week")
+
+    def test_collection_matches_file(self):
+        patcher = mock.patch.object(connect_to_mongo, "MongoClient", mongomock.MongoClient)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(connect_to_mongo.close_all_clients)
+        UploadDocs("mongodb://localhost").upload_tweets(self.file_path, "tweets", "global")
+
+        from_collection = TweetAggregates.from_collection(ReadDocs("mongodb://localhost"), "tweets", "global")
+        from_file = TweetAggregates.from_file(self.file_path)
+        for bucket in ("minute", "hour", "day"):
+            self.assertTrue(from_collection.timeline(bucket).equals(from_file.timeline(bucket)))
+        self.assertTrue(from_collection.top_hashtags().equals(from_file.top_hashtags()))
+        self.assertTrue(from_collection.top_mentions().equals(from_file.top_mentions()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import pandas as pd
+
+from twitter_data_analysis.tweet_filter_index import TweetFilterIndex
+
+sample_df = pd.DataFrame({
+    "entities.hashtags": [[{"text": "Kenya"}, {"text": "news"}], [{"text": "kenya"}, {"text": "Kenya"}], [], None,
+                          [{"text": "news"}]],
+    "place": [{"full_name": "Nairobi, Kenya"}, None, {"full_name": "Lagos, Nigeria"}, None,
+              {"full_name": "Nairobi, Kenya"}],
+    "lang": pd.Categorical(["en", "en", "fr", "en", "sw"]),
+    "user.screen_name": ["ann", "bob", "ann", "cid", "bob"],
+})
+
+
+class TestTweetFilterIndex(unittest.TestCase):
+    """
+    Unit tests for the inverted index behind the dashboard filters
+    """
+
+    def setUp(self):
+        self.index = TweetFilterIndex(sample_df)
+
+    def test_posting_lists(self):
+        self.assertEqual(self.index.posting_list("hashtags", "kenya").tolist(), [0, 1])
+        self.assertEqual(self.index.posting_list("place", "Nairobi, Kenya").tolist(), [0, 4])
+        self.assertEqual(self.index.posting_list("lang", "en").tolist(), [0, 1, 3])
+        self.assertEqual(self.index.posting_list("author", "missing").tolist(), [])
+        self.assertEqual(self.index.options("author"), ["ann", "bob", "cid"])
+        self.assertEqual(self.index.options("lang", limit=1), ["en"])
+
+    def test_filters_match_dataframe_scan(self):
+        self.assertEqual(self.index.select("hashtags", ["kenya", "news"]).tolist(), [0, 1, 4])
+        self.assertEqual(self.index.select("hashtags", ["kenya", "news"], match_all=True).tolist(), [0])
+        selections = {"place": ["Nairobi, Kenya", "Lagos, Nigeria"], "author": ["ann"], "lang": []}
+        expected = sample_df.index[sample_df["place"].map(lambda place: place is not None)
+                                   & (sample_df["user.screen_name"] == "ann")].tolist()
+        self.assertEqual(self.index.filter_rows(selections).tolist(), expected)
+        self.assertIsNone(self.index.filter_rows({"lang": []}))
+
+    def test_chunks_match_single_dataframe(self):
+        chunks = [sample_df.iloc[:2], sample_df.iloc[2:3], sample_df.iloc[3:]]
+        ids = pd.Series(["a", "b", "c", "d", "e"])
+        chunks = [chunk.assign(_id=ids[chunk.index].to_numpy()) for chunk in chunks]
+        chunked = TweetFilterIndex.from_chunks(iter(chunks), key_column="_id")
+        self.assertEqual(chunked.num_rows, 5)
+        for field in ["hashtags", "place", "lang", "author"]:
+            self.assertEqual(chunked.options(field), self.index.options(field))
+            for value in self.index.options(field):
+                self.assertEqual(chunked.posting_list(field, value).tolist(),
+                                 self.index.posting_list(field, value).tolist())
+        rows = chunked.filter_rows({"hashtags": ["news"]})
+        self.assertEqual(chunked.keys[rows].tolist(), ["a", "e"])
+        self.assertIsNone(self.index.keys)
+
+
+if __name__ == "__main__":
+    unittest.main()
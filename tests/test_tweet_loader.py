@@ -0,0 +1,58 @@
+import unittest
+import json
+import tempfile
+import pandas as pd
+import os
+
+from twitter_data_analysis.tweet_loader import iter_json_lines, read_tweets, read_tweets_in_chunks, parse_created_at
+
+sample_tweets = [
+    {"created_at": "Mon Aug 08 07:40:53 +0000 2022", "id": 1, "lang": "en", "source": "web",
+     "retweet_count": 3, "user": {"screen_name": "first", "followers_count": 10}},
+    {"created_at": "Mon Aug 08 07:41:10 +0000 2022", "id": 2, "lang": "fr", "source": "android",
+     "retweet_count": 0, "user": {"screen_name": "second", "followers_count": 20}},
+    {"created_at": "Tue Aug 09 12:00:00 +0000 2022", "id": 3, "lang": "en", "source": "web",
+     "retweet_count": 7, "user": None},
+]
+
+
+class TestTweetLoader(unittest.TestCase):
+    """
+    Unit tests for the streaming JSON lines loader
+    """
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.file_path = os.path.join(temp_dir.name, "tweets.json")
+        with open(self.file_path, "w", encoding="utf-8") as json_file:
+            json_file.write("\n".join(json.dumps(tweet) for tweet in sample_tweets) + "\n\n")
+
+    def test_chunks_are_bounded(self):
+        sizes = [len(df) for df in read_tweets_in_chunks(self.file_path, ["id"], chunk_size=2)]
+        self.assertEqual(sizes, [2, 1])
+
+    def test_projects_nested_fields_with_compact_dtypes(self):
+        df = read_tweets(self.file_path, ["created_at", "lang", "retweet_count", "user.screen_name"], chunk_size=2)
+        self.assertEqual(list(df.columns), ["created_at", "lang", "retweet_count", "user.screen_name"])
+        self.assertEqual(df["user.screen_name"].tolist(), ["first", "second", None])
+        self.assertIsInstance(df["lang"].dtype, pd.CategoricalDtype)
+        self.assertEqual(df["retweet_count"].dtype, "int8")
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df["created_at"]))
+
+    def test_malformed_lines_go_to_on_error(self):
+        with open(self.file_path, "a", encoding="utf-8") as json_file:
+            json_file.write('{"id": 4, "full_text": "cut off\n' + json.dumps({"id": 5}) + "\n")
+        with self.assertRaises(ValueError):
+            list(iter_json_lines(self.file_path))
+        errors = []
+        chunks = list(iter_json_lines(self.file_path, on_error=lambda number, line, error: errors.append(number)))
+        self.assertEqual([document["id"] for document in chunks[0]], [1, 2, 3, 5])
+        self.assertEqual(errors, [5])
+
+    def test_parse_created_at(self):
+        self.assertEqual(parse_created_at("Mon Aug 08 07:40:53 +0000 2022").isoformat(), "2022-08-08T07:40:53+00:00")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from unittest import mock
+import mongomock
+import pandas as pd
+
+from twitter_data_analysis import connect_to_mongo
+from twitter_data_analysis.read_docs import ReadDocs
+from twitter_data_analysis.tweet_pages import CollectionPages, DataFramePages, page_count, summarize_nested_columns, summarize_value
+
+# retweet counts repeat so that pages break inside runs of equal values, the last tweet has none
+sample_docs = [{"_id": i, "full_text": f"tweet {i}", "retweet_count": i % 4, "user": {"screen_name": f"user_{i}"}}
+               for i in range(10)] + [{"_id": 10, "full_text": "tweet 10", "user": {"screen_name": "user_10"}}]
+
+
+class TestTweetPages(unittest.TestCase):
+    """
+    Unit tests for the paginated Data tab
+    """
+
+    def test_summaries(self):
+        self.assertEqual(summarize_value({"screen_name": "ann", "followers_count": 3}), "@ann")
+        self.assertEqual(summarize_value({"hashtags": [{"text": "a"}, {"text": "b"}], "user_mentions": []}),
+                         "hashtags: a, b; user_mentions: -")
+        self.assertEqual(summarize_value(list(range(7))), "0, 1, 2, 3, 4 (+2)")
+        df = summarize_nested_columns(pd.DataFrame({"user": [{"screen_name": "ann"}, None], "id": [1, 2]}))
+        self.assertEqual(df["user"].iloc[0], "@ann")
+        self.assertTrue(pd.isna(df["user"].iloc[1]))
+        self.assertEqual(page_count(0, 50), 1)
+        self.assertEqual(page_count(101, 50), 3)
+
+    def test_dataframe_pages(self):
+        pages = DataFramePages(pd.DataFrame(sample_docs))
+        self.assertEqual(pages.sortable_columns(), ["_id", "full_text", "retweet_count"])
+        with mock.patch.object(pd.Series, "map") as series_map:
+            self.assertEqual(pages.sortable_columns(), ["_id", "full_text", "retweet_count"])
+        series_map.assert_not_called()
+        page = pages.page(1, page_size=4, sort_column="retweet_count", descending=True, columns=["_id"])
+        self.assertEqual(page["_id"].tolist(), [1, 5, 9, 0])
+        self.assertEqual(pages.page(2, page_size=4)["_id"].tolist(), [8, 9, 10])
+
+    def test_range_cursor_pages_match_skip_pages(self):
+        patcher = mock.patch.object(connect_to_mongo, "MongoClient", mongomock.MongoClient)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(connect_to_mongo.close_all_clients)
+        reader = ReadDocs("mongodb://localhost")
+        reader.client["tweets"]["global"].insert_many(sample_docs)
+        self.assertEqual(reader.count_tweets("tweets", "global"), 11)
+        self.assertEqual(reader.count_tweets("tweets", "global", {"retweet_count": 0}), 3)
+
+        for descending in (False, True):
+            pages = CollectionPages(reader, "tweets", "global")
+            # pages read in order continue from the previous page, the others are found with skip
+            sequential = [pages.page(number, 3, "retweet_count", descending, ["full_text"]) for number in range(4)]
+            # the last descending page ends with the tweet without retweet_count, which is no range boundary
+            self.assertEqual(len(pages.boundaries[("retweet_count", descending, 3)]), 3 if descending else 4)
+            for number, page in enumerate(sequential):
+                skipped = reader.read_page("tweets", "global", fields=["full_text", "retweet_count"],
+                                           sort_field="retweet_count", descending=descending, page=number,
+                                           page_size=3)
+                self.assertEqual(page["_id"].tolist(), skipped["_id"].tolist())
+            self.assertEqual(sorted(pd.concat(sequential)["_id"]), list(range(11)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+from unittest import mock
+import json
+import tempfile
+import threading
+import mongomock
+from pymongo.errors import AutoReconnect
+import os
+
+from twitter_data_analysis import connect_to_mongo
+from twitter_data_analysis.upload_docs import UploadDocs
+from twitter_data_analysis.ingest_docs import IngestDocs
+
+
+def make_tweet(tweet_id):
+    return {"created_at": "Mon Aug 08 07:40:53 +0000 2022", "id": tweet_id, "id_str": str(tweet_id),
+            "full_text": f"tweet number {tweet_id}", "lang": "en"}
+
+
+class TestUploadDocs(unittest.TestCase):
+    """
+    Unit tests for the batched tweet upload, against mongomock
+    """
+
+    def setUp(self):
+        patcher = mock.patch.object(connect_to_mongo, "MongoClient", mongomock.MongoClient)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # drop the shared mongomock client so every test starts with an empty server
+        self.addCleanup(connect_to_mongo.close_all_clients)
+        self.upload = UploadDocs("mongodb://localhost")
+        self.collection = self.upload.client["tweets"]["global"]
+
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.file_path = os.path.join(temp_dir.name, "tweets.json")
+        with open(self.file_path, "w", encoding="utf-8") as json_file:
+            for tweet_id in range(25):
+                json_file.write(json.dumps(make_tweet(tweet_id)) + "\n")
+
+    def test_upload_tweets(self):
+        self.assertEqual(self.upload.upload_tweets(self.file_path, "tweets", "global", batch_size=10), 25)
+        document = self.collection.find_one({"_id": 3})
+        self.assertNotIn("id_str", document)
+        self.assertEqual(document["created_at"].year, 2022)
+
+    def test_duplicates_are_counted_from_bulk_result(self):
+        self.collection.insert_many([{"_id": 0}, {"_id": 7}])
+        stats = self.upload.upload_documents(self.collection, (make_tweet(i) for i in range(12)), batch_size=5)
+        self.assertEqual((stats["inserted"], stats["duplicates"], stats["failed"]), (10, 2, 0))
+        self.assertGreater(stats["docs_per_sec"], 0)
+
+    def test_transient_errors_are_retried(self):
+        collection = mock.Mock()
+        collection.insert_many.side_effect = [AutoReconnect("primary stepped down"),
+                                              mock.Mock(inserted_ids=[1, 2])]
+        counts = self.upload.insert_batch(collection, [{"_id": 1}, {"_id": 2}], max_retries=2, retry_backoff=0)
+        self.assertEqual(counts, {"inserted": 2, "duplicates": 0, "ambiguous": 0, "failed": 0})
+        self.assertEqual(collection.insert_many.call_count, 2)
+
+    def test_duplicates_after_a_retry_are_ambiguous(self):
+        # written before this run, the retry cannot tell it from the documents of the failed attempt
+        self.collection.insert_one({"_id": 5})
+        insert_many = self.collection.insert_many
+
+        def write_half_then_disconnect(documents, **kwargs):
+            # the first attempt writes half of the batch before the connection drops
+            if patched.call_count == 1:
+                insert_many(documents[:3], **kwargs)
+                raise AutoReconnect("connection reset")
+            return insert_many(documents, **kwargs)
+
+        documents = [{"_id": document_id} for document_id in range(6)]
+        with mock.patch.object(self.collection, "insert_many", side_effect=write_half_then_disconnect) as patched:
+            counts = self.upload.insert_batch(self.collection, documents, max_retries=1, retry_backoff=0)
+        self.assertEqual(counts, {"inserted": 2, "duplicates": 0, "ambiguous": 4, "failed": 0})
+        self.assertEqual(self.collection.count_documents({}), 6)
+
+
+class TestIngestDocs(unittest.TestCase):
+    """
+    Unit tests for concurrent multi-file ingestion, against mongomock
+    """
+
+    def setUp(self):
+        patcher = mock.patch.object(connect_to_mongo, "MongoClient", mongomock.MongoClient)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # drop the shared mongomock client so every test starts with an empty server
+        self.addCleanup(connect_to_mongo.close_all_clients)
+        self.ingest = IngestDocs("mongodb://localhost")
+
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.dir_path = temp_dir.name
+        # three hourly files, the last one repeats two tweets of the first one
+        for hour, tweet_ids in enumerate([range(0, 30), range(30, 55), [1, 2, 55]]):
+            with open(os.path.join(self.dir_path, f"hour_{hour}.json"), "w", encoding="utf-8") as json_file:
+                for tweet_id in tweet_ids:
+                    json_file.write(json.dumps(make_tweet(tweet_id)) + "\n")
+
+    def test_ingest_directory(self):
+        stats = self.ingest.ingest_files(self.dir_path, "tweets", "global", batch_size=7, n_writers=3,
+                                         max_queued_batches=2)
+        self.assertEqual((stats["inserted"], stats["duplicates"], stats["failed"]), (56, 2, 0))
+        self.assertEqual(len(stats["files"]), 3)
+        self.assertEqual(self.ingest.client["tweets"]["global"].count_documents({}), 56)
+
+    def test_malformed_lines_are_skipped(self):
+        with open(os.path.join(self.dir_path, "hour_1.json"), "a", encoding="utf-8") as json_file:
+            json_file.write('{"id": 60, "full_text": "cut off\n[1, 2]\n' + json.dumps(make_tweet(61)) + "\n")
+        # a file which cannot be opened
+        os.mkdir(os.path.join(self.dir_path, "hour_3.json"))
+        stats = self.ingest.ingest_files(self.dir_path, "tweets", "global", batch_size=7, n_writers=2)
+        self.assertEqual((stats["inserted"], stats["duplicates"], stats["failed"]), (57, 2, 2))
+        self.assertEqual(stats["files"][os.path.join(self.dir_path, "hour_1.json")]["failed"], 2)
+        self.assertEqual(stats["failed_files"], [os.path.join(self.dir_path, "hour_3.json")])
+
+    def test_parser_errors_stop_the_writers(self):
+        threads = threading.active_count()
+        with mock.patch.object(IngestDocs, "tweet_to_document", side_effect=RuntimeError("bug")), \
+                self.assertRaises(RuntimeError):
+            self.ingest.ingest_files(self.dir_path, "tweets", "global", n_writers=2)
+        self.assertEqual(threading.active_count(), threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,6 @@
+"""
+Twitter data analysis: tweet ingestion into MongoDB, preprocessing, topic modelling, sentiment
+and a Streamlit dashboard. See twitter_data_analysis.cli for the command line entry point.
+
+Importing the package loads nothing else, import the modules you need.
+"""
@@ -0,0 +1,5 @@
+import sys
+
+from twitter_data_analysis.cli import main
+
+sys.exit(main())
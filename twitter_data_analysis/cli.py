@@ -0,0 +1,188 @@
+"""
+Command line entry point, installed as twitter-analysis.
+
+Only argparse is imported here. Each subcommand imports the modules it needs when it runs, so
+cron jobs pay for gensim, NLTK or wordcloud only when they use them.
+
+Usage:
+    twitter-analysis ingest ./data/hourly --uri "$MONGODB_URI" --database tweets --collection global
+    twitter-analysis preprocess ./data/global_twitter_data.json tokens.jsonl --fused --workers 8
+    twitter-analysis train tokens.jsonl --model lda_tweets --dictionary tweets_mapping --topics 50
+    twitter-analysis infer "#Taiwan drills continue" --model lda_tweets --dictionary tweets_mapping --fused
+    twitter-analysis wordcloud tokens.jsonl word_cloud.png --mask res/twitter.png
+    twitter-analysis dashboard --file ./data/global_twitter_data.json
+"""
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+
+def read_token_lists(tokens_path):
+    """
+    Read a file written by the preprocess subcommand
+
+    :param tokens_path: JSON lines file with one list of words per tweet
+
+    :return: list of lists of words
+    """
+    with open(tokens_path, encoding="utf-8") as tokens_file:
+        return [json.loads(line) for line in tokens_file if line.strip()]
+
+
+def ingest(args):
+    from twitter_data_analysis.ingest_docs import IngestDocs
+    stats = IngestDocs(args.uri).ingest_files(args.path, args.database, args.collection, args.batch_size,
+                                              n_writers=args.writers)
+    print(json.dumps({key: stats[key] for key in ("inserted", "duplicates", "ambiguous", "failed", "failed_files",
+                                                  "seconds", "docs_per_sec")}))
+    return 0 if stats["failed"] == 0 and not stats["failed_files"] else 1
+
+
+def preprocess(args):
+    from twitter_data_analysis.preprocessing import TweetsPreprocessing
+    from twitter_data_analysis.tweet_loader import read_tweets
+    tweets_df = read_tweets(args.tweets_path, [args.text_field])
+    preprocessing = TweetsPreprocessing(args.cache)
+    token_lists = preprocessing.preprocess_tweets_df(tweets_df, args.text_field, n_workers=args.workers,
+                                                     chunk_size=args.chunk_size, fused=args.fused)
+    with open(args.tokens_path, "w", encoding="utf-8") as tokens_file:
+        for tokens in token_lists:
+            tokens_file.write(json.dumps(tokens) + "\n")
+    if args.cache:
+        preprocessing.save_cache()
+    return 0
+
+
+def train(args):
+    from twitter_data_analysis.topic_modelling import TopicModelling
+    topic_modelling = TopicModelling()
+    token_lists = read_token_lists(args.tokens_path)
+    mapping_dict = topic_modelling.make_dictionary(token_lists)
+    bow = topic_modelling.create_bow(token_lists, mapping_dict)
+    lda_model = topic_modelling.create_lda_model(bow, mapping_dict, args.topics, args.passes, args.iterations,
+                                                 args.alpha)
+    topic_modelling.save_dictionary(mapping_dict, args.dictionary)
+    topic_modelling.save_lda_model(lda_model, args.model)
+    return 0
+
+
+def infer(args):
+    from twitter_data_analysis.topic_modelling import TopicModelling
+    tweets = args.texts or [line.rstrip("\n") for line in sys.stdin]
+    doc_topics = TopicModelling().infer_topics(tweets, args.model, args.dictionary, fused=args.fused)
+    for text, topics in zip(tweets, doc_topics):
+        best = topics.argsort()[::-1][:args.top]
+        print(json.dumps({"text": text, "topics": [[int(topic), round(float(topics[topic]), 4)] for topic in best]}))
+    return 0
+
+
+def wordcloud(args):
+    from twitter_data_analysis.topic_modelling import TopicModelling
+    topic_modelling = TopicModelling()
+    frequencies = topic_modelling.word_frequencies(tweet_list=read_token_lists(args.tokens_path))
+    mask = topic_modelling.mask_transformation.load_mask(args.mask) if args.mask else None
+    topic_modelling.render_word_cloud(frequencies, args.image_path, max_words=args.max_words, mask=mask)
+    return 0
+
+
+def dashboard(args):
+    # the dashboard runs in its own Streamlit process, its path is found without importing Streamlit
+    dashboard_path = importlib.util.find_spec("twitter_data_analysis.dashboard").origin
+    dashboard_args = ["--file", args.file] if args.file else ["--uri", args.uri, "--database", args.database,
+                                                              "--collection", args.collection]
+    command = [sys.executable, "-m", "streamlit", "run", dashboard_path, "--server.port", str(args.port), "--",
+               *dashboard_args]
+    return subprocess.call(command)
+
+
+def build_parser():
+    """
+    :return: argparse parser of every subcommand
+    """
+    parser = argparse.ArgumentParser(prog="twitter-analysis", description="Twitter data analysis pipeline")
+    parser.add_argument("--metrics", help="append timer summaries to this JSON lines file, see logger_setup")
+    parser.add_argument("--metrics-interval", type=float, default=60, help="seconds between timer summaries")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    def add_mongo_arguments(subparser, required=True):
+        subparser.add_argument("--uri", default=os.environ.get("MONGODB_URI"),
+                               help="connection string, defaults to $MONGODB_URI")
+        subparser.add_argument("--database", required=required)
+        subparser.add_argument("--collection", required=required)
+
+    ingest_parser = subcommands.add_parser("ingest", help="upload JSON lines tweet files to MongoDB")
+    ingest_parser.add_argument("path", help="file, directory or glob pattern of tweet files")
+    add_mongo_arguments(ingest_parser)
+    ingest_parser.add_argument("--batch-size", type=int, default=1000)
+    ingest_parser.add_argument("--writers", type=int, default=4)
+    ingest_parser.set_defaults(handler=ingest)
+
+    preprocess_parser = subcommands.add_parser("preprocess", help="preprocess tweets into token lists")
+    preprocess_parser.add_argument("tweets_path", help="JSON lines tweet file")
+    preprocess_parser.add_argument("tokens_path", help="output, JSON lines with one list of words per tweet")
+    preprocess_parser.add_argument("--text-field", default="full_text")
+    preprocess_parser.add_argument("--fused", action="store_true", help="use the fused normalizer")
+    preprocess_parser.add_argument("--workers", type=int, default=1, help="processes, 0 uses every CPU")
+    preprocess_parser.add_argument("--chunk-size", type=int, default=2000)
+    preprocess_parser.add_argument("--cache", help="file persisting the lemma cache between runs")
+    preprocess_parser.set_defaults(handler=preprocess)
+
+    train_parser = subcommands.add_parser("train", help="train an LDA model on preprocessed tweets")
+    train_parser.add_argument("tokens_path", help="output of the preprocess subcommand")
+    train_parser.add_argument("--model", required=True, help="file name of the saved LDA model")
+    train_parser.add_argument("--dictionary", required=True, help="file name of the saved dictionary, without .dict")
+    train_parser.add_argument("--topics", type=int, default=50)
+    train_parser.add_argument("--passes", type=int, default=10)
+    train_parser.add_argument("--iterations", type=int, default=50)
+    train_parser.add_argument("--alpha", type=float, default=0.001)
+    train_parser.set_defaults(handler=train)
+
+    infer_parser = subcommands.add_parser("infer", help="topics of raw tweets, one JSON line per tweet")
+    infer_parser.add_argument("texts", nargs="*", help="tweet texts, read one per line from stdin when omitted")
+    infer_parser.add_argument("--model", required=True)
+    infer_parser.add_argument("--dictionary", required=True)
+    infer_parser.add_argument("--top", type=int, default=3, help="number of topics printed per tweet")
+    infer_parser.add_argument("--fused", action="store_true",
+                              help="use the fused normalizer, as the training tweets were preprocessed with")
+    infer_parser.set_defaults(handler=infer)
+
+    wordcloud_parser = subcommands.add_parser("wordcloud", help="draw a word cloud of preprocessed tweets")
+    wordcloud_parser.add_argument("tokens_path", help="output of the preprocess subcommand")
+    wordcloud_parser.add_argument("image_path", help="image file to write e.g. word_cloud.png")
+    wordcloud_parser.add_argument("--mask", help="PNG mask e.g. res/twitter.png")
+    wordcloud_parser.add_argument("--max-words", type=int, default=200)
+    wordcloud_parser.set_defaults(handler=wordcloud)
+
+    dashboard_parser = subcommands.add_parser("dashboard", help="start the Streamlit dashboard")
+    dashboard_parser.add_argument("--file", help="JSON lines tweet file, otherwise a MongoDB collection is shown")
+    add_mongo_arguments(dashboard_parser, required=False)
+    dashboard_parser.add_argument("--port", type=int, default=8501)
+    dashboard_parser.set_defaults(handler=dashboard)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "workers", None) == 0:
+        args.workers = None
+    if args.command == "dashboard" and not args.file and not (args.uri and args.database and args.collection):
+        parser.error("dashboard needs --file, or --uri, --database and --collection")
+    if args.command == "ingest" and not args.uri:
+        parser.error("ingest needs --uri or $MONGODB_URI")
+    if args.metrics is None:
+        return args.handler(args)
+
+    from twitter_data_analysis import logger_setup
+    reporter = logger_setup.start_summaries(args.metrics_interval, json_path=args.metrics)
+    try:
+        return args.handler(args)
+    finally:
+        reporter.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+from pymongo.mongo_client import MongoClient
+from pymongo.server_api import ServerApi
+
+import atexit
+import threading
+import time
+
+from twitter_data_analysis import logger_setup
+
+# process wide MongoClient registry, keyed by connection string
+_clients = {}
+# uri -> time of the last successful ping
+_health_checks = {}
+_registry_lock = threading.Lock()
+
+
+def get_shared_client(uri, max_pool_size=100, min_pool_size=0, server_selection_timeout_ms=30000,
+                      connect_timeout_ms=20000, socket_timeout_ms=None):
+    """
+    Fetch the MongoClient for a connection string, creating it on first use.
+    Every ConnectToMongo with the same uri shares the client and its connection pool.
+    The pool and timeout settings only apply when the client is created.
+
+    :param uri: the connection string
+    :param max_pool_size: maximum number of connections per server
+    :param min_pool_size: number of connections kept open per server
+    :param server_selection_timeout_ms: how long an operation waits for a suitable server
+    :param connect_timeout_ms: timeout for opening a connection
+    :param socket_timeout_ms: timeout for a send or receive on a connection, None waits forever
+
+    :return: mongo client object
+    """
+    with _registry_lock:
+        client = _clients.get(uri)
+        if client is None:
+            client = MongoClient(uri, server_api=ServerApi('1'), maxPoolSize=max_pool_size,
+                                 minPoolSize=min_pool_size, serverSelectionTimeoutMS=server_selection_timeout_ms,
+                                 connectTimeoutMS=connect_timeout_ms, socketTimeoutMS=socket_timeout_ms)
+            _clients[uri] = client
+        return client
+
+
+def close_all_clients():
+    """
+    Close every shared client and forget the cached health checks.
+    Registered to run when the interpreter exits.
+    """
+    with _registry_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+        _health_checks.clear()
+
+
+atexit.register(close_all_clients)
+
+
+class ConnectToMongo:
+    """
+    Connects to MongoDB server using Mongo client
+    Test connection, list collections and list databases
+    
+    Visit https://www.mongodb.com/docs/atlas/tutorial/connect-to-your-cluster/
+    for more details on how to connect to a cluster.
+    """
+    def __init__(self, uri, ping_ttl=30, **client_options):
+        # Fetch the shared client which connects to the Mongo DB server
+        # Atlas Connection string is specified in .env file in project root
+        # client_options are passed to get_shared_client e.g. max_pool_size
+        self.uri = uri
+        self.client = get_shared_client(uri, **client_options)
+        # seconds for which a successful ping is reused
+        self.ping_ttl = ping_ttl
+        # set up logger to output to terminal
+        self.logger = logger_setup.logger_console_config(__name__)
+    
+    def get_mongo_client(self):
+        """
+        Fetch mongoDB client object        
+        
+        :return: mongo client object
+        
+        >>> get_mongo_client()
+        client
+        """
+        return self.client
+    
+
+    def test_connection(self, use_cache=True):
+        """
+        Send a ping to confirm a successful connection to Mongo cluster                
+        A successful ping is shared by all instances with the same uri and reused for ping_ttl seconds.
+        A failed ping is not cached, so the next call pings again and a transient outage is not
+        reported after the cluster is back.
+
+        :param use_cache: reuse a recent ping result instead of sending a new ping
+        
+        :return: True if connection is successful and False otherwise
+        
+        >>> test_connection()
+        True
+        """
+        if use_cache:
+            last_success = _health_checks.get(self.uri)
+            if last_success is not None and time.monotonic() - last_success < self.ping_ttl:
+                return True
+
+        try:
+            with logger_setup.timed("mongo.ping"):
+                self.client.admin.command('ping')
+        except Exception as exception:
+            self.logger.exception(exception)
+            _health_checks.pop(self.uri, None)
+            return False
+        _health_checks[self.uri] = time.monotonic()
+        return True
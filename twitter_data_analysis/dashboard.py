@@ -0,0 +1,339 @@
+import argparse
+import os
+
+import numpy as np
+import streamlit as st
+import pandas as pd
+
+from twitter_data_analysis.tweet_loader import read_tweets
+from twitter_data_analysis.read_docs import ReadDocs
+from twitter_data_analysis.tweet_aggregates import TweetAggregates, BUCKET_FREQUENCIES
+from twitter_data_analysis.tweet_filter_index import TweetFilterIndex, FILTER_FIELDS
+from twitter_data_analysis.tweet_pages import CollectionPages, DataFramePages, page_count, summarize_nested_columns
+from twitter_data_analysis.preprocessing import NORMALIZE_PATTERN
+from twitter_data_analysis.sentiment import LexiconSentiment
+
+# tweet fields shown in the dashboard, nested fields use dotted paths
+DASHBOARD_FIELDS = ["id", "created_at", "full_text", "lang", "source", "retweet_count", "favorite_count",
+                    "user.screen_name", "user.location", "user.followers_count",
+                    "entities.hashtags", "entities.user_mentions", "place"]
+# seconds before cached data is loaded again
+CACHE_TTL = 600
+# tweets per chunk when a whole collection is streamed
+COLLECTION_CHUNK_SIZE = 50000
+# values offered by a filter widget, most frequent first
+FILTER_OPTIONS = 500
+# choices of rows per page in the Data tab
+PAGE_SIZES = [25, 50, 100, 250, 1000]
+
+
+@st.cache_resource
+def get_reader(uri):
+    """
+    One ReadDocs per uri for all sessions and reruns of the app
+    """
+    return ReadDocs(uri)
+
+
+@st.cache_resource(ttl=CACHE_TTL)
+def load_file_tweets(data_file_path, modified_time):
+    """
+    Load the tweet file once and share the dataframe between reruns, it is not copied.
+    modified_time is part of the cache key so an updated file is loaded again.
+    """
+    return read_tweets(data_file_path, DASHBOARD_FIELDS)
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def load_file_aggregates(data_file_path, modified_time):
+    """
+    Tweet counts of a file, see TweetAggregates.from_file
+    """
+    return TweetAggregates.from_file(data_file_path)
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def load_collection_aggregates(uri, database_name, collection_name):
+    """
+    Tweet counts of a collection computed on the server, see TweetAggregates.from_collection
+    """
+    return TweetAggregates.from_collection(get_reader(uri), database_name, collection_name)
+
+
+@st.cache_resource(ttl=CACHE_TTL)
+def load_file_filter_index(data_file_path, modified_time):
+    """
+    Filter index of the cached tweet file, built once and shared by every session
+    """
+    return TweetFilterIndex(load_file_tweets(data_file_path, modified_time))
+
+
+@st.cache_resource(ttl=CACHE_TTL)
+def load_collection_filter_index(uri, database_name, collection_name):
+    """
+    Filter index of the whole collection, built once and shared by every session. Only the indexed
+    fields are streamed, in _id order, and the _id of every row is kept to fetch the filtered tweets.
+    """
+    chunks = get_reader(uri).iter_tweets_in_collection(database_name, collection_name,
+                                                       fields=list(FILTER_FIELDS.values()),
+                                                       chunk_size=COLLECTION_CHUNK_SIZE, sort=[("_id", 1)])
+    return TweetFilterIndex.from_chunks(chunks, key_column="_id")
+
+
+@st.cache_resource(ttl=CACHE_TTL)
+def load_file_pages(data_file_path, modified_time):
+    """
+    Pages of the cached tweet file. Sort orders are computed once and shared by every session
+    """
+    return DataFramePages(load_file_tweets(data_file_path, modified_time))
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def count_collection_tweets(uri, database_name, collection_name):
+    """
+    Number of tweets in a collection, for the page count of the Data tab
+    """
+    return get_reader(uri).count_tweets(database_name, collection_name)
+
+
+@st.cache_resource
+def get_sentiment():
+    """
+    One LexiconSentiment for all sessions, the lexicon is loaded once
+    """
+    return LexiconSentiment()
+
+
+def score_sentiment(tweets_df):
+    """
+    Lexicon sentiment of the full_text column
+
+    :return: dataframe with float32 polarity and subjectivity and a categorical sentiment column
+    """
+    token_lists = [NORMALIZE_PATTERN.sub("", text.lower()).split() if isinstance(text, str) else []
+                   for text in tweets_df["full_text"]]
+    return get_sentiment().add_sentiment_columns(pd.DataFrame(index=tweets_df.index), token_lists)
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def load_file_sentiment(data_file_path, modified_time):
+    """
+    Sentiment scores of the cached tweet file
+    """
+    return score_sentiment(load_file_tweets(data_file_path, modified_time))
+
+
+class DashboardSetup:
+    """
+    A class for configuring and customizing a dashboard application built using Streamlit.
+
+    Tweets are read from a JSON lines file, or from a MongoDB collection when a uri is given.
+    Charts are drawn from cached TweetAggregates, so widget interactions never go back to the raw tweets.
+    """
+    def __init__(self, data_file_path=None, uri=None, database_name=None, collection_name=None):
+        # web page default configuration
+        st.set_page_config(page_title="Twitter Data Analysis", page_icon=":bird",
+        initial_sidebar_state="auto", layout="wide",
+        menu_items={
+        'About': "# This is a header. This is an *extremely* cool app!",
+        'Get Help': 'https://github.com/KaydeeJR/Twitter_Data_Analysis_Project/tree/main'
+        })
+        # section title
+        st.title("Twitter Data Visualizations", help="Visualizations")
+        # data to display in the dashboard
+        self.collection = (uri, database_name, collection_name) if uri is not None else None
+        if uri is not None:
+            # a collection is never loaded whole, tweets are fetched per page and per filter, see fetch_rows
+            self.tweets_df = None
+            self.filter_index = load_collection_filter_index(uri, database_name, collection_name)
+            aggregates = load_collection_aggregates(uri, database_name, collection_name)
+            # a collection is too large to score on every load, the Sentiment tab scores the page shown
+            self.sentiment_df = None
+            # page boundaries are per session, only one page of tweets is fetched per rerun
+            if "collection_pages" not in st.session_state:
+                st.session_state.collection_pages = CollectionPages(get_reader(uri), database_name, collection_name)
+            pages = st.session_state.collection_pages
+            total_rows = count_collection_tweets(uri, database_name, collection_name)
+            columns = DASHBOARD_FIELDS
+        else:
+            modified_time = os.path.getmtime(data_file_path)
+            self.tweets_df = load_file_tweets(data_file_path, modified_time)
+            self.filter_index = load_file_filter_index(data_file_path, modified_time)
+            aggregates = load_file_aggregates(data_file_path, modified_time)
+            self.sentiment_df = load_file_sentiment(data_file_path, modified_time)
+            pages = load_file_pages(data_file_path, modified_time)
+            total_rows = pages.count()
+            columns = list(self.tweets_df.columns)
+        # sidebar setup
+        self.set_up_tabs(pages, total_rows, columns, aggregates)
+    
+
+    def show_data_page(self, pages, total_rows, columns):
+        """
+        Display one page of tweets. Only the selected columns of the visible rows are fetched and
+        nested objects are shown as short summaries.
+
+        :param pages: DataFramePages or CollectionPages
+        :param total_rows: number of tweets
+        :param columns: columns which can be displayed
+
+        :return: dataframe of the page
+        """
+        selected_columns = st.multiselect("Columns", columns, default=columns)
+        col1, col2, col3, col4 = st.columns(4)
+        page_size = col1.selectbox("Rows per page", PAGE_SIZES, index=1)
+        sort_column = col2.selectbox("Sort by", pages.sortable_columns())
+        descending = col3.checkbox("Descending")
+        number_of_pages = page_count(total_rows, page_size)
+        page = col4.number_input(f"Page (of {number_of_pages})", min_value=1, max_value=number_of_pages, value=1)
+        page_df = pages.page(int(page) - 1, page_size, sort_column, descending, selected_columns or None)
+        st.dataframe(summarize_nested_columns(page_df), use_container_width=True)
+        st.caption(f"{total_rows} tweets")
+        return page_df
+
+    def show_sentiment(self, sentiment_df):
+        """
+        Display the share of positive, neutral and negative tweets and the polarity distribution
+
+        :param sentiment_df: dataframe with polarity, subjectivity and sentiment columns
+        """
+        col1, col2 = st.columns(2)
+        col1.metric("Mean polarity", f"{sentiment_df['polarity'].mean():.3f}")
+        col2.metric("Mean subjectivity", f"{sentiment_df['subjectivity'].mean():.3f}")
+        label_counts = sentiment_df["sentiment"].value_counts(sort=False).rename_axis("sentiment").reset_index()
+        st.bar_chart(data=label_counts, x="sentiment", y="count", use_container_width=True)
+        counts, edges = np.histogram(sentiment_df["polarity"], bins=20, range=(-1, 1))
+        st.bar_chart(data=pd.DataFrame({"polarity": np.round(edges[:-1], 2), "tweets": counts}), x="polarity",
+                     y="tweets", use_container_width=True)
+
+    def set_up_tabs(self, pages, total_rows, columns, aggregates):
+        tab1, tab2, tab3, tab4, tab5 = st.tabs(["Data","Created At", "Mentions", "Topic Modelling","Sentiment Analysis"])
+        
+        with tab1:
+            # Show data
+            st.header("Data")
+            page_df = self.show_data_page(pages, total_rows, columns)
+        
+        with tab2:
+            # Show line chart
+            st.header("Created At")
+            bucket = st.radio("Tweets per", list(BUCKET_FREQUENCIES), index=1, horizontal=True)
+            st.bar_chart(data=aggregates.timeline(bucket), x="created_at", y="tweet_count",
+                         use_container_width=True)
+
+        with tab3:
+            # Show bar chart
+            st.header("Mentions")
+            top_n = st.slider("Number of rankings", 1, 50, 10)
+            st.subheader("Most mentioned users")
+            st.bar_chart(data=aggregates.top_mentions(top_n), x="screen_name", y="count", use_container_width=True)
+            st.subheader("Most used hashtags")
+            st.bar_chart(data=aggregates.top_hashtags(top_n), x="hashtag", y="count", use_container_width=True)
+
+        with tab4:
+            # Show topic visualization
+            st.header("Topic Modelling")
+            
+        with tab5:
+            # Created At - show line chart
+            st.header("Sentiment Analysis")
+            if self.sentiment_df is not None:
+                self.show_sentiment(self.sentiment_df)
+            elif "full_text" in page_df.columns:
+                st.caption(f"Sentiment of the {len(page_df)} tweets on the current page of the Data tab")
+                self.show_sentiment(score_sentiment(page_df))
+            else:
+                st.info("Select the full_text column in the Data tab to score the tweets of the page")
+        
+
+    def show_filtered(self, rows):
+        """
+        Display the first rows selected by the filter index. Nothing is shown until a value is selected.
+        """
+        if rows is None:
+            return
+        st.write(f"{len(rows)} tweets")
+        st.dataframe(summarize_nested_columns(self.fetch_rows(rows[:PAGE_SIZES[-1]])), use_container_width=True)
+
+    def fetch_rows(self, rows):
+        """
+        Tweets of rows of the filter index. A collection index keeps the _id of every row, so the
+        tweets are fetched by _id.
+
+        :param rows: sorted array of row ids
+
+        :return: dataframe of the tweets in row order
+        """
+        if self.collection is None:
+            return self.tweets_df.iloc[rows]
+        uri, database_name, collection_name = self.collection
+        ids = self.filter_index.keys[rows].tolist()
+        tweets_df = get_reader(uri).read_tweets_in_collection(database_name, collection_name,
+                                                              query={"_id": {"$in": ids}}, fields=DASHBOARD_FIELDS)
+        position = {tweet_id: row for row, tweet_id in enumerate(ids)}
+        return tweets_df.sort_values("_id", key=lambda column: column.map(position)).reset_index(drop=True)
+
+    def selectHashTag(self):
+        hashTags = st.multiselect("choose combaniation of hashtags",
+                                  self.filter_index.options("hashtags", FILTER_OPTIONS))
+        match_all = st.checkbox("tweets must contain every selected hashtag")
+        self.show_filtered(self.filter_index.filter_rows({"hashtags": hashTags}, match_all))
+    
+    def selectLocAndAuth(self):
+        location = st.multiselect("choose Location of tweets", self.filter_index.options("place", FILTER_OPTIONS))
+        lang = st.multiselect("choose Language of tweets", self.filter_index.options("lang", FILTER_OPTIONS))
+        author = st.multiselect("choose Author of tweets", self.filter_index.options("author", FILTER_OPTIONS))
+        # values of one filter are alternatives, different filters must all match
+        self.show_filtered(self.filter_index.filter_rows({"place": location, "lang": lang, "author": author}))
+    
+    def barChart(self,data, title, X, Y):
+        title = title.title()
+        st.title(f'{title} Chart')
+        msgChart = (alt.Chart(data).mark_bar().encode(alt.X(f"{X}:N", sort=alt.EncodingSortField(field=f"{Y}", op="values",
+                    order='ascending')), y=f"{Y}:Q"))
+        st.altair_chart(msgChart, use_container_width=True)
+    
+    def stBarChart(self):
+        pass
+        # df = loadData()
+        # dfCount = pd.DataFrame({'Tweet_count': df.groupby(['original_author'])['clean_text'].count()}).reset_index()
+        # dfCount["original_author"] = dfCount["original_author"].astype(str)
+        # dfCount = dfCount.sort_values("Tweet_count", ascending=False)
+
+        # num = st.slider("Select number of Rankings", 0, 50, 5)
+        # title = f"Top {num} Ranking By Number of tweets"
+        # barChart(dfCount.head(num), title, "original_author", "Tweet_count")
+
+
+    def langPie(self):
+        pass
+        # df = loadData()
+        # dfLangCount = pd.DataFrame({'Tweet_count': df.groupby(['language'])['clean_text'].count()}).reset_index()
+        # dfLangCount["language"] = dfLangCount["language"].astype(str)
+        # dfLangCount = dfLangCount.sort_values("Tweet_count", ascending=False)
+        # dfLangCount.loc[dfLangCount['Tweet_count'] < 10, 'lang'] = 'Other languages'
+        # st.title(" Tweets Language pie chart")
+        # fig = px.pie(dfLangCount, values='Tweet_count', names='language', width=500, height=350)
+        # fig.update_traces(textposition='inside', textinfo='percent+label')
+
+        # colB1, colB2 = st.beta_columns([2.5, 1])
+
+        # with colB1:
+        #     st.plotly_chart(fig)
+        # with colB2:
+        #     st.write(dfLangCount)
+
+if __name__ == "__main__":
+    # streamlit run passes the arguments after '--', see the dashboard subcommand of cli.py
+    parser = argparse.ArgumentParser(description="Twitter data dashboard")
+    parser.add_argument("--file", default="./data/global_twitter_data.json", help="JSON lines tweet file")
+    parser.add_argument("--uri", help="MongoDB connection string, shows a collection instead of the file")
+    parser.add_argument("--database")
+    parser.add_argument("--collection")
+    args = parser.parse_args()
+    if args.uri:
+        dashboard = DashboardSetup(uri=args.uri, database_name=args.database, collection_name=args.collection)
+    else:
+        dashboard = DashboardSetup(args.file)
+    dashboard.selectHashTag()
+    dashboard.selectLocAndAuth()
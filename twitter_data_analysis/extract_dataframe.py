@@ -0,0 +1,278 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from twitter_data_analysis.preprocessing import NORMALIZE_PATTERN
+from twitter_data_analysis.sentiment import LexiconSentiment
+from twitter_data_analysis.tweet_loader import TWITTER_DATE_FORMAT
+
+# columns of the tweets dataframe, in order
+COLUMNS = ["created_at", "source", "original_text", "clean_text", "sentiment", "polarity", "subjectivity", "lang",
+           "favorite_count", "retweet_count", "original_author", "screen_count", "followers_count", "friends_count",
+           "possibly_sensitive", "hashtags", "user_mentions", "place", "place_coord_boundaries"]
+
+
+def read_json(json_file: str) -> tuple:
+    """
+    Load a JSON lines file of tweets
+
+    :param json_file: path to the JSON lines file
+
+    :return: number of tweets and the list of decoded tweets
+
+    >>> read_json("./data/global_twitter_data.json")
+    (21999, [{'created_at': 'Mon Aug 08 07:40:53 +0000 2022', ...}, ...])
+    """
+    tweets_data = []
+    with open(json_file, encoding="utf-8") as tweets_file:
+        for line in tweets_file:
+            if line.strip():
+                tweets_data.append(json.loads(line))
+    return len(tweets_data), tweets_data
+
+
+def count_lines(json_file: str, block_size: int = 1 << 20) -> int:
+    """
+    Count the lines of a file without decoding it, to size the column arrays
+
+    :return: upper bound of the number of tweets in the file
+    """
+    lines = 0
+    last_block = b""
+    with open(json_file, "rb") as tweets_file:
+        for block in iter(lambda: tweets_file.read(block_size), b""):
+            lines += block.count(b"\n")
+            last_block = block
+    # a last line without a newline
+    return lines + (1 if last_block and not last_block.endswith(b"\n") else 0)
+
+
+class TweetDfExtractor:
+    """
+    Extract the flat tweet columns from raw Twitter API v1.1 tweets in a single pass.
+
+    Every tweet is visited once and its fields are written into preallocated per-column arrays, instead
+    of one pass over all tweets per column. Retweets are expanded to the full text of the retweeted
+    status. Hashtags and mentions are also collected into long tables with one row per
+    (tweet, hashtag) or (tweet, mention), which group much faster than lists stored in cells.
+
+    >>> extractor = TweetDfExtractor.from_json_file("./data/global_twitter_data.json")
+    >>> tweets_df = extractor.get_tweet_df()
+    >>> extractor.get_hashtags_df().groupby("hashtag").size()
+    """
+
+    def __init__(self, tweets_list):
+        # decoded tweets, or None when the extractor reads a file
+        self.tweets_list = tweets_list
+        self.json_file = None
+        # column name -> array, filled on first use
+        self.columns = None
+        self.hashtag_rows = None
+        self.mention_rows = None
+        # LexiconSentiment, created on first use
+        self.sentiment = None
+
+    @classmethod
+    def from_json_file(cls, json_file):
+        """
+        Extract the columns of a JSON lines file, decoding every line once without keeping the tweets
+
+        :param json_file: path to the JSON lines file
+
+        :return: TweetDfExtractor
+        """
+        extractor = cls(None)
+        extractor.json_file = json_file
+        return extractor
+
+    def iter_tweets(self):
+        """
+        :return: generator of decoded tweets
+        """
+        if self.json_file is None:
+            yield from self.tweets_list
+            return
+        with open(self.json_file, encoding="utf-8") as tweets_file:
+            for line in tweets_file:
+                if line.strip():
+                    yield json.loads(line)
+
+    def extract(self):
+        """
+        Fill every column in one pass over the tweets. Runs once, later calls reuse the arrays.
+
+        :return: dictionary of column name -> numpy array
+        """
+        if self.columns is not None:
+            return self.columns
+        capacity = len(self.tweets_list) if self.json_file is None else count_lines(self.json_file)
+        # plain lists sized up front, item assignment into them is cheaper than into numpy arrays
+        created_at, source, original_text, clean_text, lang, original_author, hashtag_lists, mention_lists, \
+            place_names, place_boundaries = ([None] * capacity for _ in range(10))
+        favorite_count, retweet_count, statuses_count, followers_count, friends_count = \
+            ([0] * capacity for _ in range(5))
+        # -1 missing, 0 False, 1 True
+        sensitive = [-1] * capacity
+        hashtag_rows, mention_rows = [], []
+        normalize = NORMALIZE_PATTERN.sub
+
+        row = -1
+        for row, tweet in enumerate(self.iter_tweets()):
+            user = tweet.get("user") or {}
+            # a retweet holds the truncated text, the full one is in the retweeted status
+            status = tweet.get("retweeted_status") or tweet
+            text = status.get("full_text") or status.get("text") or ""
+            created_at[row] = tweet.get("created_at")
+            source[row] = tweet.get("source")
+            original_text[row] = text
+            clean_text[row] = " ".join(normalize("", text.lower()).split())
+            lang[row] = tweet.get("lang")
+            favorite_count[row] = tweet.get("favorite_count") or 0
+            retweet_count[row] = tweet.get("retweet_count") or 0
+            original_author[row] = user.get("screen_name")
+            statuses_count[row] = user.get("statuses_count") or 0
+            followers_count[row] = user.get("followers_count") or 0
+            friends_count[row] = user.get("friends_count") or 0
+            if tweet.get("possibly_sensitive") is not None:
+                sensitive[row] = int(tweet["possibly_sensitive"])
+
+            # hashtags of the full text, mentions of the tweet itself including the retweeted author
+            hashtags = [hashtag["text"] for hashtag in (status.get("entities") or {}).get("hashtags") or ()]
+            mentions = [mention["screen_name"] for mention in (tweet.get("entities") or {}).get("user_mentions") or ()]
+            hashtag_lists[row] = hashtags
+            mention_lists[row] = mentions
+            hashtag_rows.extend((row, hashtag) for hashtag in hashtags)
+            mention_rows.extend((row, mention) for mention in mentions)
+
+            place = tweet.get("place")
+            if place:
+                place_names[row] = place.get("full_name")
+                place_boundaries[row] = (place.get("bounding_box") or {}).get("coordinates")
+
+        # blank lines were counted but not filled
+        size = row + 1
+
+        def object_array(values):
+            # fromiter keeps nested lists as elements instead of broadcasting them into extra dimensions
+            return np.fromiter(values[:size], dtype=object, count=size)
+
+        self.columns = {"created_at": object_array(created_at), "source": object_array(source),
+                        "original_text": object_array(original_text), "clean_text": object_array(clean_text),
+                        "lang": object_array(lang),
+                        "original_author": object_array(original_author), "hashtags": object_array(hashtag_lists),
+                        "user_mentions": object_array(mention_lists), "place": object_array(place_names),
+                        "place_coord_boundaries": object_array(place_boundaries),
+                        "favorite_count": np.array(favorite_count[:size], dtype=np.int64),
+                        "retweet_count": np.array(retweet_count[:size], dtype=np.int64),
+                        "screen_count": np.array(statuses_count[:size], dtype=np.int64),
+                        "followers_count": np.array(followers_count[:size], dtype=np.int64),
+                        "friends_count": np.array(friends_count[:size], dtype=np.int64),
+                        "possibly_sensitive": np.array(sensitive[:size], dtype=np.int8)}
+        self.hashtag_rows = hashtag_rows
+        self.mention_rows = mention_rows
+        return self.columns
+
+    def find_statuses_count(self) -> list:
+        return self.extract()["screen_count"].tolist()
+
+    def find_full_text(self) -> list:
+        return self.extract()["original_text"].tolist()
+
+    def find_clean_text(self) -> list:
+        return self.extract()["clean_text"].tolist()
+
+    def find_sentiments(self, text) -> tuple:
+        """
+        Lexicon polarity and subjectivity of tweet texts, see sentiment.LexiconSentiment
+
+        :param text: list of tweet texts
+
+        :return: list of polarity and list of subjectivity scores
+        """
+        if self.sentiment is None:
+            self.sentiment = LexiconSentiment()
+        polarity, subjectivity = self.sentiment.score_tokens(
+            [NORMALIZE_PATTERN.sub("", tweet.lower()).split() for tweet in text])
+        return polarity.tolist(), subjectivity.tolist()
+
+    def find_created_time(self) -> list:
+        return self.extract()["created_at"].tolist()
+
+    def find_source(self) -> list:
+        return self.extract()["source"].tolist()
+
+    def find_screen_name(self) -> list:
+        return self.extract()["original_author"].tolist()
+
+    def find_followers_count(self) -> list:
+        return self.extract()["followers_count"].tolist()
+
+    def find_friends_count(self) -> list:
+        return self.extract()["friends_count"].tolist()
+
+    def is_sensitive(self) -> list:
+        """
+        :return: list of True, False or None when the tweet has no possibly_sensitive field
+        """
+        return [None if value < 0 else bool(value) for value in self.extract()["possibly_sensitive"]]
+
+    def find_favourite_count(self) -> list:
+        return self.extract()["favorite_count"].tolist()
+
+    def find_retweet_count(self) -> list:
+        return self.extract()["retweet_count"].tolist()
+
+    def find_hashtags(self) -> list:
+        return self.extract()["hashtags"].tolist()
+
+    def find_mentions(self) -> list:
+        return self.extract()["user_mentions"].tolist()
+
+    def find_location(self) -> list:
+        return self.extract()["place"].tolist()
+
+    def find_place_coord_boundaries(self) -> list:
+        return self.extract()["place_coord_boundaries"].tolist()
+
+    def find_lang(self) -> list:
+        return self.extract()["lang"].tolist()
+
+    def get_hashtags_df(self) -> pd.DataFrame:
+        """
+        :return: long table with one row per hashtag of a tweet: tweet (row of get_tweet_df) and hashtag
+        """
+        self.extract()
+        return pd.DataFrame(self.hashtag_rows, columns=["tweet", "hashtag"])
+
+    def get_mentions_df(self) -> pd.DataFrame:
+        """
+        :return: long table with one row per mention in a tweet: tweet (row of get_tweet_df) and screen_name
+        """
+        self.extract()
+        return pd.DataFrame(self.mention_rows, columns=["tweet", "screen_name"])
+
+    def get_tweet_df(self, save=False, csv_path="processed_tweet_data.csv") -> pd.DataFrame:
+        """
+        Build the tweets dataframe from the extracted columns
+
+        :param save: also write the dataframe to csv_path
+        :param csv_path: path of the CSV file
+
+        :return: dataframe with the columns in COLUMNS
+        """
+        columns = self.extract()
+        df = pd.DataFrame({column: columns[column] for column in COLUMNS if column in columns})
+        df["created_at"] = pd.to_datetime(df["created_at"], format=TWITTER_DATE_FORMAT, errors="coerce")
+        for column in ("source", "lang"):
+            df[column] = df[column].astype("category")
+        sensitive = columns["possibly_sensitive"]
+        df["possibly_sensitive"] = pd.arrays.BooleanArray(sensitive == 1, sensitive < 0)
+        if self.sentiment is None:
+            self.sentiment = LexiconSentiment()
+        # clean_text is already normalized, so it only needs splitting into words
+        self.sentiment.add_sentiment_columns(df, [text.split() for text in columns["clean_text"]])
+        df = df[COLUMNS]
+        if save:
+            df.to_csv(csv_path, index=False)
+        return df
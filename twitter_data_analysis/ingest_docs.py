@@ -0,0 +1,227 @@
+import glob
+import logging
+import os
+import queue
+import threading
+import time
+
+from twitter_data_analysis.tweet_loader import iter_json_lines
+from twitter_data_analysis.upload_docs import COUNT_KEYS, UploadDocs
+
+
+class IngestionProgress:
+    """
+    Thread safe per-file counters for IngestDocs.
+    A file is reported once it has been fully parsed and all of its batches have been written.
+    """
+    def __init__(self, file_paths, logger):
+        self.logger = logger
+        self.lock = threading.Lock()
+        self.files = {file_path: {**dict.fromkeys(COUNT_KEYS, 0),
+                                  "batches_parsed": None, "batches_written": 0, "error": None}
+                      for file_path in file_paths}
+
+    def finish_parsing(self, file_path, batches, failed=0, error=None):
+        """
+        Record that all batches of a file have been queued
+
+        :param file_path: the parsed file
+        :param batches: number of batches queued for the file
+        :param failed: number of lines which could not be decoded
+        :param error: message of the error which stopped parsing, None if the whole file was read
+        """
+        with self.lock:
+            file_stats = self.files[file_path]
+            file_stats["batches_parsed"] = batches
+            file_stats["failed"] += failed
+            file_stats["error"] = error
+            self.report_if_done(file_path)
+
+    def add_batch(self, file_path, counts):
+        """
+        Add the result of one written batch
+
+        :param file_path: the file the batch was parsed from
+        :param counts: dictionary of inserted, duplicate, ambiguous and failed counts
+        """
+        with self.lock:
+            file_stats = self.files[file_path]
+            for key, count in counts.items():
+                file_stats[key] += count
+            file_stats["batches_written"] += 1
+            self.report_if_done(file_path)
+
+    def report_if_done(self, file_path):
+        """
+        Log the counts of a file once it is complete. Called with the lock held.
+        """
+        file_stats = self.files[file_path]
+        if file_stats["batches_parsed"] == file_stats["batches_written"]:
+            if file_stats["error"] is not None:
+                self.logger.error("%s failed after %d batches: %s", os.path.basename(file_path),
+                                  file_stats["batches_written"], file_stats["error"])
+            self.logger.info("%s: %d inserted, %d duplicates, %d ambiguous, %d failed",
+                             os.path.basename(file_path), file_stats["inserted"], file_stats["duplicates"],
+                             file_stats["ambiguous"], file_stats["failed"])
+
+    def totals(self):
+        """
+        Sum the counts over all files
+
+        :return: dictionary of inserted, duplicate, ambiguous and failed counts and the list of failed files
+        """
+        with self.lock:
+            totals = {key: sum(file_stats[key] for file_stats in self.files.values()) for key in COUNT_KEYS}
+            totals["failed_files"] = [file_path for file_path, file_stats in self.files.items()
+                                      if file_stats["error"] is not None]
+            return totals
+
+
+class IngestDocs(UploadDocs):
+    """
+    Uploads many JSON lines tweet files with concurrent writers.
+
+    The files are decoded one after the other into batches of documents which are put on a bounded queue.
+    Writer threads take batches off the queue and insert them through the single shared MongoClient, they
+    spend most of their time waiting on the network so they overlap with decoding. Decoding blocks while
+    the queue is full, so memory stays bounded by the queue size no matter how many or how large the
+    files are.
+    """
+
+    def find_tweet_files(self, path):
+        """
+        Resolve a directory or a glob pattern into a sorted list of files
+
+        :param path: a directory (all *.json and *.jsonl files in it) or a glob pattern
+
+        :return: list of file paths
+
+        >>> find_tweet_files("./data/hourly")
+        ['./data/hourly/2022-08-08T07.json', './data/hourly/2022-08-08T08.json']
+        """
+        if os.path.isdir(path):
+            file_paths = glob.glob(os.path.join(path, "*.json")) + glob.glob(os.path.join(path, "*.jsonl"))
+        else:
+            file_paths = glob.glob(path)
+        return sorted(file_paths)
+
+    def parse_file(self, file_path, batch_queue, batch_size, progress):
+        """
+        Decode a file into batches of documents and queue them for the writers.
+        A malformed line is skipped and counted as failed, the rest of the file is still ingested.
+        A file which cannot be read is marked as failed in progress.
+
+        :param file_path: JSON lines file of tweets
+        :param batch_queue: bounded queue shared with the writers
+        :param batch_size: number of documents per batch
+        :param progress: IngestionProgress for the run
+        """
+        batches = 0
+        failed = 0
+        error = None
+
+        def skip_line(line_number, line, exception):
+            nonlocal failed
+            failed += 1
+            self.logger.warning("Skipped line %d of %s: %s", line_number, file_path, exception)
+
+        try:
+            for documents in iter_json_lines(file_path, batch_size, on_error=skip_line):
+                batch = []
+                for document in documents:
+                    try:
+                        batch.append(self.tweet_to_document(document))
+                    except (KeyError, TypeError, AttributeError, ValueError) as exception:
+                        # valid JSON which is not a tweet e.g. a list or an object without an id
+                        failed += 1
+                        self.logger.warning("Skipped a document of %s: %r", file_path, exception)
+                if batch:
+                    # blocks while the writers are behind
+                    batch_queue.put((file_path, batch))
+                    batches += 1
+        except (OSError, ValueError) as exception:
+            # unreadable file or invalid encoding, the batches queued before the error are still written
+            error = str(exception)
+            self.logger.error("Could not parse %s: %s", file_path, exception)
+        progress.finish_parsing(file_path, batches, failed, error)
+
+    def write_batches(self, collection, batch_queue, progress, max_retries, retry_backoff):
+        """
+        Writer loop. Inserts queued batches until it receives None.
+
+        :param collection: the pymongo collection
+        :param batch_queue: bounded queue filled by parse_file
+        :param progress: IngestionProgress for the run
+        :param max_retries: number of retries after a transient error
+        :param retry_backoff: seconds to wait before the first retry
+        """
+        while True:
+            item = batch_queue.get()
+            if item is None:
+                break
+            file_path, documents = item
+            try:
+                counts = self.insert_batch(collection, documents, max_retries, retry_backoff)
+            except Exception as exception:
+                # keep draining the queue so parse_file never blocks forever
+                self.logger.exception(exception)
+                counts = {**dict.fromkeys(COUNT_KEYS, 0), "failed": len(documents)}
+            progress.add_batch(file_path, counts)
+
+    def ingest_files(self, path:str, db_name:str, collection_name:str, batch_size:int=1000,
+                     n_writers:int=4, max_queued_batches:int=16, max_retries:int=5, retry_backoff:float=0.5):
+        """
+        Upload every tweet file in a directory or matching a glob pattern.
+
+        :param path: a directory of JSON lines files or a glob pattern e.g. "./data/hourly/*.json"
+        :param db_name: The name of the database
+        :param collection_name: The name of the collection
+        :param batch_size: number of documents per insert_many call
+        :param n_writers: number of concurrent writer threads
+        :param max_queued_batches: batches waiting for a writer before parsing blocks
+        :param max_retries: number of retries of a batch after a transient error
+        :param retry_backoff: seconds to wait before the first retry, doubled on every retry
+
+        :return: dictionary with inserted, duplicate, ambiguous and failed totals, failed files, per-file counts, seconds
+                 and docs/sec
+
+        >>> ingest_files("./data/hourly", db_name="tweets", collection_name="global", n_writers=8)
+        {'inserted': 21999, 'duplicates': 0, 'ambiguous': 0, 'failed': 0, 'failed_files': [], 'files': {...}, 'seconds': 3.1, ...}
+        """
+        file_paths = self.find_tweet_files(path)
+        progress = IngestionProgress(file_paths, self.logger)
+        self.logger.setLevel(logging.DEBUG)
+        if not self.connection.test_connection():
+            # no connection
+            self.logger.error("Cannot connect to cluster!!!")
+            return {**progress.totals(), "files": progress.files, "seconds": 0.0, "docs_per_sec": 0.0}
+
+        collection = self.client[db_name][collection_name]
+        batch_queue = queue.Queue(maxsize=max_queued_batches)
+        start = time.perf_counter()
+
+        writers = [threading.Thread(target=self.write_batches, daemon=True,
+                                    args=(collection, batch_queue, progress, max_retries, retry_backoff))
+                   for _ in range(n_writers)]
+        for writer in writers:
+            writer.start()
+        try:
+            for file_path in file_paths:
+                self.parse_file(file_path, batch_queue, batch_size, progress)
+        finally:
+            # one stop signal per writer, queued after every batch, also when parsing raised
+            for _ in writers:
+                batch_queue.put(None)
+            for writer in writers:
+                writer.join()
+
+        stats = progress.totals()
+        stats["files"] = progress.files
+        stats["seconds"] = time.perf_counter() - start
+        processed = sum(stats[key] for key in COUNT_KEYS)
+        stats["docs_per_sec"] = processed / stats["seconds"] if stats["seconds"] > 0 else 0.0
+        self.logger.info("Ingested %d files: %d inserted, %d duplicates, %d ambiguous, %d failed, %d failed files "
+                         "(%.0f docs/sec)", len(file_paths), stats["inserted"], stats["duplicates"],
+                         stats["ambiguous"], stats["failed"],
+                         len(stats["failed_files"]), stats["docs_per_sec"])
+        return stats
@@ -0,0 +1,329 @@
+import atexit
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+
+LOG_FORMAT = "%(asctime)s: %(levelname)s: %(message)s"
+
+# log target ('console' or the absolute path of a log file) -> (QueueHandler, QueueListener)
+_queues = {}
+_queues_lock = threading.Lock()
+
+
+def _queue_handler(target, make_handler):
+    """
+    Fetch the QueueHandler of a log target, creating the target handler and its listener on first use.
+    Loggers only put records on the queue, the listener thread formats and writes them.
+
+    Parameters:
+                target -> key of the target, 'console' or a log file path
+                make_handler -> function creating the handler that writes the records
+    """
+    with _queues_lock:
+        entry = _queues.get(target)
+        if entry is None:
+            log_queue = queue.SimpleQueue()
+            handler = make_handler()
+            handler.setFormatter(logging.Formatter(fmt=LOG_FORMAT))
+            listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+            listener.start()
+            entry = (logging.handlers.QueueHandler(log_queue), listener)
+            _queues[target] = entry
+        return entry[0]
+
+
+def _attach(logger, handler):
+    """
+    Add a handler to a logger unless it already has it, so repeated setup never duplicates output
+    """
+    if handler not in logger.handlers:
+        logger.addHandler(handler)
+    return logger
+
+
+def stop_listeners():
+    """
+    Write out every queued record, stop the listener threads and detach their queue handlers.
+    Registered to run when the interpreter exits, the next logger setup starts new listeners.
+    """
+    with _queues_lock:
+        entries = list(_queues.values())
+        _queues.clear()
+    loggers = [logger for logger in logging.Logger.manager.loggerDict.values() if isinstance(logger, logging.Logger)]
+    for queue_handler, listener in entries:
+        for logger in loggers:
+            logger.removeHandler(queue_handler)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+atexit.register(stop_listeners)
+
+
+def logger_console_config(logger_name):
+    """
+    Create logger with the specified name. Output all log levels. Attach logger to console.
+    Calling it again for the same name returns the same logger without adding another handler.
+
+    Parameter:
+            logger_name -> the name of the logger
+    """
+    console = _queue_handler("console", lambda: logging.StreamHandler(sys.stdout))
+    return _attach(logging.getLogger(logger_name), console)
+
+
+def logger_file_config(dir_path, logger_name, file_name):
+    """
+    Create logger with the specified name. Set up logger to output logs to file in current directory.
+    Output all log levels. Loggers writing to the same file share one handler.
+
+    Parameters:
+                dir_path -> folder to save log file
+                logger_name -> name of logger object
+                file_name -> file to store logs (.log)
+    """
+    file_path = os.path.abspath(os.path.join(dir_path, file_name))
+    log_file = _queue_handler(file_path, lambda: logging.FileHandler(filename=file_path, mode='a'))
+    return _attach(logging.getLogger(logger_name), log_file)
+
+
+class Metrics:
+    """
+    Thread safe registry of timers and counters.
+
+    A timer keeps its number of calls and total time, and the most recent durations for percentiles.
+    Timings recorded inside process pool workers stay in the worker process until the worker sends
+    them back with drain and the parent adds them with merge.
+    """
+
+    def __init__(self, max_samples=10000):
+        # number of recent durations kept per timer for the percentiles
+        self.max_samples = max_samples
+        self.lock = threading.Lock()
+        # timer name -> [count, total seconds, recent durations]
+        self.timers = {}
+        # counter name -> value
+        self.counters = {}
+
+    def record(self, name, seconds):
+        with self.lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                timer = self.timers[name] = [0, 0.0, deque(maxlen=self.max_samples)]
+            timer[0] += 1
+            timer[1] += seconds
+            timer[2].append(seconds)
+
+    def increment(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def reset(self):
+        with self.lock:
+            self.timers.clear()
+            self.counters.clear()
+
+    def drain(self):
+        """
+        Take every timer and counter recorded so far and reset the registry, e.g. at the end of a
+        process pool task so the parent can merge the worker's timings
+
+        Return:
+                picklable dictionary of timers and counters, see merge
+        """
+        with self.lock:
+            timers = {name: (count, total, list(durations)) for name, (count, total, durations) in self.timers.items()}
+            counters = dict(self.counters)
+            self.timers.clear()
+            self.counters.clear()
+        return {"timers": timers, "counters": counters}
+
+    def merge(self, drained):
+        """
+        Add timers and counters taken from another registry with drain
+
+        Parameters:
+                drained -> dictionary returned by drain
+        """
+        with self.lock:
+            for name, (count, total, durations) in drained["timers"].items():
+                timer = self.timers.get(name)
+                if timer is None:
+                    timer = self.timers[name] = [0, 0.0, deque(maxlen=self.max_samples)]
+                timer[0] += count
+                timer[1] += total
+                timer[2].extend(durations)
+            for name, value in drained["counters"].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self):
+        """
+        Summarize every timer and counter
+
+        Return:
+                dictionary of timer name -> count, total, p50 and p95 in seconds, and counter name -> count
+        """
+        with self.lock:
+            timers = {name: (count, total, sorted(durations)) for name, (count, total, durations) in self.timers.items()}
+            counters = dict(self.counters)
+        summary = {}
+        for name, (count, total, durations) in sorted(timers.items()):
+            # nearest rank percentiles of the recent durations
+            summary[name] = {"count": count, "total": total,
+                             "p50": durations[(len(durations) - 1) // 2],
+                             "p95": durations[int(0.95 * (len(durations) - 1) + 0.5)]}
+        for name, value in sorted(counters.items()):
+            summary[name] = {"count": value}
+        return summary
+
+
+# registry used by timed and count
+metrics = Metrics()
+
+
+class Timer:
+    """
+    Time a block or every call of a function into a Metrics registry.
+
+    >>> with timed("mongo.find"):
+    ...     documents = list(cursor)
+    >>> @timed("topic_modelling.create_bow")
+    ... def create_bow(self, tweet_list, mapping_dict):
+    """
+
+    def __init__(self, name, registry=None):
+        self.name = name
+        # None records into the module registry
+        self.registry = registry
+        self.start = None
+        self.elapsed = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed = time.perf_counter() - self.start
+        (self.registry or metrics).record(self.name, self.elapsed)
+        return False
+
+    def __call__(self, function):
+        # every call gets its own start time, so the wrapper is safe for recursion and threads
+        @functools.wraps(function)
+        def timed_function(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                (self.registry or metrics).record(self.name, time.perf_counter() - start)
+        return timed_function
+
+
+def timed(name, registry=None):
+    """
+    Timer for a block (with statement) or a function (decorator)
+
+    Parameters:
+                name -> name of the timer, e.g. 'preprocessing.pos_tag'
+                registry -> Metrics to record into, defaults to the module registry
+    """
+    return Timer(name, registry)
+
+
+def count(name, amount=1, registry=None):
+    """
+    Add to a counter, e.g. the number of tweets processed
+    """
+    (registry or metrics).increment(name, amount)
+
+
+def log_summary(logger, registry=None):
+    """
+    Log one line per timer and counter, e.g.
+    'preprocessing.pos_tag: count=12 total=3.210s p50=250.1ms p95=400.2ms'
+
+    Parameters:
+                logger -> console or file logger, see logger_console_config and logger_file_config
+                registry -> Metrics to summarize, defaults to the module registry
+    """
+    for name, values in (registry or metrics).summary().items():
+        if "total" in values:
+            logger.info("%s: count=%d total=%.3fs p50=%.1fms p95=%.1fms", name, values["count"], values["total"],
+                        values["p50"] * 1000, values["p95"] * 1000)
+        else:
+            logger.info("%s: count=%d", name, values["count"])
+
+
+def write_summary(json_path, registry=None):
+    """
+    Append the summary as one JSON line with a timestamp to a metrics file
+
+    Parameters:
+                json_path -> path of the JSON lines metrics file
+                registry -> Metrics to summarize, defaults to the module registry
+    """
+    line = json.dumps({"time": time.time(), "metrics": (registry or metrics).summary()})
+    with open(json_path, "a", encoding="utf-8") as metrics_file:
+        metrics_file.write(line + "\n")
+
+
+class SummaryReporter(threading.Thread):
+    """
+    Daemon thread emitting the summary every interval seconds, and once more when stopped.
+
+    >>> reporter = start_summaries(60, logger=logger_console_config("metrics"), json_path="metrics.jsonl")
+    >>> train()
+    >>> reporter.stop()
+    """
+
+    def __init__(self, interval, logger=None, json_path=None, registry=None):
+        super().__init__(name="metrics-summary", daemon=True)
+        self.interval = interval
+        self.logger = logger
+        self.json_path = json_path
+        self.registry = registry
+        self.stopped = threading.Event()
+
+    def report(self):
+        if self.logger is not None:
+            log_summary(self.logger, self.registry)
+        if self.json_path is not None:
+            write_summary(self.json_path, self.registry)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.report()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+        self.report()
+
+
+def start_summaries(interval=60, logger=None, json_path=None, registry=None):
+    """
+    Start emitting periodic summaries to a logger, a JSON lines metrics file or both
+
+    Parameters:
+                interval -> seconds between summaries
+                logger -> console or file logger
+                json_path -> path of the JSON lines metrics file
+                registry -> Metrics to summarize, defaults to the module registry
+
+    Return:
+            the running SummaryReporter, call stop() for the final summary
+    """
+    if logger is not None and not logger.isEnabledFor(logging.INFO):
+        # summaries are logged at INFO, the level is set once here and not on every report
+        logger.setLevel(logging.INFO)
+    reporter = SummaryReporter(interval, logger, json_path, registry)
+    reporter.start()
+    return reporter
@@ -0,0 +1,412 @@
+from re import sub, compile  # regular expressions package
+from functools import partial
+
+from twitter_data_analysis import logger_setup
+from twitter_data_analysis.process_pool import iter_chunks, ordered_map
+from twitter_data_analysis.preprocessing_cache import PreprocessingCache
+
+# universal POS tags which have a WordNet equivalent.
+# adjectives are lemmatized as satellite adjectives ('s')
+PARTS_OF_SPEECH = {'NOUN': 'n', 'VERB': 'v', 'ADJ': 's', 'ADV': 'r', 'PRON': 'n'}
+
+# punctuation marks, digits and '+' removed by remove_punctuation. The hyphen is escaped so that
+# it is matched literally instead of forming the range '&' to '*'
+PUNCTUATION_PATTERN = compile(r'[.:;()/!&\-*@$,?^\d+]')
+
+# single pass used by normalize_tweet. Matches, in order of precedence:
+# links and @mentions (whole words), non-ascii characters, digits and punctuation other than
+# '#', '_' and apostrophes, and apostrophes which are not inside a word
+NORMALIZE_PATTERN = compile(
+    r"(?<!\S)(?:@|https?(?![a-z]))\S*"
+    r"|[^\x00-\x7F]"
+    r"|[!\"$%&()*+,\-./:;<=>?@\[\\\]^`{|}~\d]"
+    r"|'(?![a-z])|(?<![a-z])'"
+)
+
+# NLTK takes seconds to import, so it is only imported when a tweet is tagged, lemmatized or
+# filtered. Modules which only need NORMALIZE_PATTERN (the dashboard, extract_dataframe) never load it.
+
+
+def pos_tag(tokens, tagset=None, lang="eng"):
+    """
+    nltk.tag.pos_tag, importing NLTK on first use
+    """
+    from nltk.tag import pos_tag as nltk_pos_tag
+    return nltk_pos_tag(tokens, tagset=tagset, lang=lang)
+
+
+def pos_tag_sents(sentences, tagset=None, lang="eng"):
+    """
+    nltk.tag.pos_tag_sents, importing NLTK on first use
+    """
+    from nltk.tag import pos_tag_sents as nltk_pos_tag_sents
+    return nltk_pos_tag_sents(sentences, tagset=tagset, lang=lang)
+
+
+def english_stopwords():
+    """
+    The NLTK English stopwords corpus as a list
+    """
+    from nltk.corpus import stopwords
+    return stopwords.words('english')
+
+
+class TweetsPreprocessing:
+    """
+    Preprocessing functions to standardize text one word at a time
+    """
+
+    def __init__(self, cache_path=None, max_cached_lemmas=100000):
+        # initialize the NLTK module which performs lemmatization on words.
+        from nltk.stem import WordNetLemmatizer
+        from nltk.tokenize import TweetTokenizer
+        self.wnl = WordNetLemmatizer()
+        self.tokenizer = TweetTokenizer()
+        # stopwords and lemmas are looked up through a cache, optionally persisted to cache_path
+        self.cache = PreprocessingCache(max_cached_lemmas, cache_path)
+
+    def get_stopwords(self):
+        """
+        Fetch the English stopwords. The NLTK corpus is only read the first time.
+
+        :return: frozen set of stopwords
+        """
+        return self.cache.get_stopwords(english_stopwords)
+
+    def save_cache(self):
+        """
+        Persist the lemma cache to the cache_path given at construction.
+
+        :return: True if save succeeded, otherwise False
+        """
+        return self.cache.save()
+
+    def remove_punctuation(self, text):
+        """
+        Replaces every occurrence of punctuation marks in a string with an empty string.
+
+        :param text: string input that contains punctuation marks
+        :return: text without punctuation marks
+
+        >>> remove_punctuation("RT : I guess #WWIII on its way for #Taiwan https://t.co/oomVltBmKF")
+        'RT  I guess #WWIII on its way for #Taiwan httpstcooomVltBmKF'
+        >>> remove_punctuation("well-known")
+        'wellknown'
+        """
+        if text is None:
+            return text
+        else:
+            return PUNCTUATION_PATTERN.sub('', text)
+
+    @logger_setup.timed("preprocessing.lemmatize_phrase")
+    def lemmatize_phrase(self, phrase):
+        """
+        Uses NLTKs WordNetLemmatizer module to lemmatize words.
+        Lemmatization is the process of reducing a word to its base form i.e. lemma. 
+
+        'n' for nouns, 'v' for verbs, 'a' for adjectives, 'r' for adverbs and “s” for satellite adjectives.
+
+        :param phrase: the phrase to be lemmatized
+        :return: string containing lemmatized words.
+
+        >>> lemmatize_phrase("The beautiful, green leaves fell from the tree.")
+        'The beautiful , green leaf fell from the tree .'
+        >>> lemmatize_word("The quickly-moving train sped past the station")
+        'The quickly-moving train speed past the station'
+        """
+        if phrase is None:
+            return phrase
+        else:
+            # phrase is not empty
+            text_tokens = self.tokenizer.tokenize(phrase)
+            tags = pos_tag(tokens=text_tokens, tagset='universal', lang="eng")
+            lemmatized_text = ' '.join(self.lemmatize_tags(tags))
+            return lemmatized_text
+
+    def lemmatize_tags(self, tags):
+        """
+        Lemmatizes a sequence of POS-tagged tokens.
+        Tokens whose universal tag has no WordNet equivalent are returned unchanged.
+
+        :param tags: list of (token, universal POS tag) tuples
+        :return: list of lemmatized tokens
+
+        >>> lemmatize_tags([('leaves', 'NOUN'), ('fell', 'VERB'), ('.', '.')])
+        ['leaf', 'fall', '.']
+        """
+        lemmatized_tokens = []
+        for token, pos in tags:
+            if pos in PARTS_OF_SPEECH:
+                # add the lemma to the list
+                lemmatized_tokens.append(
+                    self.cache.get_lemma(token, PARTS_OF_SPEECH[pos], self.wnl.lemmatize))
+            else:
+                lemmatized_tokens.append(token)
+        return lemmatized_tokens
+
+    @logger_setup.timed("preprocessing.remove_stopwords")
+    def remove_stopwords(self, phrase):
+        """
+        Removes stop words from the phrase
+        Stop words are words in any language or corpus that occur frequently.
+        For some NLP tasks, these words do not provide any additional or valuable information to the text containing them.
+        a, they, the, is, an, etc. are usually considered stop words
+
+        :param phrase: the phrase to remove stopwords from
+        :return: phrase without stopwords
+
+        >>> remove_stopwords('RT @anku5hdilraaj_: I guess #WWIII on its way for #Taiwan https://t.co/oomVltBmKF')
+        'RT @anku5hdilraaj_ : I guess #WWIII way #Taiwan https://t.co/oomVltBmKF'
+        """
+        if phrase is None:
+            return phrase
+        else:
+            # phrase is not empty
+            stopwords_set = self.get_stopwords()
+            tokens = self.tokenizer.tokenize(phrase)
+            filtered_tokens = [
+                token for token in tokens if token not in stopwords_set]
+            filtered_text = ' '.join(filtered_tokens)
+            return filtered_text
+
+    def remove_non_ascii(self, text):
+        """
+        Function to remove non-ASCII characters from string input and replace them with an empty string
+        Remove extra whitespace at the end of text
+        Non-ASCII characters include: ellipses, Symbols, Emojis
+
+        :param text: the phrase to remove ASCII characters from
+        :return: string without ASCII characters
+        >>> remove_non_ascii('RT @CGMeifangZhang: Unlike what happened after the #Ukraine crisis when…')
+        'RT @CGMeifangZhang: Unlike what happened after the #Ukraine crisis when'
+        """
+        if text is None:
+            return text
+        else:
+            return str(sub(r'[^\x00-\x7F]', '', text.strip()))
+
+    def remove_link_mentions(self, text):
+        """        
+        Removes web addresses and twitter handles from Tweets
+
+        :param text: the phrase to remove stopwords from
+        :return: phrase without links and @mentions
+
+        >>> remove_link_mentions("RT @anku5hdilraaj_: I guess #WWIII on its way for #Taiwan https://t.co/oomVltBmKF")
+        'RT I guess #WWIII on its way for #Taiwan'
+        """
+        words_list = [word for word in text.split(
+        ) if word is not None and not word.startswith('@') and not word.startswith('https')]
+        phrase = " ".join(words_list)
+        return phrase
+
+    def preprocessing_pipeline(self, text):
+        """
+        Final text pre-processing function which combines all the above methods.
+        There are 5 methods used to preprocess tweets:
+        1. remove links and mentions
+        2. remove punctuation - this does not include ellipses for long texts
+        3. remove non-ascii characters - includes ellipses for long texts
+        4. lemmatize words
+        5. remove stopwords
+
+        :param text: text to preprocess
+        :return: processed text
+
+        >>> preprocessing_pipeline('RT @CGMeifangZhang: #Latest When the PLA conducted massive drills around #Taiwan in response to the serious provocations made by the US on…')
+        'rt #latest pla conduct massive drill around #taiwan response serious provocation make u'
+        """
+        return self.remove_stopwords(self.lemmatize_phrase(self.clean_word(text)))
+
+    def normalize_tweet(self, text):
+        """
+        Fused replacement for the cleaning stages of preprocessing_pipeline.
+        Lowercases the text, removes links, @mentions, punctuation, digits and non-ascii characters
+        with one precompiled regular expression, then splits it into tokens.
+        '#' is kept for hashtags and apostrophes are kept inside words.
+
+        :param text: tweet text
+        :return: list of tokens
+
+        >>> normalize_tweet("RT @CGMeifangZhang: #Latest When the PLA's drills, in 2022… https://t.co/oomVltBmKF")
+        ['rt', '#latest', 'when', 'the', "pla's", 'drills', 'in']
+        """
+        if text is None:
+            return []
+        return NORMALIZE_PATTERN.sub('', text.lower()).split()
+
+    def process_tokens(self, tokens, tags=None):
+        """
+        Lemmatizes a list of normalized tokens and removes stopwords, without re-joining or
+        re-tokenizing between the two stages.
+
+        :param tokens: list of tokens produced by normalize_tweet
+        :param tags: (token, universal POS tag) tuples for the tokens, tagged here when not given
+        :return: list of processed tokens
+
+        >>> process_tokens(['the', 'pla', 'conducted', 'massive', 'drills'])
+        ['pla', 'conduct', 'massive', 'drill']
+        """
+        if tags is None:
+            tags = pos_tag(tokens=tokens, tagset='universal', lang="eng")
+        stopwords_set = self.get_stopwords()
+        return [token for token in self.lemmatize_tags(tags) if token not in stopwords_set]
+
+    @logger_setup.timed("preprocessing.clean_word")
+    def clean_word(self, text):
+        """
+        Runs the string cleaning stages of the pipeline: lowercasing, links and mentions,
+        punctuation and non-ascii characters.
+
+        :param text: text to clean
+        :return: cleaned text
+
+        >>> clean_word('#Taiwan…')
+        '#taiwan'
+        """
+        return self.remove_non_ascii(self.remove_punctuation(self.remove_link_mentions(text.lower())))
+
+    def preprocess_vocabulary(self, words):
+        """
+        Runs preprocessing_pipeline on a collection of words in bulk.
+
+        Every distinct word is cleaned and tokenized once, all of them are POS tagged with a single
+        pos_tag_sents call and the stopwords are loaded once for the whole batch.
+        Each word is tagged on its own, so the result matches preprocessing_pipeline(word) exactly.
+
+        :param words: iterable of words, duplicates are allowed
+        :return: dictionary mapping every distinct word to its processed text
+
+        >>> preprocess_vocabulary(['Drills', 'drills', 'the'])
+        {'Drills': 'drill', 'drills': 'drill', 'the': ''}
+        """
+        unique_words = list(dict.fromkeys(words))
+        logger_setup.count("preprocessing.vocabulary_words", len(unique_words))
+        with logger_setup.timed("preprocessing.batch.clean"):
+            token_lists = [self.tokenizer.tokenize(self.clean_word(word)) for word in unique_words]
+        with logger_setup.timed("preprocessing.batch.pos_tag"):
+            tagged_lists = pos_tag_sents(token_lists, tagset='universal', lang="eng")
+        stopwords_set = self.get_stopwords()
+
+        processed_words = {}
+        with logger_setup.timed("preprocessing.batch.lemmatize_stopwords"):
+            for word, tags in zip(unique_words, tagged_lists):
+                lemmatized_text = ' '.join(self.lemmatize_tags(tags))
+                # same tokenization as remove_stopwords
+                tokens = self.tokenizer.tokenize(lemmatized_text)
+                processed_words[word] = ' '.join(token for token in tokens if token not in stopwords_set)
+        return processed_words
+
+    def preprocess_tweets_batch(self, tweets, fused=False):
+        """
+        Perform preprocessing on a whole column (or any iterable) of tweets at once.
+
+        Tweets are split into words the same way as preprocess_tweets_df, then the distinct words are
+        processed together by preprocess_vocabulary. Missing tweets produce an empty list.
+
+        With fused=True every tweet is normalized once by normalize_tweet, all tweets are tagged in
+        context with a single pos_tag_sents call and process_tokens returns the tokens directly,
+        so there are no empty strings in the output.
+
+        :param tweets: pandas Series or iterable of tweet texts
+        :param fused: use the fused normalizer instead of the per-word pipeline
+        :return: list of token lists, one per tweet
+
+        >>> preprocess_tweets_batch(tweets_df["full_text"])
+        [['rt', '', '#latest', ...], ...]
+        >>> preprocess_tweets_batch(tweets_df["full_text"], fused=True)
+        [['rt', '#latest', ...], ...]
+        """
+        if fused:
+            with logger_setup.timed("preprocessing.batch.normalize"):
+                token_lists = [self.normalize_tweet(tweet) if isinstance(tweet, str) else [] for tweet in tweets]
+            logger_setup.count("preprocessing.tweets", len(token_lists))
+            with logger_setup.timed("preprocessing.batch.pos_tag"):
+                tagged_lists = pos_tag_sents(token_lists, tagset='universal', lang="eng")
+            with logger_setup.timed("preprocessing.batch.lemmatize_stopwords"):
+                return [self.process_tokens(tokens, tags) for tokens, tags in zip(token_lists, tagged_lists)]
+
+        tweets_words = [tweet.split() if isinstance(tweet, str) else [] for tweet in tweets]
+        logger_setup.count("preprocessing.tweets", len(tweets_words))
+        processed_words = self.preprocess_vocabulary(
+            word for words in tweets_words for word in words)
+        return [[processed_words[word] for word in words] for words in tweets_words]
+
+    def preprocess_tweets_parallel(self, tweets, chunk_size=2000, n_workers=None, fused=False):
+        """
+        Perform batched preprocessing on a process pool.
+
+        Tweets are read lazily from the iterable in chunks of chunk_size. Each worker process builds its
+        own TweetsPreprocessing (lemmatizer, tokenizer and a cache warmed from cache_path) once and runs
+        preprocess_tweets_batch on every chunk it receives. At most two chunks per worker are in flight,
+        see process_pool.ordered_map, so a ReadDocs cursor or any other generator is never fully
+        materialized. Results are returned in input order. The lemmas computed
+        by the workers are merged into the cache of this process, so save_cache persists them, and their
+        timers into the logger_setup registry of this process.
+
+        :param tweets: pandas Series or iterable of tweet texts
+        :param chunk_size: number of tweets sent to a worker at a time
+        :param n_workers: number of worker processes, defaults to the number of CPUs
+        :param fused: use the fused normalizer, see preprocess_tweets_batch
+
+        :return: list of token lists, one per tweet
+        >>> preprocess_tweets_parallel(tweets_df["full_text"], chunk_size=1000, n_workers=16)
+        [['rt', '', '#latest', ...], ...]
+        """
+        processed_tweets = []
+        for chunk_tweets, worker_lemmas, worker_metrics in ordered_map(
+                partial(_preprocess_tweets_chunk, fused=fused), iter_chunks(tweets, chunk_size), n_workers,
+                _init_preprocessing_worker, (self.cache.file_path, self.cache.max_lemmas)):
+            processed_tweets.extend(chunk_tweets)
+            self.cache.merge(worker_lemmas)
+            logger_setup.metrics.merge(worker_metrics)
+        return processed_tweets
+
+    def preprocess_tweets_df(self, dataframe, tweets_col, batched=True, n_workers=1, chunk_size=2000, fused=False):
+        """
+        Perform preprocessing on all tweets in a dataframe column
+
+        :param dataframe: dataframe containing tweets data
+        :param tweets_col: column containing tweets text
+        :param batched: use preprocess_tweets_batch, otherwise run the pipeline one word at a time
+        :param n_workers: number of processes for batched preprocessing, None uses every CPU
+        :param chunk_size: number of tweets per worker task when n_workers is not 1
+        :param fused: use the fused normalizer for batched preprocessing
+
+        :return: list of words
+        >>> preprocess_tweets_df(tweets_df, "full_text")
+        []
+        """
+        if batched and n_workers != 1:
+            return self.preprocess_tweets_parallel(dataframe[tweets_col], chunk_size, n_workers, fused)
+        if batched:
+            return self.preprocess_tweets_batch(dataframe[tweets_col], fused)
+        return [[self.preprocessing_pipeline(word) for word in row[tweets_col].split() if word is not None]
+                for index, row in dataframe.iterrows()]
+
+
+# Per-process state for preprocess_tweets_parallel
+_worker_preprocessing = None
+
+
+def _init_preprocessing_worker(cache_path, max_cached_lemmas):
+    """
+    Process pool initializer. Creates the lemmatizer, tokenizer and cache once per worker.
+    """
+    global _worker_preprocessing
+    # a forked worker starts with a copy of the parent's timers, they must not be sent back
+    logger_setup.metrics.reset()
+    _worker_preprocessing = TweetsPreprocessing(cache_path, max_cached_lemmas)
+    # lemmas computed by the worker are sent back to the parent with every chunk
+    _worker_preprocessing.cache.added = []
+
+
+def _preprocess_tweets_chunk(tweets, fused):
+    """
+    Process pool task. Runs batched preprocessing on one chunk of tweets.
+
+    :return: the token lists, the lemmas computed for them and the timers recorded while processing them,
+             see PreprocessingCache.drain_added and Metrics.drain
+    """
+    processed_tweets = _worker_preprocessing.preprocess_tweets_batch(tweets, fused)
+    return processed_tweets, _worker_preprocessing.cache.drain_added(), logger_setup.metrics.drain()
@@ -0,0 +1,140 @@
+from collections import OrderedDict
+import os
+import pickle
+
+
+class PreprocessingCache:
+    """
+    Lookup cache used by TweetsPreprocessing.
+
+    Holds the stopwords as a frozen set which is loaded once, and a bounded LRU memo of
+    (token, WordNet POS) -> lemma with hit and miss counters.
+    The memo can be saved to a file so that later runs start with a warm cache.
+    """
+
+    def __init__(self, max_lemmas=100000, file_path=None):
+        # maximum number of (token, POS) pairs kept in memory
+        self.max_lemmas = max_lemmas
+        # pickle file used to persist the lemma memo between runs
+        self.file_path = file_path
+        self.lemmas = OrderedDict()
+        self.stopwords = None
+        self.hits = 0
+        self.misses = 0
+        # lemmas computed since the last drain_added, None when they are not tracked
+        self.added = None
+        if file_path is not None and os.path.exists(file_path):
+            self.load(file_path)
+
+    def get_stopwords(self, load_stopwords):
+        """
+        Fetch the stopwords, loading them on first use only.
+
+        :param load_stopwords: function returning the list of stopwords
+
+        :return: frozen set of stopwords
+
+        >>> get_stopwords(lambda: stopwords.words('english'))
+        frozenset({'a', 'about', ...})
+        """
+        if self.stopwords is None:
+            self.stopwords = frozenset(load_stopwords())
+        return self.stopwords
+
+    def get_lemma(self, token, pos, lemmatize):
+        """
+        Fetch the lemma of a token, calling lemmatize only when it is not cached.
+        The least recently used entry is dropped when the memo is full.
+
+        :param token: the word to lemmatize
+        :param pos: WordNet part of speech of the word
+        :param lemmatize: function (token, pos) -> lemma
+
+        :return: the lemma
+
+        >>> get_lemma('leaves', 'n', wnl.lemmatize)
+        'leaf'
+        """
+        key = (token, pos)
+        lemma = self.lemmas.get(key)
+        if lemma is not None:
+            self.hits += 1
+            self.lemmas.move_to_end(key)
+            return lemma
+
+        self.misses += 1
+        lemma = lemmatize(token, pos)
+        self.lemmas[key] = lemma
+        if self.added is not None:
+            self.added.append((key, lemma))
+        if len(self.lemmas) > self.max_lemmas:
+            self.lemmas.popitem(last=False)
+        return lemma
+
+    def drain_added(self):
+        """
+        Take the lemmas computed since the last call, e.g. at the end of a process pool task so the
+        parent can merge the worker's lemmas. Only tracked once added has been set to a list.
+
+        :return: list of ((token, pos), lemma) pairs
+        """
+        added = self.added or []
+        if self.added is not None:
+            self.added = []
+        return added
+
+    def merge(self, items):
+        """
+        Add lemmas computed elsewhere, see drain_added. They do not count as hits or misses.
+
+        :param items: iterable of ((token, pos), lemma) pairs
+        """
+        for key, lemma in items:
+            self.lemmas[key] = lemma
+            self.lemmas.move_to_end(key)
+        while len(self.lemmas) > self.max_lemmas:
+            self.lemmas.popitem(last=False)
+
+    def stats(self):
+        """
+        Fetch the lemma memo counters
+
+        :return: dictionary with hits, misses, hit rate and number of cached lemmas
+
+        >>> stats()
+        {'hits': 9120, 'misses': 880, 'hit_rate': 0.912, 'size': 880}
+        """
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0, "size": len(self.lemmas)}
+
+    def save(self, file_path=None):
+        """
+        Write the lemma memo to a pickle file.
+        The file is written next to the target and then renamed so a crash never leaves a partial cache.
+
+        :param file_path: the file to write, defaults to the file the cache was created with
+
+        :return: True if save succeeded, otherwise False
+        """
+        file_path = file_path or self.file_path
+        if file_path is None:
+            return False
+        temp_path = file_path + '.tmp'
+        with open(temp_path, 'wb') as cache_file:
+            pickle.dump(list(self.lemmas.items()), cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, file_path)
+        return True
+
+    def load(self, file_path):
+        """
+        Read a lemma memo written by save. Only the most recent max_lemmas entries are kept.
+
+        :param file_path: the file to read
+
+        :return: number of lemmas loaded
+        """
+        with open(file_path, 'rb') as cache_file:
+            items = pickle.load(cache_file)
+        self.lemmas = OrderedDict(items[-self.max_lemmas:])
+        return len(self.lemmas)
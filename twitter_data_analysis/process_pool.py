@@ -0,0 +1,66 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+# marks the end of the items in ordered_map
+_END = object()
+
+
+def iter_chunks(items, chunk_size):
+    """
+    Split an iterable into lists of at most chunk_size items, reading it lazily
+
+    :param items: any iterable, e.g. a pandas Series or a ReadDocs cursor
+    :param chunk_size: number of items per list
+
+    :return: generator of lists
+    """
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def ordered_map(function, items, n_workers=None, initializer=None, initargs=(), max_in_flight=None):
+    """
+    Call function on every item on a process pool and yield the results in input order.
+
+    Items are read lazily and at most max_in_flight tasks are submitted at a time, so a generator of
+    items is never held in memory at once. Worker state which is expensive to send (a corpus, a lexicon,
+    a lemmatizer) is set up once per worker by initializer. When the caller stops iterating early, the
+    tasks which have not started are cancelled and the running ones are waited for.
+
+    :param function: module level function of one item, it runs in the worker processes
+    :param items: iterable of picklable items
+    :param n_workers: number of worker processes, defaults to the number of CPUs
+    :param initializer: module level function run once in every worker
+    :param initargs: arguments of initializer
+    :param max_in_flight: tasks submitted but not yet returned, defaults to two per worker
+
+    :return: generator of results
+
+    >>> for tokens in ordered_map(_preprocess_tweets_chunk, iter_chunks(cursor, 2000), n_workers=8):
+    ...     write(tokens)
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * n_workers
+    items = iter(items)
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=initializer, initargs=initargs) as executor:
+        pending = deque()
+        try:
+            while True:
+                while len(pending) < max_in_flight:
+                    item = next(items, _END)
+                    if item is _END:
+                        break
+                    pending.append(executor.submit(function, item))
+                if not pending:
+                    return
+                # wait on the oldest task to keep the results in input order
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,262 @@
+import logging
+
+from twitter_data_analysis import logger_setup
+from twitter_data_analysis.tweet_loader import get_field
+import pandas as pd
+from twitter_data_analysis.connect_to_mongo import ConnectToMongo
+
+
+class ReadDocs:
+    """
+    Access docs stored in MongoDB, list collections and list databases
+    """
+    def __init__(self, uri, **client_options):
+        # Connect to MongoDB through the shared client for this uri
+        # Atlas Connection string is specified in .env file in project root
+        # client_options configure the connection pool, see connect_to_mongo.get_shared_client
+        self.connection = ConnectToMongo(uri, **client_options)
+        self.client = self.connection.get_mongo_client()
+        # set up logger to output to terminal
+        self.logger = logger_setup.logger_console_config(__name__)
+    
+    def list_databases(self):
+        """
+        Retrieve a list of databases available in the MongoDB cluster
+        
+        :return: a list of database names
+        
+        >>> list_databases()
+        ['sample_airbnb', 'sample_analytics', 'admin', 'local'] 
+        """
+        db_list = []
+        if self.connection.test_connection():
+            db_list = self.client.list_database_names()
+        return db_list
+    
+    def list_collections(self, db_name: str):
+        """
+        Retrieve a list of collections available in a specific database
+
+        :param db_name: The name of the database
+        
+        :return: a list of collection names
+        
+        >>> list_collections('sample_airbnb')
+        ['listingsAndReviews']
+        """
+        collections_list = []
+        if self.connection.test_connection():
+            # confirm cluster connection
+            databases = self.client.list_database_names()
+            if db_name in databases:
+                # confirm database exists
+                db_object = self.client[db_name]
+                collections_list = db_object.list_collection_names()
+            else:
+                # database does not exist
+                self.logger.setLevel(logging.DEBUG)
+                self.logger.error("Database does not exist")
+        else:
+            # no connection
+            self.logger.setLevel(logging.DEBUG)
+            self.logger.error("Cannot connect to cluster!!!")
+        
+        return collections_list
+    
+    def build_tweets_query(self, start=None, end=None, lang=None):
+        """
+        Build a MongoDB filter on the tweet creation date and language
+
+        :param start: earliest created_at (inclusive) as a datetime
+        :param end: latest created_at (exclusive) as a datetime
+        :param lang: a language code or a list of language codes
+
+        :return: query filter dictionary
+
+        >>> build_tweets_query(start=datetime(2022, 8, 8), lang=["en", "fr"])
+        {'created_at': {'$gte': datetime.datetime(2022, 8, 8, 0, 0)}, 'lang': {'$in': ['en', 'fr']}}
+        """
+        query = {}
+        created_at = {}
+        if start is not None:
+            created_at["$gte"] = start
+        if end is not None:
+            created_at["$lt"] = end
+        if created_at:
+            query["created_at"] = created_at
+        if isinstance(lang, str):
+            query["lang"] = lang
+        elif lang:
+            query["lang"] = {"$in": list(lang)}
+        return query
+
+    def find_tweets(self, database_name:str, collection_name:str, query=None, fields=None, batch_size:int=1000,
+                    limit:int=0, sort=None):
+        """
+        Open a cursor over the tweets in a collection. Filtering and projection happen on the server.
+
+        :param database_name: The name of the database to read from
+        :param collection_name: The name of the collection to read from
+        :param query: MongoDB filter, see build_tweets_query
+        :param fields: fields to return, dotted paths select nested values. None returns whole documents
+        :param batch_size: number of documents per network round trip
+        :param limit: maximum number of documents, 0 for no limit
+        :param sort: list of (field, direction) pairs e.g. [("_id", 1)]
+
+        :return: pymongo cursor
+        """
+        collection = self.client[database_name][collection_name]
+        projection = None if fields is None else {field: 1 for field in fields}
+        return collection.find(query or {}, projection, limit=limit, sort=sort).batch_size(batch_size)
+
+    def count_tweets(self, database_name:str, collection_name:str, query=None):
+        """
+        Count the tweets matching a filter. Without a filter the count comes from the collection metadata.
+
+        :param database_name: The name of the database
+        :param collection_name: The name of the collection
+        :param query: MongoDB filter, see build_tweets_query
+
+        :return: number of tweets
+        """
+        collection = self.client[database_name][collection_name]
+        with logger_setup.timed("mongo.count"):
+            if not query:
+                return collection.estimated_document_count()
+            return collection.count_documents(query)
+
+    def read_page(self, database_name:str, collection_name:str, query=None, fields=None, sort_field:str="_id",
+                  descending:bool=False, page:int=0, page_size:int=50, after=None):
+        """
+        Fetch one page of tweets sorted by a field. Ties are ordered by _id so pages never overlap.
+
+        Without after the page is found with skip, which makes the server walk past every earlier
+        document. after is the (sort value, _id) of the last row of the previous page: the page then
+        starts with a range condition and costs the same however deep it is.
+
+        :param database_name: The name of the database to read from
+        :param collection_name: The name of the collection to read from
+        :param query: MongoDB filter, see build_tweets_query
+        :param fields: fields to return, dotted paths select nested values. None returns whole documents
+        :param sort_field: field to sort by, dotted paths select nested values
+        :param descending: sort from the largest value
+        :param page: page number, starting at 0. Ignored when after is given
+        :param page_size: number of tweets per page
+        :param after: (sort value, _id) of the last row of the previous page
+
+        :return: dataframe of at most page_size tweets
+
+        >>> read_page("tweets", "global", fields=["full_text", "retweet_count"], sort_field="retweet_count",
+        ...           descending=True, page=2, page_size=20)
+        df
+        """
+        direction = -1 if descending else 1
+        sort = [(sort_field, direction)] if sort_field == "_id" else [(sort_field, direction), ("_id", direction)]
+        skip = page * page_size
+        if after is not None:
+            value, last_id = after
+            operator = "$lt" if descending else "$gt"
+            if sort_field == "_id":
+                range_query = {"_id": {operator: last_id}}
+            else:
+                range_query = {"$or": [{sort_field: {operator: value}}, {sort_field: value, "_id": {operator: last_id}}]}
+                if descending:
+                    # missing values sort after every value in descending order
+                    range_query["$or"].append({sort_field: None})
+            query = {"$and": [query, range_query]} if query else range_query
+            skip = 0
+        collection = self.client[database_name][collection_name]
+        projection = None if fields is None else {field: 1 for field in fields}
+        with logger_setup.timed("mongo.read_page"):
+            documents = list(collection.find(query or {}, projection, skip=skip, limit=page_size, sort=sort))
+        return self.documents_to_dataframe(documents, fields)
+
+    def aggregate_tweets(self, database_name:str, collection_name:str, pipeline, batch_size:int=1000):
+        """
+        Run an aggregation pipeline on a collection. Grouping happens on the server, so only the
+        results travel over the network.
+
+        :param database_name: The name of the database to read from
+        :param collection_name: The name of the collection to read from
+        :param pipeline: list of aggregation stages
+        :param batch_size: number of results per network round trip
+
+        :return: pymongo cursor
+
+        >>> list(aggregate_tweets("tweets", "global", [{"$group": {"_id": "$lang", "count": {"$sum": 1}}}]))
+        [{'_id': 'en', 'count': 16500}, ...]
+        """
+        collection = self.client[database_name][collection_name]
+        # large $group stages may spill to disk instead of failing at the memory limit
+        return collection.aggregate(pipeline, allowDiskUse=True, batchSize=batch_size)
+
+    def documents_to_dataframe(self, documents, fields=None):
+        """
+        Store documents in a dataframe. Projected fields become columns named by their dotted path,
+        as in tweet_loader.read_tweets.
+
+        :param documents: list of documents
+        :param fields: the projected fields, None keeps the top level fields
+
+        :return: dataframe
+        """
+        if fields is None:
+            return pd.DataFrame(documents)
+        columns = ["_id"] + [field for field in fields if field != "_id"]
+        paths = [(column, tuple(column.split("."))) for column in columns]
+        return pd.DataFrame({column: [get_field(document, path) for document in documents] for column, path in paths},
+                            columns=columns)
+
+    def read_tweets_in_collection(self, database_name:str, collection_name:str, query=None, fields=None,
+                                  batch_size:int=1000, limit:int=0):
+        """
+        Pull Tweets as Documents from MongoDB and store them in a dataframe
+        
+        :param database_name: The name of the database to read from
+        :param collection_name: The name of the collection to read from
+        :param query: MongoDB filter, see build_tweets_query
+        :param fields: fields to return, dotted paths select nested values. None returns whole documents
+        :param batch_size: number of documents per network round trip
+        :param limit: maximum number of documents, 0 for no limit
+        
+        :return: dataframe containing tweets
+        
+        >>> read_tweets_in_collection(database_name="tweets", collection_name="global")
+        df
+        >>> read_tweets_in_collection("tweets", "global", query={"lang": "en"}, fields=["full_text", "user.screen_name"])
+        df
+        """
+        with logger_setup.timed("mongo.find"):
+            documents = list(self.find_tweets(database_name, collection_name, query, fields, batch_size, limit))
+        logger_setup.count("mongo.documents_read", len(documents))
+        return self.documents_to_dataframe(documents, fields)
+
+    def iter_tweets_in_collection(self, database_name:str, collection_name:str, query=None, fields=None,
+                                  chunk_size:int=10000, batch_size:int=1000, limit:int=0, sort=None):
+        """
+        Pull Tweets from MongoDB as a sequence of dataframes of at most chunk_size rows.
+        Only one chunk is held in memory at a time.
+
+        :param database_name: The name of the database to read from
+        :param collection_name: The name of the collection to read from
+        :param query: MongoDB filter, see build_tweets_query
+        :param fields: fields to return, dotted paths select nested values. None returns whole documents
+        :param chunk_size: number of tweets per dataframe
+        :param batch_size: number of documents per network round trip
+        :param limit: maximum number of documents, 0 for no limit
+        :param sort: list of (field, direction) pairs e.g. [("_id", 1)]
+
+        :return: generator of dataframes
+
+        >>> for df in iter_tweets_in_collection("tweets", "global", fields=["full_text"], chunk_size=5000):
+        ...     preprocessing.preprocess_tweets_batch(df["full_text"])
+        """
+        cursor = self.find_tweets(database_name, collection_name, query, fields, batch_size, limit, sort)
+        documents = []
+        for document in cursor:
+            documents.append(document)
+            if len(documents) == chunk_size:
+                yield self.documents_to_dataframe(documents, fields)
+                documents = []
+        if documents:
+            yield self.documents_to_dataframe(documents, fields)
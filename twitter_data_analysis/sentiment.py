@@ -0,0 +1,231 @@
+import csv
+import os
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from twitter_data_analysis.process_pool import iter_chunks, ordered_map
+
+# VADER lexicon (Hutto and Gilbert, 2014) from vaderSentiment 3.3.2, MIT licensed,
+# see vader_lexicon_LICENSE.txt. https://github.com/cjhutto/vaderSentiment
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vader_lexicon.txt")
+# VADER valences range from -4 to 4
+VADER_MAX_VALENCE = 4.0
+# polarity above NEUTRAL_BAND is positive, below -NEUTRAL_BAND negative
+NEUTRAL_BAND = 0.05
+SENTIMENT_LABELS = ["negative", "neutral", "positive"]
+
+
+def load_lexicon(lexicon_path=DEFAULT_LEXICON_PATH):
+    """
+    Read a lexicon file. A CSV file has word, polarity and subjectivity columns. Any other file is read
+    in the VADER format: word, mean valence from -4 to 4 and its standard deviation, tab separated.
+    VADER has no subjectivity, the strength of the valence (|valence| / 4) is used instead.
+
+    :param lexicon_path: path to the lexicon file
+
+    :return: dictionary of word -> (polarity, subjectivity)
+    """
+    with open(lexicon_path, encoding="utf-8", newline="") as lexicon_file:
+        if lexicon_path.endswith(".csv"):
+            return {row["word"]: (float(row["polarity"]), float(row["subjectivity"]))
+                    for row in csv.DictReader(lexicon_file)}
+        lexicon = {}
+        for line in lexicon_file:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 2:
+                continue
+            polarity = float(fields[1]) / VADER_MAX_VALENCE
+            lexicon[fields[0]] = (polarity, abs(polarity))
+        return lexicon
+
+
+class LexiconSentiment:
+    """
+    Batched lexicon sentiment scores for preprocessed tweets.
+
+    Polarity (-1 to 1) and subjectivity (0 to 1) of a tweet are the averages over the lexicon words it
+    contains, 0 when it contains none. The lexicon is compiled into vectors aligned with a vocabulary,
+    so a whole batch is scored with sparse matrix-vector products over its bag-of-words matrix instead
+    of a dictionary lookup per word.
+
+    >>> sentiment = LexiconSentiment()
+    >>> polarity, subjectivity = sentiment.score_tokens([["great", "match"], ["terrible", "traffic"]])
+    >>> polarity
+    array([ 0.8, -0.8], dtype=float32)
+    """
+
+    def __init__(self, lexicon_path=DEFAULT_LEXICON_PATH):
+        self.lexicon_path = lexicon_path
+        self.lexicon = load_lexicon(lexicon_path)
+        # the lexicon itself as a vocabulary, used when no dictionary is given
+        self.word_ids = {word: word_id for word_id, word in enumerate(self.lexicon)}
+        self.lexicon_vectors = self.compile_vectors(self.word_ids)
+        # id of a gensim dictionary -> (dictionary, its compiled vectors)
+        self.compiled = {}
+
+    def compile_vectors(self, word_ids):
+        """
+        Align the lexicon with a vocabulary
+
+        :param word_ids: dictionary of word -> column, e.g. gensim Dictionary.token2id
+
+        :return: float32 vectors of polarity, subjectivity and 1 for lexicon words, one value per column
+        """
+        size = max(word_ids.values(), default=-1) + 1
+        polarity = np.zeros(size, dtype=np.float32)
+        subjectivity = np.zeros(size, dtype=np.float32)
+        in_lexicon = np.zeros(size, dtype=np.float32)
+        for word, word_id in word_ids.items():
+            scores = self.lexicon.get(word)
+            if scores is not None:
+                polarity[word_id], subjectivity[word_id] = scores
+                in_lexicon[word_id] = 1.0
+        return polarity, subjectivity, in_lexicon
+
+    def dictionary_vectors(self, mapping_dict):
+        """
+        Compiled vectors of a gensim dictionary, computed once per dictionary object
+        """
+        compiled = self.compiled.get(id(mapping_dict))
+        if compiled is None or compiled[0] is not mapping_dict or len(compiled[1][0]) != len(mapping_dict):
+            compiled = (mapping_dict, self.compile_vectors(mapping_dict.token2id))
+            self.compiled[id(mapping_dict)] = compiled
+        return compiled[1]
+
+    @staticmethod
+    def bow_matrix(bow, num_terms):
+        """
+        Stack bag-of-words vectors into a CSR matrix with one row per tweet
+
+        :param bow: list of bag-of-words vectors
+        :param num_terms: number of columns
+
+        :return: scipy.sparse.csr_matrix of float32 counts
+        """
+        lengths = np.fromiter((len(document) for document in bow), dtype=np.int64, count=len(bow))
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        entries = np.fromiter(chain.from_iterable(chain.from_iterable(bow)), dtype=np.float64,
+                              count=2 * int(indptr[-1])).reshape(-1, 2)
+        return sparse.csr_matrix((entries[:, 1].astype(np.float32), entries[:, 0].astype(np.int64), indptr),
+                                 shape=(len(bow), num_terms))
+
+    @staticmethod
+    def score_matrix(matrix, vectors):
+        """
+        Score every row of a bag-of-words matrix with three sparse matrix-vector products
+
+        :param matrix: csr_matrix of word counts, columns aligned with vectors
+        :param vectors: polarity, subjectivity and lexicon indicator vectors
+
+        :return: float32 arrays of polarity and subjectivity
+        """
+        polarity, subjectivity, in_lexicon = vectors
+        opinion_words = matrix @ in_lexicon
+        # tweets without lexicon words score 0
+        divisor = np.where(opinion_words > 0, opinion_words, 1.0)
+        return ((matrix @ polarity) / divisor).astype(np.float32), ((matrix @ subjectivity) / divisor).astype(np.float32)
+
+    def score_bow(self, bow, mapping_dict):
+        """
+        Score bag-of-words vectors built with a gensim dictionary, e.g. TopicModelling.create_bow
+
+        :param bow: list of bag-of-words vectors
+        :param mapping_dict: the dictionary the vectors were built with
+
+        :return: float32 arrays of polarity and subjectivity
+        """
+        vectors = self.dictionary_vectors(mapping_dict)
+        return self.score_matrix(self.bow_matrix(bow, len(vectors[0])), vectors)
+
+    def score_tokens(self, token_lists):
+        """
+        Score preprocessed tweets. Only lexicon words are counted, the rest cannot change the scores.
+
+        :param token_lists: list of lists of words, see TweetsPreprocessing.preprocess_tweets_batch
+
+        :return: float32 arrays of polarity and subjectivity
+        """
+        get_word_id = self.word_ids.get
+        indices = []
+        indptr = [0]
+        for tokens in token_lists:
+            # a repeated word gets one entry per occurrence, duplicate entries are summed by the products
+            indices.extend(word_id for word_id in map(get_word_id, tokens) if word_id is not None)
+            indptr.append(len(indices))
+        matrix = sparse.csr_matrix((np.ones(len(indices), dtype=np.float32), np.array(indices, dtype=np.int64),
+                                    np.array(indptr, dtype=np.int64)), shape=(len(indptr) - 1, len(self.word_ids)))
+        return self.score_matrix(matrix, self.lexicon_vectors)
+
+    def score_tokens_parallel(self, token_lists, chunk_size=20000, n_workers=None):
+        """
+        Score very large corpora on a process pool. Each worker loads the lexicon once, at most two
+        chunks per worker are in flight and results are returned in input order (see
+        process_pool.ordered_map), so a generator of token lists is never held in memory at once.
+        Sending tokens to the workers costs more than scoring them, so score_tokens is faster whenever
+        the token lists already fit in memory.
+
+        :param token_lists: iterable of lists of words
+        :param chunk_size: number of tweets sent to a worker at a time
+        :param n_workers: number of worker processes, defaults to the number of CPUs
+
+        :return: float32 arrays of polarity and subjectivity
+        """
+        polarity, subjectivity = [], []
+        chunks = iter_chunks(token_lists, chunk_size)
+        for chunk_polarity, chunk_subjectivity in ordered_map(_score_tokens_chunk, chunks, n_workers,
+                                                              _init_sentiment_worker, (self.lexicon_path,)):
+            polarity.append(chunk_polarity)
+            subjectivity.append(chunk_subjectivity)
+        if not polarity:
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32)
+        return np.concatenate(polarity), np.concatenate(subjectivity)
+
+    def label(self, polarity):
+        """
+        :param polarity: array of polarity scores
+
+        :return: categorical of 'negative', 'neutral' and 'positive'
+        """
+        codes = np.where(polarity > NEUTRAL_BAND, 2, np.where(polarity < -NEUTRAL_BAND, 0, 1))
+        return pd.Categorical.from_codes(codes, SENTIMENT_LABELS)
+
+    def add_sentiment_columns(self, df, token_lists, n_workers=1, chunk_size=20000):
+        """
+        Write polarity, subjectivity (float32) and sentiment (categorical) columns into a dataframe, in place
+
+        :param df: dataframe of tweets
+        :param token_lists: preprocessed tweets, one per row of df
+        :param n_workers: number of processes, 1 scores in this process and None uses every CPU
+
+        :return: the dataframe
+        """
+        if n_workers == 1:
+            polarity, subjectivity = self.score_tokens(token_lists)
+        else:
+            polarity, subjectivity = self.score_tokens_parallel(token_lists, chunk_size, n_workers)
+        df["polarity"] = polarity
+        df["subjectivity"] = subjectivity
+        df["sentiment"] = self.label(polarity)
+        return df
+
+
+# LexiconSentiment of a worker process, see score_tokens_parallel
+_worker_sentiment = None
+
+
+def _init_sentiment_worker(lexicon_path):
+    """
+    Process pool initializer. Loads the lexicon once per worker.
+    """
+    global _worker_sentiment
+    _worker_sentiment = LexiconSentiment(lexicon_path)
+
+
+def _score_tokens_chunk(token_lists):
+    """
+    Process pool task. Scores one chunk of preprocessed tweets.
+    """
+    return _worker_sentiment.score_tokens(token_lists)
@@ -0,0 +1,117 @@
+import os
+
+import numpy as np
+from gensim import models
+from gensim.similarities import Similarity
+
+
+class TweetSimilarityIndex:
+    """
+    Sharded on-disk index for finding similar tweets.
+
+    Tweets are indexed as LDA topic vectors when an LDA model is given, otherwise as TF-IDF vectors
+    weighted with the document frequencies of the dictionary. The vectors are kept in gensim Similarity
+    shards of shard_size documents written next to output_prefix, so only one shard at a time is
+    loaded while querying and the index never has to fit in memory.
+
+    >>> index = TweetSimilarityIndex("tweets_mapping.index", mapping_dict, lda_model)
+    >>> index.add_documents(bow, tweet_ids)
+    >>> index.query(new_bow, k=5)
+    [[(1556529119324327936, 0.97), ...], ...]
+    """
+
+    def __init__(self, output_prefix, mapping_dict, lda_model=None, shard_size=32768):
+        self.output_prefix = output_prefix
+        self.mapping_dict = mapping_dict
+        self.lda_model = lda_model
+        if lda_model is None:
+            self.transformation = models.TfidfModel(dictionary=mapping_dict)
+            num_features = len(mapping_dict)
+        else:
+            self.transformation = lda_model
+            num_features = lda_model.num_topics
+        self.index = Similarity(output_prefix, None, num_features=num_features, shardsize=shard_size)
+        # tweet id of every indexed document, in index order
+        self.tweet_ids = []
+
+    def vectorize(self, bow):
+        """
+        Convert bag-of-words vectors into the vectors stored in the index
+
+        :param bow: list of bag-of-words vectors
+
+        :return: dense array of topic distributions, or a list of sparse TF-IDF vectors
+        """
+        if self.lda_model is not None:
+            # one inference call for the whole batch, as in TopicModelling.infer_topics
+            gamma, _ = self.lda_model.inference(bow)
+            return gamma / gamma.sum(axis=1, keepdims=True)
+        return [self.transformation[document] for document in bow]
+
+    def add_documents(self, bow, tweet_ids=None):
+        """
+        Append tweets to the index. Full shards are written to disk as they fill up.
+
+        :param bow: list of bag-of-words vectors
+        :param tweet_ids: ids reported by query for these tweets, defaults to their position in the index
+
+        :return: number of indexed tweets
+        """
+        if tweet_ids is None:
+            tweet_ids = range(len(self.tweet_ids), len(self.tweet_ids) + len(bow))
+        self.index.add_documents(self.vectorize(bow))
+        self.tweet_ids.extend(tweet_ids)
+        return len(self.tweet_ids)
+
+    def query(self, bow, k=10):
+        """
+        Find the k most similar indexed tweets for each tweet in a batch.
+        The whole batch is compared with one shard at a time.
+
+        :param bow: list of bag-of-words vectors
+        :param k: number of results per tweet
+
+        :return: list with a list of (tweet id, cosine similarity) per tweet, most similar first
+        """
+        if not bow:
+            return []
+        self.index.num_best = k
+        vectors = self.vectorize(bow)
+        if isinstance(vectors, np.ndarray):
+            # a one row array would be taken as a single document, sparse rows are always a batch
+            vectors = [list(enumerate(row)) for row in vectors]
+        results = self.index[vectors]
+        return [[(self.tweet_ids[position], float(similarity)) for position, similarity in matches]
+                for matches in results]
+
+    def save(self):
+        """
+        Write the index and the tweet ids next to output_prefix
+
+        :return: True if save succeeded
+        """
+        self.index.save(self.output_prefix)
+        np.save(self.output_prefix + '.ids.npy', np.array(self.tweet_ids))
+        return True
+
+    @classmethod
+    def load(cls, output_prefix, mapping_dict, lda_model=None):
+        """
+        Open an index written by save. Shards stay on disk until they are queried.
+
+        :param output_prefix: the prefix the index was saved with
+        :param mapping_dict: the dictionary the index was built with
+        :param lda_model: the LDA model the index was built with, None for a TF-IDF index
+
+        :return: TweetSimilarityIndex
+        """
+        similarity_index = cls.__new__(cls)
+        similarity_index.output_prefix = output_prefix
+        similarity_index.mapping_dict = mapping_dict
+        similarity_index.lda_model = lda_model
+        similarity_index.transformation = lda_model if lda_model is not None else models.TfidfModel(
+            dictionary=mapping_dict)
+        similarity_index.index = Similarity.load(output_prefix)
+        ids_path = output_prefix + '.ids.npy'
+        similarity_index.tweet_ids = np.load(ids_path).tolist() if os.path.exists(ids_path) else []
+        return similarity_index
@@ -0,0 +1,646 @@
+import json
+import os
+import time
+from collections import Counter, defaultdict, deque
+from functools import partial
+from itertools import islice, product
+
+import numpy as np
+import pandas as pd
+
+from twitter_data_analysis import logger_setup
+from twitter_data_analysis.process_pool import ordered_map
+from twitter_data_analysis.transform_mask import MaskTransformation
+from twitter_data_analysis.preprocessing import TweetsPreprocessing
+
+# gensim, pyLDAvis, matplotlib and wordcloud take seconds to import, so they are imported by the
+# methods which use them
+
+
+class TopicModelling:
+    """
+    A class for performing topic modeling on a collection of tweets.
+
+    This class provides methods for creating a bag of words, dictionary corpus, training LDA models,
+    and visualizing the results. It uses popular libraries such as Gensim and wordcloud
+    for topic modeling and visualization.
+    """
+
+    def __init__(self):
+        # In the event that a mask is available for use as the background of a word cloud
+        self.mask_transformation = MaskTransformation()
+        # (lda_name, mapping_name) -> (file modification times, LDA model, dictionary)
+        self.inference_cache = {}
+        # batch size -> recent inference latencies in seconds
+        self.inference_latencies = defaultdict(lambda: deque(maxlen=1000))
+        # created on the first inference
+        self.preprocessing = None
+
+    def make_dictionary(self, processed_df):
+        """
+        Creating and managing a vocabulary of words from a dataframe. 
+
+        :param processed_df : the tweets dataframe to use to create a mapping.
+        
+        :return mapping: mapping of words in tweets dataframe to integer IDs
+        """
+        from gensim import corpora
+        return corpora.Dictionary(processed_df)
+
+    def save_dictionary(self, mapping_dict, mapping_name):
+        """
+        Saves the dictionary as a file in the current directory.
+
+        :param mapping_dict: the dictionary mapping of ids to words
+        :param mapping_name: the file name of the dictionary
+
+        :return boolean: True if saved succeeded, False otherwise
+        """
+        mapping_dict.save(mapping_name+'.dict')
+
+        return True
+    
+    def load_dictionary(self, filename):
+        """
+        Load the dictionary from a local file in the current directory.
+
+        :param filename: the name of file containing the dictionary
+
+        :return dictionary: a mapping of words to integer IDs
+        """
+        from gensim import corpora
+        dictionary = corpora.Dictionary.load(filename+r'.dict')
+        return dictionary
+    
+    @logger_setup.timed("topic_modelling.create_bow")
+    def create_bow(self, tweet_list, mapping_dict):
+        """
+        Converts a list of words into a bag-of-words(bow). Essentially representing text data as a numerical vector. 
+        
+        bow is a sparse vector that contains the number of times each word in the list
+        appears in the document.
+
+        word ID is the integer ID of the word in the vocabulary
+        word count is the number of times the word appears in the document.
+
+        :param mapping_dict: mapping dictionary created by Corpora library
+        :param tweet_list: the tweets list to use to create a mapping
+
+        :return: list of tuples (word ID, word count)
+        """
+        return [mapping_dict.doc2bow(tweet) for tweet in tweet_list]
+
+    def serialize_bow(self, bow_name, bow):
+        """
+        :param bow_name: file name of the bag-of-words(bow).
+        :param bow: bag-of-words(bow)
+
+        :return: True if file is saved, false otherwise
+        """
+        from gensim import corpora
+        corpora.MmCorpus.serialize(bow_name+'.mm', bow)
+        return True
+    
+    def load_bow(self, filename):
+        """
+        Load the dictionary as a file in the current directory.
+
+        :param filename: the name of the file to load the dictionary object
+
+        :return bag_of_words: the vector of words
+        """
+        from gensim import corpora
+        bow_corpus = corpora.MmCorpus(filename+r'.mm')
+        return bow_corpus
+    
+    @logger_setup.timed("topic_modelling.train_lda")
+    def create_lda_model(self, bow, mapping_dict, no_of_topics=50, no_of_passes=10, no_of_iterations=50, alpha_level=0.001):
+        """
+        LDA model learns shared topics across the tweet corpus.
+        
+        The low number for alpha corresponds to a low number of topics per tweet,
+        since tweets are relatively very short
+
+        For the number of topics, 50 seems to be a good compromise between optimizing accuracy and interpretability.
+        Increasing the number of topics, decreases the log perplexity (an error metric)
+        which makes it more difficult to interpret the data. 
+        
+        :param bow: the bag-of-words(bow) vector
+        :param mapping_dict: a dictionary mapping of ids to word
+
+        :return: Numpy array of the variational bound score calculated for each document.
+        """
+        from gensim import models
+        return models.LdaMulticore(bow, id2word=mapping_dict, num_topics=no_of_topics, passes=no_of_passes,
+                                   iterations=no_of_iterations, alpha=alpha_level)
+
+    def save_lda_model(self, lda_model, lda_name):
+        """
+        Save LDA model
+        
+        :param lda_model: the LDA model
+        :param lda_name: the name of the file
+
+        :return: True if save succeeded, otherwise False
+        """
+        from gensim.utils import SaveLoad
+        SaveLoad.save(lda_model, lda_name)
+        return True
+
+    def load_lda_model(self, filename):
+        """
+        Load LDA model from file
+        
+        :param filename: the name of the file in the current directory
+
+        :return: the LDA model
+        """
+        from gensim.utils import SaveLoad
+        lda_model = SaveLoad.load(filename)
+        return lda_model
+
+    def expand_lda_vocabulary(self, lda_model, mapping_dict):
+        """
+        Grow a trained LDA model to the size of a dictionary which has gained new words.
+        New words start with no topic statistics and the model's mean topic-word prior.
+
+        :param lda_model: the LDA model
+        :param mapping_dict: the grown dictionary mapping of ids to words
+
+        :return: number of words added to the model
+        """
+        new_terms = len(mapping_dict) - lda_model.num_terms
+        if new_terms > 0:
+            sstats = lda_model.state.sstats
+            lda_model.state.sstats = np.hstack(
+                [sstats, np.zeros((sstats.shape[0], new_terms), dtype=sstats.dtype)])
+            eta = lda_model.eta
+            if eta.ndim == 1:
+                new_eta = np.full(new_terms, eta.mean(), dtype=eta.dtype)
+            else:
+                new_eta = np.repeat(eta.mean(axis=1, keepdims=True), new_terms, axis=1).astype(eta.dtype)
+            lda_model.eta = np.concatenate([eta, new_eta], axis=-1)
+            lda_model.state.eta = lda_model.eta
+            lda_model.num_terms = len(mapping_dict)
+            lda_model.sync_state()
+        lda_model.id2word = mapping_dict
+        return max(new_terms, 0)
+
+    def topic_drift(self, topics_before, topics_after):
+        """
+        Mean Hellinger distance between each topic and the same topic after an update.
+        Words added by the update are left out so both distributions cover the same vocabulary.
+
+        :param topics_before: topic-word matrix before the update, see LdaModel.get_topics()
+        :param topics_after: topic-word matrix after the update
+
+        :return: value between 0 (unchanged) and 1
+        """
+        after = topics_after[:, :topics_before.shape[1]]
+        after = after / after.sum(axis=1, keepdims=True)
+        distances = np.sqrt(0.5 * ((np.sqrt(topics_before) - np.sqrt(after)) ** 2).sum(axis=1))
+        return float(distances.mean())
+
+    def update_lda_model(self, lda_name, mapping_name, tweet_list, chunk_size=2000, checkpoint=True):
+        """
+        Train a saved LDA model on new tweets only, instead of retraining on the whole history.
+
+        The saved dictionary grows with the new words, the model is grown to match and then updated
+        one chunk of tweets at a time. After every chunk the model and dictionary are checkpointed and
+        a record of the chunk is appended to <lda_name>.updates.jsonl: its perplexity before the update
+        (held-out), the topic drift caused by the update and the time taken.
+
+        :param lda_name: the file name of the saved LDA model
+        :param mapping_name: the file name of the saved dictionary, without '.dict'
+        :param tweet_list: iterable of preprocessed tweets (lists of words) not seen by the model
+        :param chunk_size: number of tweets per update
+        :param checkpoint: save the model and dictionary after every chunk
+
+        :return: the updated LDA model and the list of chunk records
+
+        >>> update_lda_model("lda_tweets", "tweets_mapping", todays_words_list)
+        (<gensim.models.ldamulticore.LdaMulticore object>, [{'documents': 2000, 'new_words': 412, ...}])
+        """
+        lda_model = self.load_lda_model(lda_name)
+        mapping_dict = self.load_dictionary(mapping_name)
+        tweets = iter(tweet_list)
+        records = []
+        while True:
+            chunk = list(islice(tweets, chunk_size))
+            if not chunk:
+                break
+            start = time.perf_counter()
+            mapping_dict.add_documents(chunk)
+            new_words = self.expand_lda_vocabulary(lda_model, mapping_dict)
+            bow = self.create_bow(chunk, mapping_dict)
+            held_out_bound = lda_model.log_perplexity(bow)
+            topics_before = lda_model.get_topics()
+            with logger_setup.timed("topic_modelling.update_lda"):
+                lda_model.update(bow)
+            record = {"documents": len(chunk), "new_words": new_words, "vocabulary": len(mapping_dict),
+                      "log_perplexity": float(held_out_bound), "perplexity": float(np.exp2(-held_out_bound)),
+                      "topic_drift": self.topic_drift(topics_before, lda_model.get_topics()),
+                      "seconds": time.perf_counter() - start}
+            records.append(record)
+            if checkpoint:
+                self.save_lda_model(lda_model, lda_name)
+                self.save_dictionary(mapping_dict, mapping_name)
+                with open(lda_name + '.updates.jsonl', 'a') as updates_file:
+                    updates_file.write(json.dumps(record) + "\n")
+        return lda_model, records
+
+    def compare_with_retrain(self, lda_model, tweet_list, mapping_dict, no_of_passes=10, no_of_iterations=50,
+                             alpha_level=0.001):
+        """
+        Train a model from scratch on all tweets and compare it with an incrementally updated one.
+
+        :param lda_model: the incrementally updated LDA model
+        :param tweet_list: all preprocessed tweets, old and new
+        :param mapping_dict: the dictionary of the updated model
+
+        :return: dictionary with the perplexity of both models on all tweets, the mean Hellinger distance
+                 from each updated topic to its closest retrained topic and the retraining time
+        """
+        bow = self.create_bow(tweet_list, mapping_dict)
+        start = time.perf_counter()
+        retrained = self.create_lda_model(bow, mapping_dict, lda_model.num_topics, no_of_passes,
+                                          no_of_iterations, alpha_level)
+        retrain_seconds = time.perf_counter() - start
+        distances, _ = lda_model.diff(retrained, distance='hellinger', annotation=False)
+        incremental_bound = lda_model.log_perplexity(bow)
+        retrain_bound = retrained.log_perplexity(bow)
+        return {"incremental_perplexity": float(np.exp2(-incremental_bound)),
+                "retrain_perplexity": float(np.exp2(-retrain_bound)),
+                "topic_drift": float(distances.min(axis=1).mean()),
+                "retrain_seconds": retrain_seconds}
+
+    def model_analysis(self, lda_model, bow, tweet_list, mapping_dict):
+        """
+        Calculates Perplexity, Coherence Score and prints out topics
+
+        :param lda_model: the LDA model
+        :param bow: the bag-of-words(bow) the model was trained on
+        :param tweet_list: the preprocessed tweets (lists of words) behind the bow
+        :param mapping_dict: a dictionary mapping of ids to word
+
+        :return: dictionary with the log perplexity and the c_v coherence of the model
+        """
+        #It's a measure of how good the model is. The lower the better. Perplexity is a negative value
+        log_perplexity = lda_model.log_perplexity(bow)
+        print('\nPerplexity: ', log_perplexity)
+
+        for topic in lda_model.print_topics():
+            print(topic)
+
+        from gensim.models import CoherenceModel
+        coherence_model_lda = CoherenceModel(model=lda_model, texts=tweet_list, dictionary=mapping_dict, coherence='c_v')
+        coherence_lda = coherence_model_lda.get_coherence()
+        print('\n Ldamodel Coherence Score/Accuracy on Tweets: ', coherence_lda)
+        return {"log_perplexity": log_perplexity, "c_v": coherence_lda}
+
+    def sweep_lda_models(self, bow, tweet_list, mapping_dict, topic_counts=(10, 20, 30, 40, 50, 60),
+                         alpha_levels=(0.001, 0.01, 'symmetric'), pass_counts=(10,), no_of_iterations=50,
+                         n_workers=None, coherence_processes=1, patience=2, min_improvement=0.005,
+                         random_state=42):
+        """
+        Train candidate LDA models over a grid of topic counts, alphas and passes on a process pool
+        and score each of them.
+
+        Every worker receives the corpus once, then trains one candidate per task and computes its log
+        perplexity, c_v coherence (with coherence_processes processes) and u_mass coherence.
+        Candidates are submitted in increasing number of topics, at most n_workers at a time. When the
+        best c_v of a topic count has not improved on the best so far by min_improvement for patience
+        topic counts in a row, the remaining candidates are never submitted.
+
+        :param bow: the bag-of-words(bow) vector
+        :param tweet_list: the preprocessed tweets (lists of words) behind the bow
+        :param mapping_dict: a dictionary mapping of ids to word
+        :param topic_counts: numbers of topics to try
+        :param alpha_levels: document-topic priors to try
+        :param pass_counts: numbers of passes to try
+        :param no_of_iterations: iterations per document
+        :param n_workers: number of worker processes, defaults to the number of CPUs
+        :param coherence_processes: processes used by each c_v calculation
+        :param patience: topic counts without improvement before stopping, None never stops early
+        :param min_improvement: smallest c_v gain counted as an improvement
+        :param random_state: seed shared by all candidates
+
+        :return: dataframe of candidates ranked by c_v coherence, with the wall-clock seconds of each
+        :raises ValueError: when the grid has no candidates
+
+        >>> sweep_lda_models(bow, words_list, mapping_dict, topic_counts=range(10, 101, 10))
+           num_topics  alpha  passes  log_perplexity  perplexity    c_v  u_mass  seconds
+        0          40  0.001      10           -8.41      340.12  0.512   -3.02    41.7
+        ...
+        """
+        n_workers = n_workers or os.cpu_count() or 1
+        topic_counts = sorted(topic_counts)
+        grid = list(product(alpha_levels, pass_counts))
+        if not topic_counts or not grid:
+            raise ValueError("topic_counts, alpha_levels and pass_counts must not be empty")
+        candidates = ((num_topics, alpha, passes) for num_topics in topic_counts for alpha, passes in grid)
+        results = []
+        round_results = []
+        best_c_v = None
+        rounds_without_improvement = 0
+        # candidates are submitted one at a time, so stopping early skips every candidate not yet trained
+        sweep = ordered_map(partial(_train_sweep_candidate, iterations=no_of_iterations, random_state=random_state),
+                            candidates, n_workers, _init_sweep_worker,
+                            (bow, tweet_list, mapping_dict, coherence_processes), max_in_flight=n_workers)
+        for result in sweep:
+            # results arrive in submission order, so the topic counts complete one after the other
+            round_results.append(result)
+            if len(round_results) < len(grid):
+                continue
+            results.extend(round_results)
+            round_best = max(result["c_v"] for result in round_results)
+            round_results = []
+            if best_c_v is None or round_best >= best_c_v + min_improvement:
+                rounds_without_improvement = 0
+            else:
+                rounds_without_improvement += 1
+            best_c_v = round_best if best_c_v is None else max(best_c_v, round_best)
+            if patience is not None and rounds_without_improvement >= patience:
+                # coherence has plateaued, only the candidates already running are left to finish
+                sweep.close()
+                break
+
+        results_df = pd.DataFrame(results)
+        return results_df.sort_values("c_v", ascending=False, ignore_index=True)
+
+    def get_inference_model(self, lda_name, mapping_name):
+        """
+        Fetch a saved LDA model and dictionary from the inference cache.
+        They are loaded again only when either file has been modified since it was cached.
+
+        :param lda_name: the file name of the saved LDA model
+        :param mapping_name: the file name of the saved dictionary, without '.dict'
+
+        :return: the LDA model and the dictionary
+        """
+        key = (lda_name, mapping_name)
+        mtimes = (os.path.getmtime(lda_name), os.path.getmtime(mapping_name + '.dict'))
+        cached = self.inference_cache.get(key)
+        if cached is None or cached[0] != mtimes:
+            cached = (mtimes, self.load_lda_model(lda_name), self.load_dictionary(mapping_name))
+            self.inference_cache[key] = cached
+        return cached[1], cached[2]
+
+    def infer_topics(self, tweets, lda_name, mapping_name, fused=False):
+        """
+        Topic distributions for a batch of raw tweets.
+
+        The tweets are preprocessed as one batch, converted with doc2bow and the whole batch is passed
+        to a single LdaModel.inference call. Each row of the variational parameters is normalized, which
+        is what lda_model[bow] returns one document at a time.
+        The latency of every call is recorded per batch size, see inference_latency_report.
+
+        :param tweets: list of tweet texts
+        :param lda_name: the file name of the saved LDA model
+        :param mapping_name: the file name of the saved dictionary, without '.dict'
+        :param fused: use the fused normalizer, see TweetsPreprocessing.preprocess_tweets_batch. It must
+                      match the preprocessing of the training tweets, otherwise the vocabularies differ
+
+        :return: dense array of shape (number of tweets, number of topics)
+
+        >>> infer_topics(["#Taiwan drills continue"], "lda_tweets", "tweets_mapping")
+        array([[0.0001, 0.0001, 0.9312, ...]], dtype=float32)
+        """
+        start = time.perf_counter()
+        lda_model, mapping_dict = self.get_inference_model(lda_name, mapping_name)
+        if self.preprocessing is None:
+            self.preprocessing = TweetsPreprocessing()
+        token_lists = self.preprocessing.preprocess_tweets_batch(tweets, fused)
+        bow = [mapping_dict.doc2bow(tokens) for tokens in token_lists]
+        if not bow:
+            return np.zeros((0, lda_model.num_topics), dtype=lda_model.dtype)
+        gamma, _ = lda_model.inference(bow)
+        doc_topics = gamma / gamma.sum(axis=1, keepdims=True)
+        self.inference_latencies[len(bow)].append(time.perf_counter() - start)
+        return doc_topics
+
+    def inference_latency_report(self):
+        """
+        Latency percentiles of the recent infer_topics calls, per batch size
+
+        :return: dataframe with the batch size, number of calls, p50 and p99 in milliseconds and tweets/sec
+
+        >>> inference_latency_report()
+           batch_size  calls  p50_ms  p99_ms  tweets_per_sec
+        0           1    200    1.21    2.80          826.4
+        1          64    200    9.75   14.02         6564.1
+        """
+        rows = []
+        for batch_size, latencies in sorted(self.inference_latencies.items()):
+            latencies = np.array(latencies)
+            p50, p99 = np.percentile(latencies, [50, 99])
+            rows.append({"batch_size": batch_size, "calls": len(latencies), "p50_ms": p50 * 1000,
+                         "p99_ms": p99 * 1000, "tweets_per_sec": batch_size / p50})
+        return pd.DataFrame(rows, columns=["batch_size", "calls", "p50_ms", "p99_ms", "tweets_per_sec"])
+
+    def create_similarity_index(self, bow, tweet_ids, mapping_name, lda_name=None, shard_size=32768):
+        """
+        Build a "find similar tweets" index and save it next to the saved dictionary and model.
+        Tweets are indexed by topic distribution when lda_name is given, otherwise by TF-IDF.
+
+        :param bow: bag-of-words vectors of the tweets, any iterable including an MmCorpus
+        :param tweet_ids: id of each tweet, in the same order
+        :param mapping_name: the file name of the saved dictionary, without '.dict'
+        :param lda_name: the file name of the saved LDA model
+        :param shard_size: number of tweets per on-disk shard
+
+        :return: TweetSimilarityIndex saved as <lda_name or mapping_name>.index
+        """
+        from twitter_data_analysis.similarity_index import TweetSimilarityIndex
+        mapping_dict = self.load_dictionary(mapping_name)
+        lda_model = self.load_lda_model(lda_name) if lda_name is not None else None
+        similarity_index = TweetSimilarityIndex((lda_name or mapping_name) + '.index', mapping_dict, lda_model,
+                                                shard_size)
+        bow_iter, ids_iter = iter(bow), iter(tweet_ids)
+        while True:
+            # add in shard sized batches so only one batch of vectors is in memory
+            bow_batch = list(islice(bow_iter, shard_size))
+            if not bow_batch:
+                break
+            similarity_index.add_documents(bow_batch, list(islice(ids_iter, len(bow_batch))))
+        similarity_index.save()
+        return similarity_index
+
+    def load_similarity_index(self, mapping_name, lda_name=None):
+        """
+        Open an index written by create_similarity_index
+
+        :param mapping_name: the file name of the saved dictionary, without '.dict'
+        :param lda_name: the file name of the saved LDA model, None for a TF-IDF index
+
+        :return: TweetSimilarityIndex
+        """
+        from twitter_data_analysis.similarity_index import TweetSimilarityIndex
+        mapping_dict = self.load_dictionary(mapping_name)
+        lda_model = self.load_lda_model(lda_name) if lda_name is not None else None
+        return TweetSimilarityIndex.load((lda_name or mapping_name) + '.index', mapping_dict, lda_model)
+
+    def visualize_lda_results(self, lda_model, tweet_corpus, mapping_dict):
+        """
+        Produce an interactive visualization.
+
+        :param lda_model: the LDA model
+        :param tweet_corpus: the bow
+        :param mapping_dict: the mapping of words to integer IDs
+
+        :return: an interactive plot of the topics in the tweets data
+        """
+        import pyLDAvis.gensim
+        ldaViz = pyLDAvis.gensim.prepare(lda_model, tweet_corpus, mapping_dict)
+        return ldaViz
+
+    def word_frequencies(self, tweet_list=None, bow=None, mapping_dict=None):
+        """
+        Count how often each word occurs, without building one large string.
+
+        Counts come from the first source given: the preprocessed tweets, the bag-of-words with its
+        dictionary, or the collection frequencies stored in the dictionary itself (no pass over the data).
+        The result is a Counter, so tables of separate batches are merged with + or update().
+
+        :param tweet_list: the list of words in tweets
+        :param bow: bag-of-words vectors, needs mapping_dict
+        :param mapping_dict: a dictionary mapping of ids to word
+
+        :return: Counter of word frequencies
+
+        >>> word_frequencies(mapping_dict=mapping_dict) + word_frequencies(tweet_list=todays_words_list)
+        Counter({'#taiwan': 10398, 'china': 6120, ...})
+        """
+        frequencies = Counter()
+        if tweet_list is not None:
+            for tweet in tweet_list:
+                frequencies.update(tweet)
+        elif bow is not None:
+            id_counts = Counter()
+            for document in bow:
+                for word_id, count in document:
+                    id_counts[word_id] += count
+            frequencies.update({mapping_dict[word_id]: int(count) for word_id, count in id_counts.items()})
+        else:
+            frequencies.update({mapping_dict[word_id]: count for word_id, count in mapping_dict.cfs.items()})
+        # the per-word pipeline leaves empty strings for removed words
+        frequencies.pop('', None)
+        return frequencies
+
+    def save_word_frequencies(self, frequencies, frequencies_name):
+        """
+        Save a word frequency table as JSON so word clouds can be redrawn without the tweets
+
+        :param frequencies: Counter of word frequencies
+        :param frequencies_name: the file name, without '.json'
+
+        :return: True if save succeeded
+        """
+        with open(frequencies_name + '.json', 'w', encoding='utf-8') as frequencies_file:
+            json.dump(frequencies, frequencies_file)
+        return True
+
+    def load_word_frequencies(self, frequencies_name):
+        """
+        Load a word frequency table saved by save_word_frequencies
+
+        :param frequencies_name: the file name, without '.json'
+
+        :return: Counter of word frequencies
+        """
+        with open(frequencies_name + '.json', encoding='utf-8') as frequencies_file:
+            return Counter(json.load(frequencies_file))
+
+    def render_word_cloud(self, frequencies, output_path, width=400, height=400, scale=2, max_words=200,
+                          background_color='black', mask=None):
+        """
+        Draw a word cloud from a frequency table straight to an image file.
+        Only PIL is used, so no display or matplotlib figure is needed (batch jobs, dashboard).
+        Words are laid out on a width x height canvas and drawn scale times larger, which keeps the
+        layout cheap at high output resolutions.
+
+        :param frequencies: Counter or dictionary of word frequencies
+        :param output_path: image file to write e.g. 'word_cloud.png'
+        :param width: canvas width in pixels
+        :param height: canvas height in pixels
+        :param scale: multiplier applied to the canvas size in the output image
+        :param max_words: maximum number of words drawn
+        :param background_color: colour behind the words
+        :param mask: array of the mask image, white (255) areas are left empty
+
+        :return: the word cloud
+        """
+        from wordcloud import WordCloud
+        topic_cloud = WordCloud(width=width, height=height, scale=scale, max_words=max_words, max_font_size=100,
+                                background_color=background_color, mask=mask, contour_width=2 if mask is not None else 0,
+                                contour_color='steelblue').generate_from_frequencies(frequencies)
+        topic_cloud.to_file(output_path)
+        return topic_cloud
+
+    def create_word_cloud(self,tweet_list, image_path="", output_path=None):
+        """
+        Create word cloud of tweets.
+        
+        In order to create a shape for your word cloud, first, you need to find a PNG file to become the mask
+        This PNG file is located in the folder path.
+
+        :param tweet_list: the list of words in tweets
+        :param image_path: path to the PNG mask, e.g. 'res/twitter.png'. Empty for a rectangular cloud
+        :param output_path: write the word cloud to this image file instead of showing it
+
+        :return: the word cloud of tweets
+        """
+        from wordcloud import WordCloud
+        frequencies = self.word_frequencies(tweet_list=tweet_list)
+        transformed_mask = self.mask_transformation.load_mask(image_path) if len(image_path) > 0 else None
+        if output_path is not None:
+            return self.render_word_cloud(frequencies, output_path, mask=transformed_mask)
+
+        if transformed_mask is not None:
+            topic_cloud = WordCloud(max_font_size=100, scale=8, background_color = 'white', mask = transformed_mask,
+                                    contour_width = 2, contour_color = 'steelblue').generate_from_frequencies(frequencies)
+        else:
+            topic_cloud = WordCloud(max_font_size=100, scale=8, background_color = 'black', contour_width = 2,
+     contour_color = 'steelblue').generate_from_frequencies(frequencies)
+
+        import matplotlib.pyplot as plt
+        fig = plt.figure(figsize=(10, 10))
+        plt.imshow(topic_cloud)
+        plt.axis("off")
+        plt.show()
+        return topic_cloud
+
+
+# Per-process corpus for TopicModelling.sweep_lda_models
+_sweep_state = {}
+
+
+def _init_sweep_worker(bow, tweet_list, mapping_dict, coherence_processes):
+    """
+    Process pool initializer. Receives the corpus once per worker.
+    """
+    _sweep_state.update(bow=bow, tweet_list=tweet_list, mapping_dict=mapping_dict,
+                        coherence_processes=coherence_processes)
+
+
+def _train_sweep_candidate(candidate, iterations, random_state):
+    """
+    Process pool task. Trains and scores one candidate LDA model.
+
+    :param candidate: tuple of (number of topics, alpha, passes)
+    """
+    num_topics, alpha, passes = candidate
+    from gensim import models
+    from gensim.models import CoherenceModel
+    start = time.perf_counter()
+    bow, mapping_dict = _sweep_state["bow"], _sweep_state["mapping_dict"]
+    lda_model = models.LdaModel(bow, id2word=mapping_dict, num_topics=num_topics, passes=passes,
+                                iterations=iterations, alpha=alpha, random_state=random_state)
+    log_perplexity = lda_model.log_perplexity(bow)
+    c_v = CoherenceModel(model=lda_model, texts=_sweep_state["tweet_list"], dictionary=mapping_dict,
+                         coherence='c_v', processes=_sweep_state["coherence_processes"]).get_coherence()
+    u_mass = CoherenceModel(model=lda_model, corpus=bow, dictionary=mapping_dict,
+                            coherence='u_mass').get_coherence()
+    return {"num_topics": num_topics, "alpha": alpha, "passes": passes, "log_perplexity": log_perplexity,
+            "perplexity": float(np.exp2(-log_perplexity)), "c_v": c_v, "u_mass": u_mass,
+            "seconds": time.perf_counter() - start}
@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+
+class MaskTransformation:
+    """
+    A class which transforms a given image mask.
+
+    The mask is then transformed into an appropriate mask.
+
+    The way the masking functions works is that it requires all white part of the mask should be 255 not 0 (integer type). This value represents the "intensity" of the pixel. Values of 255 are pure white, whereas values of 1 are black. Here, you can use the provided function below to transform your mask if your mask has the same format as above. Notice if you have a mask that the background is not 0, but 1 or 2, set the threshold to match your mask.
+    """
+    def __init__(self):
+        # (absolute image path, threshold) -> (modification time, transformed mask)
+        self.mask_cache = {}
+
+    def transform_values(self, val):
+        """
+        This function swaps number 0 to 255.
+
+        :param val: list
+
+        :return: list of modified values
+        """
+        for v in range(len(val)):
+            if val[v] == 0:
+                val[v]= 255
+
+        return val
+
+    def transform_mask_per_pixel(self, mask):
+        """
+        Original pixel by pixel transformation, kept as a reference for transform_mask.
+
+        :param mask: a matrix containing values of the image mask
+
+        :return: transformed matrix of values
+        """
+        transformed_mask = np.ndarray((mask.shape[0], mask.shape[1]), object)
+
+        for i in range(len(mask)):
+            transformed_mask[i] = list(map(self.transform_values, mask[i]))
+
+        return transformed_mask
+
+    def transform_mask(self, mask, threshold=0):
+        """
+        Transform the mask into a new one that will work with the function.
+        Every value at or below threshold becomes 255, in one vectorized operation.
+
+        :param mask: a matrix containing values of the image mask, 2D or with colour channels
+        :param threshold: highest value treated as background, e.g. 2 if the background is 1 or 2
+
+        :return: uint8 matrix of values with the same shape as mask
+
+        >>> transform_mask(np.array([[0, 1, 200], [2, 0, 255]]), threshold=1)
+        array([[255, 255, 200],
+               [  2, 255, 255]], dtype=uint8)
+        """
+        mask = np.asarray(mask)
+        return np.where(mask <= threshold, 255, mask).astype(np.uint8)
+
+    def load_mask(self, image_path, threshold=0):
+        """
+        Read an image and transform it into a word cloud mask.
+        Results are cached until the image file is modified.
+
+        :param image_path: path to the mask image e.g. 'res/twitter.png'
+        :param threshold: highest value treated as background, see transform_mask
+
+        :return: uint8 matrix of values
+        """
+        key = (os.path.abspath(image_path), threshold)
+        mtime = os.path.getmtime(image_path)
+        cached = self.mask_cache.get(key)
+        if cached is None or cached[0] != mtime:
+            from PIL import Image
+            with Image.open(image_path) as image:
+                mask = self.transform_mask(np.array(image), threshold)
+            # the cached array is shared, so it must not be modified by callers
+            mask.setflags(write=False)
+            cached = (mtime, mask)
+            self.mask_cache[key] = cached
+        return cached[1]
@@ -0,0 +1,163 @@
+from collections import Counter
+from datetime import datetime
+
+import pandas as pd
+
+from twitter_data_analysis.tweet_loader import iter_json_lines
+
+# pandas resample frequency of every timeline bucket
+BUCKET_FREQUENCIES = {"minute": "min", "hour": "h", "day": "D"}
+# created_at string truncated to the minute, see TweetAggregates.from_file
+MINUTE_FORMAT = "%a %b %d %H:%M %z %Y"
+
+
+class TweetAggregates:
+    """
+    Pre-aggregated tweet counts for the dashboard: tweets per minute, hashtag counts and mention counts.
+
+    Counts are computed once, either on the server with MongoDB $group pipelines or in one pass over
+    a JSON lines file. Hour and day buckets are rolled up from the minute counts, so the result stays
+    a few thousand rows however many tweets the source holds and can be cached and re-plotted cheaply.
+
+    >>> aggregates = TweetAggregates.from_file("./data/global_twitter_data.json")
+    >>> aggregates.timeline("hour")
+                     created_at  tweet_count
+    0 2022-08-08 07:00:00+00:00         1021
+    ...
+    """
+
+    def __init__(self, minute_counts, hashtag_counts, mention_counts):
+        # tweets per minute, indexed by the UTC start of the minute
+        self.minute_counts = minute_counts
+        # occurrences of every hashtag (lower case) and mentioned screen name, most frequent first
+        self.hashtag_counts = hashtag_counts
+        self.mention_counts = mention_counts
+
+    @staticmethod
+    def counts_to_series(counts, name):
+        """
+        Sort a mapping of value -> count into a series, most frequent first and ties by value
+
+        :param counts: dictionary or Counter
+        :param name: name of the series index
+
+        :return: series of int64 counts
+        """
+        items = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        return pd.Series([count for _, count in items], index=pd.Index([value for value, _ in items], name=name),
+                         dtype="int64", name="count")
+
+    @staticmethod
+    def minutes_to_series(minute_counts, date_format=None):
+        """
+        Convert a mapping of minute -> count into a time ordered series
+
+        :param minute_counts: dictionary with datetimes or formatted strings as keys
+        :param date_format: format of the keys if they are strings
+
+        :return: series of int64 counts with a UTC DatetimeIndex
+        """
+        index = pd.to_datetime(list(minute_counts.keys()), format=date_format, utc=True)
+        series = pd.Series(list(minute_counts.values()), index=index, dtype="int64", name="tweet_count")
+        series.index.name = "created_at"
+        # the same minute may appear twice when keys had different utc offsets
+        return series.groupby(level=0).sum().sort_index()
+
+    @classmethod
+    def from_file(cls, file_path, chunk_size=10000):
+        """
+        Count the tweets of a JSON lines file in one pass, without building a dataframe of tweets
+
+        :param file_path: path to the JSON lines file
+        :param chunk_size: number of tweets decoded at a time
+
+        :return: TweetAggregates
+        """
+        minute_counts = Counter()
+        hashtag_counts = Counter()
+        mention_counts = Counter()
+        for chunk in iter_json_lines(file_path, chunk_size):
+            for tweet in chunk:
+                created_at = tweet.get("created_at")
+                if isinstance(created_at, str):
+                    # 'Mon Aug 08 07:40:53 +0000 2022' -> 'Mon Aug 08 07:40 +0000 2022', the distinct minutes
+                    # are parsed once at the end instead of parsing a date per tweet
+                    minute_counts[created_at[:16] + created_at[19:]] += 1
+                elif isinstance(created_at, datetime):
+                    minute_counts[created_at.replace(second=0, microsecond=0).strftime(MINUTE_FORMAT)] += 1
+                entities = tweet.get("entities") or {}
+                hashtag_counts.update(hashtag["text"].lower() for hashtag in entities.get("hashtags") or ())
+                mention_counts.update(mention["screen_name"] for mention in entities.get("user_mentions") or ())
+        return cls(cls.minutes_to_series(minute_counts, MINUTE_FORMAT),
+                   cls.counts_to_series(hashtag_counts, "hashtag"),
+                   cls.counts_to_series(mention_counts, "screen_name"))
+
+    @classmethod
+    def from_collection(cls, reader, database_name, collection_name, query=None, top_n=1000):
+        """
+        Count the tweets of a MongoDB collection with $group pipelines. Only the counts leave the server.
+
+        :param reader: ReadDocs connected to the cluster
+        :param database_name: The name of the database
+        :param collection_name: The name of the collection
+        :param query: MongoDB filter, see ReadDocs.build_tweets_query
+        :param top_n: number of hashtags and mentions to keep
+
+        :return: TweetAggregates
+
+        >>> TweetAggregates.from_collection(ReadDocs(uri), "tweets", "global", top_n=100)
+        """
+        match = [{"$match": query}] if query else []
+        # created_at is stored as a UTC datetime by UploadDocs.tweet_to_document
+        minutes = reader.aggregate_tweets(database_name, collection_name, match + [
+            {"$group": {"_id": {"$dateToString": {"format": "%Y-%m-%dT%H:%M", "date": "$created_at"}},
+                        "count": {"$sum": 1}}},
+        ])
+        minute_counts = {row["_id"]: row["count"] for row in minutes if row["_id"] is not None}
+
+        def top_values(array_field, value_expression):
+            rows = reader.aggregate_tweets(database_name, collection_name, match + [
+                {"$project": {array_field: 1}},
+                {"$unwind": "$" + array_field},
+                {"$group": {"_id": value_expression, "count": {"$sum": 1}}},
+                {"$sort": {"count": -1, "_id": 1}},
+                {"$limit": top_n},
+            ])
+            return {row["_id"]: row["count"] for row in rows if row["_id"] is not None}
+
+        hashtag_counts = top_values("entities.hashtags", {"$toLower": "$entities.hashtags.text"})
+        mention_counts = top_values("entities.user_mentions", "$entities.user_mentions.screen_name")
+        return cls(cls.minutes_to_series(minute_counts, "%Y-%m-%dT%H:%M"),
+                   cls.counts_to_series(hashtag_counts, "hashtag"),
+                   cls.counts_to_series(mention_counts, "screen_name"))
+
+    def timeline(self, bucket="hour"):
+        """
+        Tweets per time bucket, ready for st.bar_chart(x="created_at", y="tweet_count")
+
+        :param bucket: 'minute', 'hour' or 'day'
+
+        :return: dataframe with created_at and tweet_count columns. Empty buckets are included
+        """
+        if bucket not in BUCKET_FREQUENCIES:
+            raise ValueError(f"Unknown bucket {bucket}, expected one of {list(BUCKET_FREQUENCIES)}")
+        counts = self.minute_counts
+        if len(counts):
+            counts = counts.resample(BUCKET_FREQUENCIES[bucket]).sum()
+        return counts.reset_index()
+
+    def top_hashtags(self, n=10):
+        """
+        :param n: number of hashtags
+
+        :return: dataframe with hashtag and count columns, most frequent first
+        """
+        return self.hashtag_counts.head(n).reset_index()
+
+    def top_mentions(self, n=10):
+        """
+        :param n: number of screen names
+
+        :return: dataframe with screen_name and count columns, most frequent first
+        """
+        return self.mention_counts.head(n).reset_index()
@@ -0,0 +1,132 @@
+import json
+import os
+from itertools import islice
+
+from gensim import corpora
+
+from twitter_data_analysis.preprocessing import TweetsPreprocessing
+from twitter_data_analysis.tweet_loader import get_field, iter_json_lines
+
+
+class TweetCorpus:
+    """
+    Streamed bag-of-words corpus of tweets.
+
+    Tweets are read lazily from a JSON lines file or from a function returning documents
+    (e.g. a ReadDocs cursor), preprocessed one window of chunk_size tweets at a time and
+    converted with doc2bow. Iterating the corpus starts again from the source, so it can be passed
+    straight to corpora.Dictionary, MmCorpus.serialize or an LDA model without building lists.
+
+    >>> corpus = TweetCorpus("./data/global_twitter_data.json")
+    >>> mapping_dict = corpus.build_dictionary()
+    >>> corpus.serialize("tweets_bow")
+    """
+
+    def __init__(self, source, text_field="full_text", mapping_dict=None, preprocessing=None, chunk_size=1000,
+                 fused=True, tokens_path=None):
+        # JSON lines file path, or a function returning an iterable of tweet documents
+        self.source = source
+        # dotted path of the tweet text in a document
+        self.text_path = tuple(text_field.split("."))
+        self.mapping_dict = mapping_dict
+        self.preprocessing = preprocessing if preprocessing is not None else TweetsPreprocessing()
+        # number of tweets preprocessed and held in memory at a time
+        self.chunk_size = chunk_size
+        # use the fused normalizer, see TweetsPreprocessing.preprocess_tweets_batch
+        self.fused = fused
+        # optional JSON lines file where preprocessed tweets are kept after the first pass
+        self.tokens_path = tokens_path
+
+    def iter_documents(self):
+        """
+        Read the tweet documents from the source
+
+        :return: generator of dictionaries
+        """
+        if isinstance(self.source, str):
+            for chunk in iter_json_lines(self.source, self.chunk_size):
+                yield from chunk
+        else:
+            yield from self.source()
+
+    def iter_texts(self):
+        """
+        :return: generator of tweet texts
+        """
+        for document in self.iter_documents():
+            yield get_field(document, self.text_path)
+
+    def iter_tokens(self):
+        """
+        Preprocess the tweets one window at a time.
+        When tokens_path exists the preprocessed tweets are read from it instead.
+
+        :return: generator of lists of words
+        """
+        if self.tokens_path is not None and os.path.exists(self.tokens_path):
+            with open(self.tokens_path, encoding="utf-8") as tokens_file:
+                for line in tokens_file:
+                    yield json.loads(line)
+            return
+
+        texts = self.iter_texts()
+        while True:
+            window = list(islice(texts, self.chunk_size))
+            if not window:
+                break
+            yield from self.preprocessing.preprocess_tweets_batch(window, self.fused)
+
+    def spill_tokens(self):
+        """
+        Run preprocessing once and write the results to tokens_path, so later passes skip it.
+        The file is renamed into place when complete.
+
+        :return: number of tweets written
+        """
+        if os.path.exists(self.tokens_path):
+            os.remove(self.tokens_path)
+        count = 0
+        with open(self.tokens_path + ".tmp", "w", encoding="utf-8") as tokens_file:
+            for tokens in self.iter_tokens():
+                tokens_file.write(json.dumps(tokens) + "\n")
+                count += 1
+        os.replace(self.tokens_path + ".tmp", self.tokens_path)
+        return count
+
+    def build_dictionary(self, no_below=None, no_above=None, keep_n=100000):
+        """
+        Build the dictionary in one pass over the tweets. With tokens_path set the preprocessed tweets
+        are first spilled to disk so that the bag-of-words pass does not preprocess them again.
+
+        :param no_below: drop words in fewer tweets than this
+        :param no_above: drop words in more than this fraction of tweets
+        :param keep_n: maximum vocabulary size when filtering
+
+        :return: mapping of words to integer IDs
+        """
+        if self.tokens_path is not None and not os.path.exists(self.tokens_path):
+            self.spill_tokens()
+        self.mapping_dict = corpora.Dictionary(self.iter_tokens())
+        if no_below is not None or no_above is not None:
+            self.mapping_dict.filter_extremes(no_below=no_below or 1, no_above=no_above or 1.0, keep_n=keep_n)
+        return self.mapping_dict
+
+    def __iter__(self):
+        """
+        :return: generator of bag-of-words vectors, one per tweet
+        """
+        if self.mapping_dict is None:
+            raise ValueError("Build or pass a dictionary before iterating the corpus")
+        for tokens in self.iter_tokens():
+            yield self.mapping_dict.doc2bow(tokens)
+
+    def serialize(self, bow_name):
+        """
+        Stream the corpus into a Matrix Market file, readable with TopicModelling.load_bow
+
+        :param bow_name: file name of the bag-of-words(bow), without '.mm'
+
+        :return: True if file is saved
+        """
+        corpora.MmCorpus.serialize(bow_name + '.mm', self)
+        return True
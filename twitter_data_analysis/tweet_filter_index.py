@@ -0,0 +1,205 @@
+import numpy as np
+import pandas as pd
+
+# dashboard filter -> dataframe column it is built from, see dashboard.DASHBOARD_FIELDS
+FILTER_FIELDS = {"hashtags": "entities.hashtags", "place": "place", "lang": "lang", "author": "user.screen_name"}
+
+
+class TweetFilterIndex:
+    """
+    Inverted index from hashtag, place, language and author values to the rows of a tweets dataframe.
+
+    Every field is stored in compressed sparse row form: the distinct values, one array of row ids
+    grouped by value and sorted inside every group, and the offset of every group. The posting list of
+    a value is a slice of that array, so the index is three arrays per field however many values there
+    are. Filters are answered by uniting and intersecting posting lists instead of scanning the dataframe.
+
+    >>> index = TweetFilterIndex(tweets_df)
+    >>> rows = index.filter_rows({"hashtags": ["kenya", "news"], "lang": ["en"]})
+    >>> tweets_df.iloc[rows]
+    """
+
+    def __init__(self, df, fields=None):
+        self.build([df], fields)
+
+    @classmethod
+    def from_chunks(cls, chunks, fields=None, key_column=None):
+        """
+        Build the index over a sequence of dataframes, e.g. ReadDocs.iter_tweets_in_collection, without
+        holding them in memory at once. Row ids count rows across all the chunks.
+
+        :param chunks: iterable of dataframes
+        :param fields: dictionary of filter name -> column, defaults to FILTER_FIELDS
+        :param key_column: column stored for every row in keys, e.g. _id to fetch the filtered tweets again
+
+        :return: TweetFilterIndex
+        """
+        index = cls.__new__(cls)
+        index.build(chunks, fields, key_column)
+        return index
+
+    def build(self, chunks, fields=None, key_column=None):
+        """
+        Index every chunk, the values of a field get one code across all chunks
+
+        :param chunks: iterable of dataframes
+        :param fields: dictionary of filter name -> column, defaults to FILTER_FIELDS
+        :param key_column: column stored for every row in keys, None stores nothing
+        """
+        fields = FILTER_FIELDS if fields is None else fields
+        self.num_rows = 0
+        # filter name -> (row id arrays, code arrays, value -> code)
+        parts = {field: ([], [], {}) for field in fields}
+        keys = []
+        for df in chunks:
+            for field, column in fields.items():
+                if column not in df.columns:
+                    continue
+                row_ids, values = self.field_values(df[column])
+                codes, uniques = pd.factorize(values)
+                field_rows, field_codes, value_codes = parts[field]
+                chunk_codes = np.array([value_codes.setdefault(value, len(value_codes)) for value in uniques],
+                                       dtype=np.int64)
+                keep = codes >= 0
+                field_rows.append(row_ids[keep] + self.num_rows)
+                field_codes.append(chunk_codes[codes[keep]])
+            if key_column is not None:
+                keys.append(df[key_column].to_numpy())
+            self.num_rows += len(df)
+        # filter name -> (distinct values, offsets, row ids)
+        self.postings = {}
+        for field, (field_rows, field_codes, value_codes) in parts.items():
+            if field_rows:
+                self.postings[field] = self.build_postings(np.concatenate(field_rows), np.concatenate(field_codes),
+                                                           pd.Index(list(value_codes)))
+        # key of every row, None when no key_column was given
+        self.keys = np.concatenate(keys) if keys else None
+
+    @staticmethod
+    def field_values(column):
+        """
+        Extract the indexed value of every row. List columns such as entities.hashtags give one value
+        per element, dictionaries are reduced to their text, screen_name or full_name.
+
+        :param column: dataframe column
+
+        :return: array of row ids and a series of values of the same length
+        """
+        values = column.reset_index(drop=True)
+        if values.dtype == object and values.map(lambda value: isinstance(value, list)).any():
+            values = values.explode()
+
+        def to_text(value):
+            if isinstance(value, dict):
+                if "text" in value:
+                    # hashtags are case insensitive
+                    return value["text"].lower()
+                return value.get("screen_name") or value.get("full_name")
+            return value
+
+        if values.dtype == object:
+            values = values.map(to_text)
+        return values.index.to_numpy(dtype=np.int64), values
+
+    @staticmethod
+    def build_postings(row_ids, codes, uniques):
+        """
+        Group row ids by value
+
+        :param row_ids: array of row ids in increasing order
+        :param codes: code of the value of every row id
+        :param uniques: distinct values, indexed by code
+
+        :return: tuple of (pandas Index of distinct values, int64 offsets, int32 row ids)
+        """
+        pairs = pd.DataFrame({"code": codes, "row": row_ids}).drop_duplicates()
+        # a stable sort keeps the row ids of every value in increasing order
+        order = np.argsort(pairs["code"].to_numpy(), kind="stable")
+        sorted_codes = pairs["code"].to_numpy()[order]
+        rows = pairs["row"].to_numpy()[order].astype(np.int32)
+        offsets = np.searchsorted(sorted_codes, np.arange(len(uniques) + 1))
+        return uniques, offsets, rows
+
+    def options(self, field, limit=None):
+        """
+        Distinct values of a field, most frequent first, for a multiselect widget
+
+        :param field: one of FILTER_FIELDS
+        :param limit: maximum number of values
+
+        :return: list of values
+        """
+        values, offsets, _ = self.postings[field]
+        counts = np.diff(offsets)
+        order = np.argsort(-counts, kind="stable")[:limit]
+        return values[order].tolist()
+
+    def posting_list(self, field, value):
+        """
+        :return: sorted array of the rows containing value, empty if the value is not indexed
+        """
+        values, offsets, rows = self.postings[field]
+        position = values.get_indexer([value])[0]
+        if position < 0:
+            return np.empty(0, dtype=np.int32)
+        return rows[offsets[position]:offsets[position + 1]]
+
+    def select(self, field, selected_values, match_all=False):
+        """
+        Rows matching any, or all, of the selected values of one field
+
+        :param field: one of FILTER_FIELDS
+        :param selected_values: list of values
+        :param match_all: intersect the posting lists instead of uniting them
+
+        :return: sorted array of row ids
+        """
+        posting_lists = [self.posting_list(field, value) for value in selected_values]
+        if not posting_lists:
+            return np.empty(0, dtype=np.int32)
+        if match_all:
+            # start from the shortest list so every intersection is as small as possible
+            posting_lists.sort(key=len)
+            selected = posting_lists[0]
+            for posting_list in posting_lists[1:]:
+                selected = self.intersect(selected, posting_list)
+            return selected
+        if len(posting_lists) == 1:
+            return posting_lists[0]
+        # mark the rows in a bitmap, linear in the number of rows instead of sorting the concatenated lists
+        bitmap = np.zeros(self.num_rows, dtype=bool)
+        for posting_list in posting_lists:
+            bitmap[posting_list] = True
+        return np.flatnonzero(bitmap).astype(np.int32)
+
+    @staticmethod
+    def intersect(first, second):
+        """
+        Intersect two sorted arrays of row ids with a binary search of the shorter one in the longer one
+
+        :return: sorted array of row ids
+        """
+        if len(first) > len(second):
+            first, second = second, first
+        if not len(first):
+            return first
+        positions = np.minimum(np.searchsorted(second, first), len(second) - 1)
+        return first[second[positions] == first]
+
+    def filter_rows(self, selections, match_all=False):
+        """
+        Combine the filters of several fields. Values of one field are united (or intersected when
+        match_all is set), different fields are intersected. Fields without selected values are ignored.
+
+        :param selections: dictionary of field -> list of selected values
+        :param match_all: see select
+
+        :return: sorted array of row ids, None if nothing is selected
+        """
+        selected = None
+        for field, selected_values in selections.items():
+            if not selected_values:
+                continue
+            rows = self.select(field, selected_values, match_all)
+            selected = rows if selected is None else self.intersect(selected, rows)
+        return selected
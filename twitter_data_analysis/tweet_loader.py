@@ -0,0 +1,149 @@
+import json
+from datetime import datetime
+
+import pandas as pd
+
+# format of created_at in the Twitter API v1.1 payload e.g. 'Mon Aug 08 07:40:53 +0000 2022'
+TWITTER_DATE_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+# low cardinality string fields stored as pandas categoricals
+CATEGORICAL_FIELDS = ("lang", "source")
+
+
+def parse_created_at(value):
+    """
+    Convert a Twitter created_at string into a timezone aware datetime.
+
+    :param value: created_at string, values which are not strings are returned unchanged
+
+    :return: datetime object
+
+    >>> parse_created_at('Mon Aug 08 07:40:53 +0000 2022')
+    datetime.datetime(2022, 8, 8, 7, 40, 53, tzinfo=datetime.timezone.utc)
+    """
+    if isinstance(value, str):
+        return datetime.strptime(value, TWITTER_DATE_FORMAT)
+    return value
+
+
+def get_field(document, path):
+    """
+    Fetch a possibly nested value from a decoded tweet.
+
+    :param document: the tweet as a dictionary
+    :param path: tuple of keys e.g. ('user', 'screen_name')
+
+    :return: the value, None if any key along the path is missing
+    """
+    value = document
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def iter_json_lines(file_path, chunk_size=10000, on_error=None):
+    """
+    Stream a JSON lines file as lists of decoded documents. Blank lines are skipped.
+
+    :param file_path: path to the JSON lines file
+    :param chunk_size: number of documents per list
+    :param on_error: function (line_number, line, exception) called for a line which is not valid JSON,
+                     the line is then skipped. None raises the error
+
+    :return: generator of lists of dictionaries
+
+    >>> next(iter_json_lines("./data/global_twitter_data.json", 2))
+    [{'created_at': 'Mon Aug 08 07:40:53 +0000 2022', 'id': 1556529119324327936, ...}, {...}]
+    """
+    chunk = []
+    with open(file_path, encoding="utf-8") as json_file:
+        for line_number, line in enumerate(json_file, 1):
+            if not line.strip():
+                continue
+            try:
+                document = json.loads(line)
+            except ValueError as exception:
+                if on_error is None:
+                    raise
+                on_error(line_number, line, exception)
+                continue
+            chunk.append(document)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def compact_dtypes(df, categorical_fields=CATEGORICAL_FIELDS):
+    """
+    Convert the columns of a tweets dataframe to compact dtypes, in place.
+    Categorical fields become categories, *_count columns are downcast to the smallest integer type
+    and created_at columns (including nested ones such as user.created_at) become datetimes.
+
+    :param df: dataframe of tweet fields
+    :param categorical_fields: columns to store as categoricals
+
+    :return: the dataframe
+    """
+    for column in df.columns:
+        if column in categorical_fields:
+            df[column] = df[column].astype("category")
+        elif column.split(".")[-1] == "created_at":
+            df[column] = pd.to_datetime(df[column], format=TWITTER_DATE_FORMAT, errors="coerce")
+        elif column.endswith("_count"):
+            df[column] = pd.to_numeric(df[column], errors="coerce", downcast="integer")
+    return df
+
+
+def read_tweets_in_chunks(file_path, fields=None, chunk_size=10000, use_compact_dtypes=True):
+    """
+    Stream a JSON lines tweet dump as dataframes of at most chunk_size rows.
+    Only one chunk of decoded tweets is held in memory at a time.
+
+    :param file_path: path to the JSON lines file
+    :param fields: fields to keep, dotted paths select nested values e.g. 'user.screen_name'.
+                   None keeps every top level field
+    :param chunk_size: number of tweets per dataframe
+    :param use_compact_dtypes: apply compact_dtypes to every chunk
+
+    :return: generator of dataframes
+
+    >>> next(read_tweets_in_chunks("./data/global_twitter_data.json", ["created_at", "lang", "user.screen_name"]))
+                     created_at lang user.screen_name
+    0 2022-08-08 07:40:53+00:00   en      McMc74078966
+    ...
+    """
+    paths = None if fields is None else [(field, tuple(field.split("."))) for field in fields]
+    for documents in iter_json_lines(file_path, chunk_size):
+        if paths is None:
+            df = pd.DataFrame(documents)
+        else:
+            df = pd.DataFrame({field: [get_field(document, path) for document in documents]
+                               for field, path in paths}, columns=list(fields))
+        yield compact_dtypes(df) if use_compact_dtypes else df
+
+
+def read_tweets(file_path, fields=None, chunk_size=10000, use_compact_dtypes=True):
+    """
+    Load a JSON lines tweet dump into a single dataframe, see read_tweets_in_chunks.
+    Categorical columns keep the categorical dtype across chunks.
+
+    :param file_path: path to the JSON lines file
+    :param fields: fields to keep, dotted paths select nested values
+    :param chunk_size: number of tweets decoded at a time
+    :param use_compact_dtypes: apply compact_dtypes to the columns
+
+    :return: dataframe of tweets
+    """
+    chunks = list(read_tweets_in_chunks(file_path, fields, chunk_size, use_compact_dtypes))
+    if not chunks:
+        return pd.DataFrame(columns=fields)
+    df = pd.concat(chunks, ignore_index=True)
+    if use_compact_dtypes:
+        # categories differ between chunks so concat falls back to object dtype
+        for column in CATEGORICAL_FIELDS:
+            if column in df.columns:
+                df[column] = df[column].astype("category")
+    return df
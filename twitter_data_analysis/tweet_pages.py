@@ -0,0 +1,193 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# number of list elements or dictionary keys shown in a summary
+SUMMARY_ITEMS = 5
+# keys naming a nested object, in order of preference e.g. user -> screen_name, place -> full_name
+SUMMARY_KEYS = ("screen_name", "full_name", "text", "name")
+# tweet fields a collection can be sorted by, an index on them keeps sorted pages cheap
+SORT_FIELDS = ("_id", "created_at", "retweet_count", "favorite_count", "user.followers_count")
+
+
+def summarize_value(value):
+    """
+    Shorten a nested tweet value for display in a table
+
+    :param value: any decoded JSON value
+
+    :return: a string for dictionaries and lists, the value itself otherwise
+
+    >>> summarize_value({"screen_name": "ann", "followers_count": 10})
+    '@ann'
+    >>> summarize_value({"hashtags": [{"text": "kenya"}], "user_mentions": []})
+    'hashtags: kenya; user_mentions: -'
+    """
+    if isinstance(value, dict):
+        if "screen_name" in value:
+            return "@" + str(value["screen_name"])
+        for key in SUMMARY_KEYS:
+            if key in value:
+                return str(value[key])
+        keys = list(value)
+        parts = []
+        for key in keys[:SUMMARY_ITEMS]:
+            summary = summarize_value(value[key])
+            parts.append(f"{key}: {'-' if summary == '' else summary}")
+        return "; ".join(parts) + ("; ..." if len(keys) > SUMMARY_ITEMS else "")
+    if isinstance(value, list):
+        parts = [str(summarize_value(item)) for item in value[:SUMMARY_ITEMS]]
+        return ", ".join(parts) + (f" (+{len(value) - SUMMARY_ITEMS})" if len(value) > SUMMARY_ITEMS else "")
+    return value
+
+
+def summarize_nested_columns(df):
+    """
+    Replace dictionaries and lists in the object columns of a page with summaries, see summarize_value
+
+    :param df: a page of tweets
+
+    :return: a new dataframe
+    """
+    df = df.copy()
+    for column in df.columns:
+        if df[column].dtype == object and df[column].map(lambda value: isinstance(value, (dict, list))).any():
+            df[column] = df[column].map(summarize_value)
+    return df
+
+
+def page_count(total_rows, page_size):
+    """
+    :return: number of pages needed for total_rows, at least 1
+    """
+    return max(1, math.ceil(total_rows / page_size))
+
+
+class DataFramePages:
+    """
+    Pages of a tweets dataframe already held in memory, e.g. the cached tweet file of the dashboard.
+    Only the rows and columns of the requested page are copied. The sortable columns and the sort order
+    of a column are computed once and reused for every page.
+
+    >>> pages = DataFramePages(tweets_df)
+    >>> pages.page(3, page_size=50, sort_column="retweet_count", descending=True, columns=["full_text"])
+    """
+
+    def __init__(self, df):
+        self.df = df
+        # (column, descending) -> row positions in sorted order
+        self.sort_orders = {}
+        # only object columns can hold dictionaries or lists, they are scanned once here
+        self.sortable = [column for column in df.columns
+                         if df[column].dtype != object
+                         or not df[column].map(lambda value: isinstance(value, (dict, list))).any()]
+
+    def count(self):
+        """
+        :return: number of rows
+        """
+        return len(self.df)
+
+    def sortable_columns(self):
+        """
+        :return: columns which do not hold dictionaries or lists
+        """
+        return self.sortable
+
+    def sort_order(self, column, descending=False):
+        """
+        :return: array of row positions sorted by column, missing values last
+        """
+        key = (column, descending)
+        if key not in self.sort_orders:
+            values = self.df[column].reset_index(drop=True)
+            order = values.sort_values(ascending=not descending, kind="stable", na_position="last").index
+            self.sort_orders[key] = order.to_numpy()
+        return self.sort_orders[key]
+
+    def page(self, page, page_size=50, sort_column=None, descending=False, columns=None):
+        """
+        :param page: page number, starting at 0
+        :param page_size: number of rows per page
+        :param sort_column: column to sort by, None keeps the row order
+        :param descending: sort from the largest value
+        :param columns: columns to return, None returns all of them
+
+        :return: dataframe with at most page_size rows
+        """
+        start = page * page_size
+        if sort_column is None:
+            positions = np.arange(start, min(start + page_size, len(self.df)))
+        else:
+            positions = self.sort_order(sort_column, descending)[start:start + page_size]
+        df = self.df.iloc[positions]
+        return df if columns is None else df[columns]
+
+
+class CollectionPages:
+    """
+    Pages of a MongoDB collection fetched with ReadDocs.read_page, one page per query.
+
+    The last (sort value, _id) of every fetched page is remembered, so moving to the next page uses a
+    range cursor instead of skipping documents on the server. Jumps to a page that has no known
+    predecessor fall back to skip/limit.
+
+    >>> pages = CollectionPages(ReadDocs(uri), "tweets", "global")
+    >>> pages.page(0, page_size=50, sort_field="retweet_count", descending=True, columns=["full_text"])
+    """
+
+    def __init__(self, reader, database_name, collection_name, query=None, sort_fields=SORT_FIELDS):
+        self.reader = reader
+        self.database_name = database_name
+        self.collection_name = collection_name
+        self.query = query
+        self.sort_fields = list(sort_fields)
+        # (sort field, descending, page size) -> {page number: (sort value, _id) of its last row}
+        self.boundaries = {}
+
+    def count(self):
+        """
+        :return: number of tweets matching the query
+        """
+        return self.reader.count_tweets(self.database_name, self.collection_name, self.query)
+
+    def sortable_columns(self):
+        """
+        :return: fields offered for sorting
+        """
+        return self.sort_fields
+
+    @staticmethod
+    def to_python(value):
+        """
+        Convert a dataframe cell back into a value MongoDB can compare with
+        """
+        if isinstance(value, pd.Timestamp):
+            return value.to_pydatetime()
+        if hasattr(value, "item"):
+            # numpy scalar to python
+            return value.item()
+        return value
+
+    def page(self, page, page_size=50, sort_field="_id", descending=False, columns=None):
+        """
+        :param page: page number, starting at 0
+        :param page_size: number of tweets per page
+        :param sort_field: field to sort by, dotted paths select nested values
+        :param descending: sort from the largest value
+        :param columns: fields to return, None returns whole documents
+
+        :return: dataframe with at most page_size tweets
+        """
+        fields = None if columns is None else list(dict.fromkeys(list(columns) + [sort_field]))
+        boundaries = self.boundaries.setdefault((sort_field, descending, page_size), {})
+        after = boundaries.get(page - 1)
+        df = self.reader.read_page(self.database_name, self.collection_name, self.query, fields, sort_field,
+                                   descending, page, page_size, after)
+        if len(df) and sort_field in df.columns:
+            last_value = self.to_python(df[sort_field].iloc[-1])
+            # documents without the sort field sort before every value, a range cursor cannot start there
+            if last_value is not None and not (isinstance(last_value, float) and math.isnan(last_value)):
+                boundaries[page] = (last_value, self.to_python(df["_id"].iloc[-1]))
+        return df
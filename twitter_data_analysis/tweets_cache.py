@@ -0,0 +1,219 @@
+import json
+import logging
+import os
+import re
+from datetime import datetime
+
+from twitter_data_analysis import logger_setup
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from bson import ObjectId
+
+# flat tweet fields stored in the cache by default. Nested objects are left out because their
+# shape varies between tweets, which Parquet schemas do not allow
+CACHE_FIELDS = ["created_at", "full_text", "lang", "source", "retweet_count", "favorite_count",
+                "user.screen_name", "user.location", "user.followers_count", "user.friends_count"]
+# hive style partition directory prefix
+PARTITION_COLUMN = "created_date"
+STATE_FILE = "_state.json"
+
+
+class TweetsCache:
+    """
+    Local Parquet copy of a MongoDB tweet collection, partitioned by the day of created_at.
+
+    sync only downloads documents newer than the high-water mark stored with the cache,
+    so repeated analysis runs read from local disk instead of pulling the whole collection.
+
+    Layout: cache_dir/<database>/<collection>/created_date=YYYY-MM-DD/part-<first watermark>-<i>.parquet
+    """
+
+    def __init__(self, reader, cache_dir, fields=None, watermark_field="_id"):
+        # ReadDocs used to pull documents from the cluster
+        self.reader = reader
+        self.cache_dir = cache_dir
+        self.fields = CACHE_FIELDS if fields is None else fields
+        # increasing field used to find new documents, '_id' or 'created_at'
+        self.watermark_field = watermark_field
+        # set up logger to output to terminal
+        self.logger = logger_setup.logger_console_config(__name__)
+
+    def collection_dir(self, database_name, collection_name):
+        """
+        :return: the folder holding the cached collection
+        """
+        return os.path.join(self.cache_dir, database_name, collection_name)
+
+    def load_state(self, database_name, collection_name):
+        """
+        Read the sync state of a cached collection
+
+        :return: dictionary with the watermark field, watermark value and number of cached rows
+        """
+        state_path = os.path.join(self.collection_dir(database_name, collection_name), STATE_FILE)
+        if not os.path.exists(state_path):
+            return {"field": self.watermark_field, "value": None, "rows": 0}
+        with open(state_path, encoding="utf-8") as state_file:
+            state = json.load(state_file)
+        state["value"] = self.decode_watermark(state.get("value"))
+        return state
+
+    def save_state(self, database_name, collection_name, state):
+        """
+        Write the sync state of a cached collection, replacing the previous state atomically
+        """
+        state_path = os.path.join(self.collection_dir(database_name, collection_name), STATE_FILE)
+        with open(state_path + ".tmp", "w", encoding="utf-8") as state_file:
+            json.dump({**state, "value": self.encode_watermark(state["value"])}, state_file)
+        os.replace(state_path + ".tmp", state_path)
+
+    def encode_watermark(self, value):
+        """
+        Convert a watermark value into JSON, keeping its type
+        """
+        if isinstance(value, datetime):
+            return {"datetime": value.isoformat()}
+        if isinstance(value, ObjectId):
+            return {"object_id": str(value)}
+        return value
+
+    def decode_watermark(self, value):
+        """
+        Inverse of encode_watermark
+        """
+        if isinstance(value, dict) and "datetime" in value:
+            return datetime.fromisoformat(value["datetime"])
+        if isinstance(value, dict) and "object_id" in value:
+            return ObjectId(value["object_id"])
+        return value
+
+    def part_name(self, first_value):
+        """
+        Base name of the part files of a chunk, made from the watermark of its first document.
+
+        A chunk downloaded again after an interrupted sync starts with the same document, so its files
+        replace the ones written before the interruption instead of duplicating their rows. The last
+        watermark is left out: documents added in the meantime make the new chunk longer.
+
+        :param first_value: watermark of the first document of the chunk
+
+        :return: basename_template for pyarrow.parquet.write_to_dataset
+        """
+        # ':' and '+' of datetimes are not allowed in Windows file names
+        return "part-" + re.sub(r"[^0-9A-Za-z]+", "_", str(first_value)) + "-{i}.parquet"
+
+    def write_partitions(self, df, collection_dir):
+        """
+        Write a chunk of tweets to the day partitions
+
+        :param df: dataframe of tweets with a created_at column, sorted by the watermark field
+        :param collection_dir: the folder holding the cached collection
+        """
+        basename_template = self.part_name(df[self.watermark_field].iloc[0])
+        created_at = pd.to_datetime(df["created_at"], utc=True, errors="coerce")
+        df[PARTITION_COLUMN] = created_at.dt.strftime("%Y-%m-%d").fillna("unknown")
+        if df["_id"].dtype == object:
+            # ObjectIds have no Parquet type
+            df["_id"] = df["_id"].astype(str)
+        pq.write_to_dataset(pa.Table.from_pandas(df, preserve_index=False), collection_dir,
+                            partition_cols=[PARTITION_COLUMN], basename_template=basename_template,
+                            existing_data_behavior="overwrite_or_ignore")
+
+    def sync(self, database_name:str, collection_name:str, chunk_size:int=50000, batch_size:int=1000):
+        """
+        Download the documents added to a collection since the last sync.
+        The high-water mark is saved after every chunk, so an interrupted sync resumes where it stopped.
+        A chunk written before the interruption but not recorded in the state is rewritten in place.
+
+        Only documents with a watermark greater than the last synced one are read. A document inserted
+        after a sync with a smaller watermark is never cached, e.g. a tweet of an earlier hour written
+        late by the concurrent writers of IngestDocs. Run sync once ingestion has finished, or clear the
+        collection directory of the cache to pick such documents up.
+
+        :param database_name: The name of the database to read from
+        :param collection_name: The name of the collection to read from
+        :param chunk_size: number of documents written per Parquet file
+        :param batch_size: number of documents per network round trip
+
+        :return: number of documents added to the cache
+
+        >>> cache = TweetsCache(ReadDocs(uri), "./data/cache")
+        >>> cache.sync("tweets", "global")
+        21999
+        """
+        collection_dir = self.collection_dir(database_name, collection_name)
+        os.makedirs(collection_dir, exist_ok=True)
+        state = self.load_state(database_name, collection_name)
+        if state["field"] != self.watermark_field:
+            raise ValueError(f"Cache was built with watermark field {state['field']}")
+
+        query = {} if state["value"] is None else {self.watermark_field: {"$gt": state["value"]}}
+        fields = list(dict.fromkeys(self.fields + [self.watermark_field, "created_at"]))
+        added = 0
+        for df in self.reader.iter_tweets_in_collection(database_name, collection_name, query, fields,
+                                                        chunk_size, batch_size, sort=[(self.watermark_field, 1)]):
+            # documents arrive in watermark order, so the last one is the newest
+            state["value"] = df[self.watermark_field].iloc[-1]
+            if hasattr(state["value"], "item"):
+                # numpy scalar to python
+                state["value"] = state["value"].item()
+            if isinstance(state["value"], pd.Timestamp):
+                state["value"] = state["value"].to_pydatetime()
+            self.write_partitions(df, collection_dir)
+            added += len(df)
+            state["rows"] += len(df)
+            self.save_state(database_name, collection_name, state)
+
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.info("Synced %d new tweets, %d cached", added, state["rows"])
+        return added
+
+    def list_partitions(self, database_name, collection_name, start=None, end=None):
+        """
+        List the day partitions of a cached collection within a date range
+
+        :param start: first day to include, 'YYYY-MM-DD'
+        :param end: last day to include, 'YYYY-MM-DD'
+
+        :return: sorted list of partition folders
+        """
+        collection_dir = self.collection_dir(database_name, collection_name)
+        if not os.path.isdir(collection_dir):
+            return []
+        partitions = []
+        for name in sorted(os.listdir(collection_dir)):
+            if not name.startswith(PARTITION_COLUMN + "="):
+                continue
+            day = name.split("=", 1)[1]
+            if (start is None or day >= start) and (end is None or day <= end):
+                partitions.append(os.path.join(collection_dir, name))
+        return partitions
+
+    def read(self, database_name:str, collection_name:str, start=None, end=None, columns=None, memory_map=True):
+        """
+        Load cached tweets from local disk. Only the partitions in the date range are opened.
+
+        :param database_name: The name of the cached database
+        :param collection_name: The name of the cached collection
+        :param start: first day to include, 'YYYY-MM-DD'
+        :param end: last day to include, 'YYYY-MM-DD'
+        :param columns: columns to load, None loads all of them
+        :param memory_map: memory map the Parquet files instead of reading them into buffers
+
+        :return: dataframe of tweets
+
+        >>> cache.read("tweets", "global", start="2022-08-08", columns=["created_at", "full_text"])
+        df
+        """
+        tables = []
+        for partition in self.list_partitions(database_name, collection_name, start, end):
+            for file_name in sorted(os.listdir(partition)):
+                if file_name.endswith(".parquet"):
+                    tables.append(pq.read_table(os.path.join(partition, file_name), columns=columns,
+                                                memory_map=memory_map))
+        if not tables:
+            return pd.DataFrame(columns=columns)
+        # an all-null column in one chunk is promoted to the type used by the others, and a field which
+        # is an integer in one chunk and a float in another is promoted to the float type
+        return pa.concat_tables(tables, promote_options="permissive").to_pandas()
@@ -0,0 +1,154 @@
+import logging
+import time
+
+from twitter_data_analysis import logger_setup
+from twitter_data_analysis.connect_to_mongo import ConnectToMongo
+from pymongo.errors import AutoReconnect, BulkWriteError, PyMongoError
+from twitter_data_analysis.tweet_loader import iter_json_lines, parse_created_at
+
+# error code returned by MongoDB for a duplicate _id
+DUPLICATE_KEY_ERROR = 11000
+# counters returned for every batch, see UploadDocs.insert_batch
+COUNT_KEYS = ("inserted", "duplicates", "ambiguous", "failed")
+
+
+class UploadDocs:
+    """
+    Uploads tweets to the cluster
+    """
+    def __init__(self, uri, **client_options):
+        # Set up connection to MongoDB through the shared client for this uri
+        # Atlas Connection string is specified in .env file in project root
+        # client_options configure the connection pool, see connect_to_mongo.get_shared_client
+        self.connection = ConnectToMongo(uri, **client_options)
+        self.client = self.connection.get_mongo_client()
+        # set up logger to output to terminal
+        self.logger = logger_setup.logger_console_config(__name__)
+
+    def tweet_to_document(self, tweet):
+        """
+        Convert a decoded tweet into the document stored in MongoDB
+
+        :param tweet: the tweet as a dictionary, it is modified in place
+
+        :return: the document with the tweet id as _id
+        """
+        # specifying an _id field to avoid MongoDB from assigning unique ids for each document
+        tweet_dict = {"_id": tweet.pop("id")}
+        # removing the id columns to avoid repetition
+        tweet.pop("id_str", None)
+        # store dates as BSON dates, as pandas read_json did
+        tweet["created_at"] = parse_created_at(tweet.get("created_at"))
+        # add the current json data to the original dictionary
+        tweet_dict.update(tweet)
+        return tweet_dict
+
+    def insert_batch(self, collection, documents, max_retries=0, retry_backoff=0.5):
+        """
+        Insert a batch of documents with a single unordered insert_many.
+        With ordered=False the server keeps inserting after a failed document, so duplicates
+        are counted from the bulk write result instead of failing the batch.
+
+        Transient network errors (AutoReconnect and its subclasses) are retried with exponential backoff.
+        Documents written before the error come back as duplicate key errors from the retry, which cannot
+        be told apart from documents that were in the collection before, so duplicates seen on a retry are
+        counted as ambiguous.
+
+        :param collection: the pymongo collection
+        :param documents: list of documents
+        :param max_retries: number of retries after a transient error
+        :param retry_backoff: seconds to wait before the first retry, doubled on every retry
+
+        :return: dictionary of inserted, duplicate, ambiguous and failed counts
+        """
+        counts = dict.fromkeys(COUNT_KEYS, 0)
+        for attempt in range(max_retries + 1):
+            try:
+                with logger_setup.timed("mongo.insert_many"):
+                    result = collection.insert_many(documents, ordered=False)
+                counts["inserted"] = len(result.inserted_ids)
+            except BulkWriteError as error:
+                counts["inserted"] = error.details.get("nInserted", 0)
+                for write_error in error.details.get("writeErrors", []):
+                    if write_error.get("code") == DUPLICATE_KEY_ERROR:
+                        # a retry cannot tell a document of the failed attempt from an earlier duplicate
+                        counts["ambiguous" if attempt > 0 else "duplicates"] += 1
+                    else:
+                        counts["failed"] += 1
+            except AutoReconnect as exception:
+                if attempt < max_retries:
+                    self.logger.warning("Transient error, retrying batch: %s", exception)
+                    time.sleep(retry_backoff * 2 ** attempt)
+                    continue
+                self.logger.exception(exception)
+                counts["failed"] = len(documents)
+            except PyMongoError as exception:
+                self.logger.exception(exception)
+                counts["failed"] = len(documents)
+            return counts
+        return counts
+
+    def upload_documents(self, collection, tweets, batch_size=1000):
+        """
+        Upload tweets in batches of batch_size documents
+
+        :param collection: the pymongo collection
+        :param tweets: iterable of decoded tweets
+        :param batch_size: number of documents per insert_many call
+
+        :return: dictionary of inserted, duplicate, ambiguous and failed counts, elapsed seconds and documents/sec
+        """
+        stats = dict.fromkeys(COUNT_KEYS, 0)
+        start = time.perf_counter()
+        batch = []
+        for tweet in tweets:
+            batch.append(self.tweet_to_document(tweet))
+            if len(batch) == batch_size:
+                for key, count in self.insert_batch(collection, batch).items():
+                    stats[key] += count
+                batch = []
+        if batch:
+            for key, count in self.insert_batch(collection, batch).items():
+                stats[key] += count
+        stats["seconds"] = time.perf_counter() - start
+        logger_setup.count("mongo.documents_inserted", stats["inserted"])
+        processed = sum(stats[key] for key in COUNT_KEYS)
+        stats["docs_per_sec"] = processed / stats["seconds"] if stats["seconds"] > 0 else 0.0
+        return stats
+
+    def upload_tweets(self, file_path:str, db_name:str, collection_name:str, batch_size:int=1000):
+        """
+        Upload Tweets as Documents to MongoDB. Tweets are stored in a JSON file in local storage
+
+        Tweets are streamed from the file and inserted in unordered batches, see upload_documents.
+        The inserted, duplicate and failed counts and the upload rate are logged.
+        
+        :param file_path: The path to JSON file containing tweets
+        :param db_name: The name of the database
+        :param collection_name: The name of the collection
+        :param batch_size: The number of tweets sent to the cluster per request
+        
+        :return: The number of tweets successfuly uploaded
+        
+        >>> upload_tweets(file_path=".\\data\\global_twitter_data.json",db_name="tweets",collection_name="global")
+        21999
+        """
+        tweets_uploaded = 0
+        if self.connection.test_connection():
+            # confirm connection to cluster
+            database = self.client[db_name]
+            collection = database[collection_name]
+            # stream tweets from the JSON lines file one batch at a time
+            tweets = (tweet for chunk in iter_json_lines(file_path, batch_size) for tweet in chunk)
+            stats = self.upload_documents(collection, tweets, batch_size)
+            tweets_uploaded = stats["inserted"]
+            self.logger.setLevel(logging.DEBUG)
+            self.logger.info("Uploaded %d tweets, %d duplicates, %d ambiguous, %d failed (%.0f docs/sec)",
+                             stats["inserted"], stats["duplicates"], stats["ambiguous"], stats["failed"],
+                             stats["docs_per_sec"])
+        else:
+            # no connection
+            self.logger.setLevel(logging.DEBUG)
+            self.logger.error("Cannot connect to cluster!!!")
+        
+        return tweets_uploaded